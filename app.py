@@ -1,9 +1,14 @@
 import streamlit as st
+import hashlib
 import os
 import tempfile
+import zipfile
 from pathlib import Path
 import time
 from ppt_translator import PPTTranslator
+from job_queue import JobManager, QUEUED, CANCELLED
+from scheduler import FairScheduler, INTERACTIVE
+from translation_backends import GoogleTransBackend
 
 # Page configuration
 st.set_page_config(
@@ -46,6 +51,207 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+# st.download_button reads the whole file into memory and keeps it in the
+# media store, so the ZIP bundle is only offered up to this size
+MAX_BUNDLE_BYTES = 100 * 1024 * 1024
+
+
+@st.cache_resource
+def get_translator():
+    """
+    Create the translator, with its backend, cache and scheduler, once per
+    server process. The scheduler shares the service's rate limit fairly
+    between everyone translating at the same time.
+    """
+    scheduler = FairScheduler(
+        max_workers=8, requests_per_second=GoogleTransBackend.limits.requests_per_second
+    )
+    return PPTTranslator(use_manifests=False, scheduler=scheduler)
+
+
+def build_bundle(translated_files, zip_path):
+    """
+    Write all translated decks into one ZIP archive on disk.
+
+    The decks are already compressed, so they are stored as-is and copied
+    in chunks rather than read into memory.
+
+    Args:
+        translated_files (list): Result entries with "name" and "path"
+        zip_path (str): Archive path
+    """
+    partial_path = zip_path + ".part"
+    with zipfile.ZipFile(partial_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+        for file_info in translated_files:
+            zip_file.write(file_info["path"], arcname=file_info["name"])
+    os.replace(partial_path, zip_path)
+
+
+def show_results(results):
+    """
+    Show the translated files of the last job with a download button.
+
+    Only the file chosen for download is read, so memory use does not grow
+    with the number of languages. The ZIP bundle is read whole like any
+    other download, so it is only offered up to MAX_BUNDLE_BYTES.
+
+    Args:
+        results (dict): "files" entries and the "bundle" archive path, or
+            None if there is no bundle
+    """
+    translated_files = results["files"]
+    st.markdown("---")
+    st.header("📥 Download Translated Files")
+
+    if not translated_files:
+        st.error("No files were successfully translated.")
+        return
+
+    st.markdown('<div class="success-box">', unsafe_allow_html=True)
+    st.success(f"🎉 Successfully translated to {len(translated_files)} language(s)!")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    for file_info in translated_files:
+        name_col, size_col = st.columns([3, 1])
+
+        with name_col:
+            st.write(f"**{file_info['language']}** - {file_info['name']}")
+
+        with size_col:
+            st.write(f"{file_info['size'] / 1024:.1f} KB")
+
+    downloads = {
+        f"{file_info['language']} - {file_info['name']}": (file_info["path"], file_info["name"], PPTX_MIME)
+        for file_info in translated_files
+    }
+    if results["bundle"]:
+        downloads["📦 All files (ZIP)"] = (results["bundle"], os.path.basename(results["bundle"]),
+                                          "application/zip")
+    elif len(translated_files) > 1:
+        st.info(f"The files are too large to bundle (over {MAX_BUNDLE_BYTES // (1024 * 1024)} MB "
+                "together); download them one at a time.")
+
+    choice = st.selectbox("Choose a file to download", list(downloads))
+    path, file_name, mime = downloads[choice]
+    with open(path, "rb") as f:
+        st.download_button(
+            label="📥 Download",
+            data=f,
+            file_name=file_name,
+            mime=mime,
+            use_container_width=True
+        )
+
+
+@st.cache_resource
+def get_job_manager():
+    """Create the background job queue once per server process."""
+    return JobManager(get_translator(), max_jobs=8)
+
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def estimate_job(file_hash, file_name, languages, _data):
+    """
+    Estimate a job for an uploaded deck, once per upload and language
+    selection rather than on every rerun while a job is polled. Entries
+    expire after a minute so the estimate follows the cache and the
+    recorded throughput.
+
+    Args:
+        file_hash (str): Hash of the uploaded bytes, the cache key
+        file_name (str): Name of the uploaded file
+        languages (tuple): Target language codes
+        _data (memoryview): Uploaded bytes, not hashed by Streamlit
+
+    Returns:
+        JobEstimate: Characters, requests, time and cost to expect
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, file_name)
+        with open(input_path, "wb") as f:
+            f.write(_data)
+        return get_translator().estimate(input_path, list(languages))
+
+
+def show_job(job_id, language_options, show_progress):
+    """
+    Show the progress of a translation job, or its results once it ended.
+
+    Args:
+        job_id (str): Job identifier
+        language_options (dict): Mapping of language name to code
+        show_progress (bool): List each language as it finishes
+
+    Returns:
+        bool: True if the job is still running and the page should poll
+    """
+    manager = get_job_manager()
+    status = manager.status(job_id)
+    if status is None:
+        st.warning("This translation job is no longer available.")
+        return False
+
+    language_names = {get_translator().normalize_lang(code): name
+                      for name, code in language_options.items()}
+
+    st.markdown("---")
+    if status.active:
+        st.progress(min(status.fraction, 1.0))
+        if status.state == QUEUED:
+            st.text("Waiting for other translations to finish...")
+        else:
+            finished = len(status.outputs) + len(status.errors)
+            text = (f"Translated {status.done}/{status.total} segments, "
+                    f"{finished}/{len(status.languages)} languages saved")
+            if status.eta is not None and status.done < status.total:
+                eta = int(status.eta)
+                text += f" (about {eta // 60}m {eta % 60}s left)"
+            st.text(text)
+
+    if show_progress or not status.active:
+        for lang in status.outputs:
+            name = language_names.get(lang, lang)
+            if lang in status.partial:
+                st.warning(f"⚠️ Translated to {name}, but {status.partial[lang]} segment(s) "
+                           f"could not be translated and kept their source text")
+            else:
+                st.success(f"✅ Successfully translated to {name}")
+        for lang, error in status.errors.items():
+            st.error(f"❌ Error translating to {language_names.get(lang, lang)}: {error}")
+
+    if status.active:
+        if st.button("✖ Cancel Translation", use_container_width=True):
+            manager.cancel(job_id)
+        return True
+
+    if status.state == CANCELLED:
+        st.warning("Translation was cancelled.")
+    elif status.error:
+        st.error(f"❌ {status.error}")
+
+    translated_files = [
+        {
+            "name": os.path.basename(path),
+            "path": path,
+            "language": language_names.get(lang, lang),
+            "size": os.path.getsize(path)
+        }
+        for lang, path in manager.results(job_id).items()
+    ]
+
+    bundle_path = None
+    if (len(translated_files) > 1
+            and sum(file_info["size"] for file_info in translated_files) <= MAX_BUNDLE_BYTES):
+        base_name = Path(status.input_path).stem
+        bundle_path = os.path.join(status.output_dir, f"{base_name}_translations.zip")
+        if not os.path.exists(bundle_path):
+            build_bundle(translated_files, bundle_path)
+
+    show_results({"files": translated_files, "bundle": bundle_path})
+    return False
+
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🌐 PPT Translator</h1>', unsafe_allow_html=True)
@@ -111,6 +317,7 @@ def main():
 
     # Main content area
     col1, col2 = st.columns([2, 1])
+    job_running = False
     
     with col1:
         st.header("📤 Upload Presentation")
@@ -144,118 +351,23 @@ def main():
                 if not selected_languages:
                     st.error("Please select at least one target language!")
                 else:
-                    # Initialize translator
-                    translator = PPTTranslator()
-                    
-                    # Create progress bar
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    # Create temporary directory for processing
+                    # Hand the deck to the background job queue
                     with tempfile.TemporaryDirectory() as temp_dir:
-                        # Save uploaded file
                         input_path = os.path.join(temp_dir, uploaded_file.name)
                         with open(input_path, "wb") as f:
                             f.write(uploaded_file.getbuffer())
-                        
-                        # Translate for each language
-                        total_languages = len(selected_languages)
-                        translated_files = []
-                        
-                        for i, lang_name in enumerate(selected_languages):
-                            lang_code = language_options[lang_name]
-                            
-                            # Update progress
-                            progress = (i / total_languages)
-                            progress_bar.progress(progress)
-                            status_text.text(f"Translating to {lang_name}... ({i+1}/{total_languages})")
-                            
-                            if show_progress:
-                                st.info(f"🔄 Translating to {lang_name} ({lang_code})...")
-                            
-                            try:
-                                # Generate output filename
-                                base_name = Path(uploaded_file.name).stem
-                                output_filename = f"{base_name}_{lang_code}.pptx"
-                                output_path = os.path.join(temp_dir, output_filename)
-                                
-                                # Translate the presentation
-                                translator.translate_presentation(input_path, output_path, lang_code)
-                                
-                                # Read the translated file for download
-                                with open(output_path, "rb") as f:
-                                    file_data = f.read()
-                                
-                                translated_files.append({
-                                    "name": output_filename,
-                                    "data": file_data,
-                                    "language": lang_name,
-                                    "size": len(file_data)
-                                })
-                                
-                                if show_progress:
-                                    st.success(f"✅ Successfully translated to {lang_name}")
-                                
-                            except Exception as e:
-                                st.error(f"❌ Error translating to {lang_name}: {str(e)}")
-                        
-                        # Complete progress
-                        progress_bar.progress(1.0)
-                        status_text.text("Translation completed!")
-                        
-                        # Display results
-                        st.markdown("---")
-                        st.header("📥 Download Translated Files")
-                        
-                        if translated_files:
-                            st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                            st.success(f"🎉 Successfully translated to {len(translated_files)} language(s)!")
-                            st.markdown('</div>', unsafe_allow_html=True)
-                            
-                            # Create download buttons
-                            for file_info in translated_files:
-                                col1, col2, col3 = st.columns([3, 1, 1])
-                                
-                                with col1:
-                                    st.write(f"**{file_info['language']}** - {file_info['name']}")
-                                
-                                with col2:
-                                    st.write(f"{file_info['size'] / 1024:.1f} KB")
-                                
-                                with col3:
-                                    st.download_button(
-                                        label="📥 Download",
-                                        data=file_info['data'],
-                                        file_name=file_info['name'],
-                                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                                        key=f"download_{file_info['language']}"
-                                    )
-                            
-                            # Batch download option
-                            if len(translated_files) > 1:
-                                st.markdown("---")
-                                st.subheader("📦 Batch Download")
-                                
-                                # Create a zip file with all translations
-                                import zipfile
-                                import io
-                                
-                                zip_buffer = io.BytesIO()
-                                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                                    for file_info in translated_files:
-                                        zip_file.writestr(file_info['name'], file_info['data'])
-                                
-                                zip_buffer.seek(0)
-                                
-                                st.download_button(
-                                    label="📦 Download All Files (ZIP)",
-                                    data=zip_buffer.getvalue(),
-                                    file_name=f"{Path(uploaded_file.name).stem}_translations.zip",
-                                    mime="application/zip",
-                                    use_container_width=True
-                                )
-                        else:
-                            st.error("No files were successfully translated.")
+                        job_id = get_job_manager().submit(
+                            input_path, [language_options[lang_name] for lang_name in selected_languages],
+                            priority=INTERACTIVE
+                        )
+                    st.session_state["job_id"] = job_id
+                    st.experimental_set_query_params(job=job_id)
+        
+        # Follow the job of this page, also after a rerun or refresh
+        job_id = (st.session_state.get("job_id")
+                  or st.experimental_get_query_params().get("job", [None])[0])
+        if job_id:
+            job_running = show_job(job_id, language_options, show_progress)
     
     with col2:
         st.header("📊 Statistics")
@@ -266,9 +378,27 @@ def main():
             if selected_languages:
                 st.metric("Target Languages", len(selected_languages))
                 
-                # Estimated time
-                estimated_time = len(selected_languages) * 30  # 30 seconds per language
-                st.metric("Estimated Time", f"{estimated_time // 60}m {estimated_time % 60}s")
+                # Dry-run estimate from the cache and past throughput
+                try:
+                    data = uploaded_file.getbuffer()
+                    estimate = estimate_job(
+                        hashlib.sha256(data).hexdigest(), uploaded_file.name,
+                        tuple(language_options[lang] for lang in selected_languages), data
+                    )
+                except Exception as e:
+                    estimate = None
+                    st.warning(f"Could not estimate this job: {str(e)}")
+                
+                if estimate is not None:
+                    st.metric("Characters to Translate", f"{estimate.chars:,}")
+                    if estimate.seconds is not None:
+                        estimated_time = int(round(estimate.seconds))
+                        st.metric("Estimated Time", f"{estimated_time // 60}m {estimated_time % 60}s")
+                        if estimate.basis == "limits":
+                            st.caption("Based on the service rate limit; "
+                                       "estimates improve after the first translation.")
+                    if estimate.cost is not None:
+                        st.metric("Estimated Cost", f"{estimate.cost:.2f}")
         
         st.markdown("---")
         st.header("💡 Tips")
@@ -278,6 +408,11 @@ def main():
         • Keep text concise
         • Test with a small file first
         """)
+    
+    # Poll the background job until it ends
+    if job_running:
+        time.sleep(1)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
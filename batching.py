@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Batching Module
+
+Helpers for packing many short segments into as few translation requests
+as possible while keeping segment boundaries recoverable.
+"""
+
+# Segments are joined one per line and split back apart on the way out.
+# googletrans 4.0.0rc1 rebuilds a translation by joining the sentence parts
+# of the reply (parsed[1][0][0][5]) with "" or, when the reply asks for
+# spacing, " ". Line breaks therefore only survive while Google keeps them
+# at the end of each part; this was checked by reading the pinned client,
+# not against the live service. When they are lost, split_segments returns
+# None and the caller halves the batch down to single segments, which
+# costs up to 2N-1 requests instead of one. FakeBackend(joined=True,
+# line_break_loss=...) exercises that path offline.
+SEGMENT_SEPARATOR = "\n"
+
+
+def can_batch(text: str) -> bool:
+    """
+    Check whether a segment can share a request with other segments.
+
+    Args:
+        text (str): Segment text
+
+    Returns:
+        bool: False if the text itself contains a line break
+    """
+    return "\n" not in text and "\r" not in text
+
+
+def pack_batches(texts, max_chars=4500, max_segments=128):
+    """
+    Group segments into request-sized batches.
+
+    Args:
+        texts (list): Segment texts
+        max_chars (int): Maximum characters per request, separators included
+        max_segments (int): Maximum number of segments per request
+
+    Returns:
+        list: List of batches, each a list of indices into ``texts``
+    """
+    batches = []
+    current = []
+    current_chars = 0
+
+    for i, text in enumerate(texts):
+        if not can_batch(text) or len(text) >= max_chars:
+            batches.append([i])
+            continue
+
+        extra = len(text) + (len(SEGMENT_SEPARATOR) if current else 0)
+        if current and (current_chars + extra > max_chars or len(current) >= max_segments):
+            batches.append(current)
+            current = []
+            current_chars = 0
+            extra = len(text)
+
+        current.append(i)
+        current_chars += extra
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def join_segments(texts) -> str:
+    """
+    Join segments into a single request payload.
+
+    Args:
+        texts (list): Segment texts, none containing a line break
+
+    Returns:
+        str: Joined payload
+    """
+    return SEGMENT_SEPARATOR.join(texts)
+
+
+def split_segments(text: str, expected: int):
+    """
+    Split a translated payload back into segments.
+
+    Args:
+        text (str): Translated payload
+        expected (int): Number of segments that were joined
+
+    Returns:
+        list: Translated segments, or None if the boundaries were not
+            preserved and the payload cannot be trusted
+    """
+    parts = text.replace("\r\n", "\n").split(SEGMENT_SEPARATOR)
+    if len(parts) != expected:
+        return None
+    return parts
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for PPT Translator.
+
+Generates synthetic presentations, translates them against the offline
+FakeBackend with simulated latency and reports per-phase timings as JSON.
+
+Example:
+    python benchmark.py --slides 200 --duplicate-ratio 0.7 --latency 0.05 \\
+        --languages fr,de,es --output bench_results.jsonl
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from ppt_translator import PPTTranslator
+from translation_backends import FakeBackend
+from translation_cache import TranslationCache
+
+
+WORDS = (
+    "quarterly revenue growth customer market product strategy team roadmap "
+    "launch review budget forecast region partner platform service support "
+    "training quality delivery target pipeline risk opportunity summary next "
+    "steps overview agenda goal metric update plan result insight objective"
+).split()
+
+
+class TextSource:
+    """
+    Produces synthetic segment texts with a controlled share of repeats.
+    """
+
+    def __init__(self, duplicate_ratio=0.5, pool_size=50, seed=0):
+        """
+        Initialize the source.
+
+        Args:
+            duplicate_ratio (float): Probability that a text is drawn from
+                a small pool of recurring strings
+            pool_size (int): Number of recurring strings
+            seed (int): Random seed
+        """
+        self.duplicate_ratio = duplicate_ratio
+        self.random = random.Random(seed)
+        self.counter = 0
+        self.pool = [self._sentence() for _ in range(pool_size)]
+
+    def _sentence(self):
+        self.counter += 1
+        words = self.random.sample(WORDS, self.random.randint(2, 7))
+        return " ".join(words).capitalize() + f" {self.counter}"
+
+    def next(self):
+        """
+        Get the next text.
+
+        Returns:
+            str: Segment text
+        """
+        if self.random.random() < self.duplicate_ratio:
+            return self.random.choice(self.pool)
+        return self._sentence()
+
+
+def _fill_text_frame(tf, source, paragraphs, runs):
+    for p_index in range(paragraphs):
+        p = tf.paragraphs[0] if p_index == 0 else tf.add_paragraph()
+        for r_index in range(runs):
+            run = p.add_run()
+            run.text = source.next() + " "
+            run.font.bold = r_index % 2 == 1
+            run.font.size = Pt(14)
+
+
+def generate_deck(path, slides=20, text_frames=3, paragraphs=2, runs=3, tables=1,
+                  table_rows=4, table_cols=3, group_depth=1, duplicate_ratio=0.5, seed=0):
+    """
+    Write a synthetic presentation.
+
+    Args:
+        path (str): Output .pptx path
+        slides (int): Number of slides
+        text_frames (int): Text boxes per slide
+        paragraphs (int): Paragraphs per text box
+        runs (int): Runs per paragraph
+        tables (int): Tables per slide
+        table_rows (int): Rows per table
+        table_cols (int): Columns per table
+        group_depth (int): Depth of nested group shapes per slide, 0 for none
+        duplicate_ratio (float): Share of texts drawn from recurring strings
+        seed (int): Random seed
+
+    Returns:
+        str: The output path
+    """
+    source = TextSource(duplicate_ratio=duplicate_ratio, seed=seed)
+    prs = Presentation()
+    layout = prs.slide_layouts[5]
+
+    for slide_index in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = source.next()
+
+        for i in range(text_frames):
+            box = slide.shapes.add_textbox(Inches(0.5), Inches(1.5 + i), Inches(4), Inches(1))
+            _fill_text_frame(box.text_frame, source, paragraphs, runs)
+
+        for i in range(tables):
+            shape = slide.shapes.add_table(table_rows, table_cols, Inches(5), Inches(1.5 + i * 2),
+                                           Inches(4), Inches(1.5))
+            for row in shape.table.rows:
+                for cell in row.cells:
+                    cell.text = source.next()
+
+        shapes = slide.shapes
+        for depth in range(group_depth):
+            group = shapes.add_group_shape()
+            box = group.shapes.add_textbox(Inches(0.5), Inches(6 + depth * 0.2), Inches(3), Inches(0.5))
+            _fill_text_frame(box.text_frame, source, 1, runs)
+            shapes = group.shapes
+
+    prs.save(path)
+    return path
+
+
+def run_benchmark(deck_path, languages, backend, cache=None, max_workers=4, engine="pptx",
+                  segmentation="run", pipelined=True):
+    """
+    Translate a deck and time each phase.
+
+    Each language goes through translate_presentation, the path users
+    take, and the phase breakdown is read from the translator's metrics.
+
+    Args:
+        deck_path (str): Input .pptx path
+        languages (list): Target language codes
+        backend (TranslationBackend): Backend to translate with
+        cache (TranslationCache): Optional translation memory
+        max_workers (int): Concurrent requests
+        engine (str): "pptx" or "xml" traversal engine
+        segmentation (str): "run" or "paragraph" segmentation
+        pipelined (bool): Let the "xml" engine run its stages overlapped
+
+    Returns:
+        dict: Phase timings in seconds and run counters
+    """
+    translator = PPTTranslator(cache=cache if cache is not None else False,
+                               max_workers=max_workers, backend=backend, engine=engine,
+                               segmentation=segmentation, use_manifests=False,
+                               history=False, checkpoints=False, pipelined=pipelined)
+    metrics = translator.metrics
+    inventory = translator.load_template(deck_path).inventory
+    metrics.reset()
+    calls_before = getattr(backend, "calls", 0)
+    chars_before = getattr(backend, "chars", 0)
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for lang in languages:
+            translator.translate_presentation(deck_path, os.path.join(out_dir, f"bench_{lang}.pptx"),
+                                              lang)
+
+    total = time.perf_counter() - started
+    translator.close()
+    snapshot = metrics.snapshot()
+    result = {
+        "phases": {name: phase["seconds"] for name, phase in snapshot["phases"].items()},
+        "total": total,
+        "inventory": inventory.stats(),
+        "backend_calls": getattr(backend, "calls", 0) - calls_before,
+        "backend_chars": getattr(backend, "chars", 0) - chars_before,
+        "backend_latency": snapshot["backend"]["latency_seconds"],
+        "retries": snapshot["backend"]["retries"],
+    }
+    if cache is not None:
+        result["cache"] = cache.stats()
+    return result
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark PPT Translator on a synthetic deck")
+    parser.add_argument("--slides", type=int, default=50)
+    parser.add_argument("--text-frames", type=int, default=3)
+    parser.add_argument("--paragraphs", type=int, default=2)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--tables", type=int, default=1)
+    parser.add_argument("--table-rows", type=int, default=4)
+    parser.add_argument("--table-cols", type=int, default=3)
+    parser.add_argument("--group-depth", type=int, default=1)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--languages", default="fr", help="Comma-separated target languages")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per request")
+    parser.add_argument("--latency-per-char", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--joined", action="store_true",
+                        help="Send batches as one joined request, like the Google backend")
+    parser.add_argument("--line-break-loss", type=float, default=0.0,
+                        help="Probability that a joined request loses its line breaks")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--engine", choices=["pptx", "xml"], default="pptx")
+    parser.add_argument("--segmentation", choices=["run", "paragraph"], default="run")
+    parser.add_argument("--staged", action="store_true",
+                        help="Run the xml engine's phases one after another instead of pipelined")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--cache", action="store_true",
+                        help="Share an in-memory translation cache across repeats")
+    parser.add_argument("--deck", help="Benchmark an existing .pptx instead of a synthetic deck")
+    parser.add_argument("--output", help="Append JSON results to this file (one line per run)")
+    args = parser.parse_args()
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    config = {k: v for k, v in vars(args).items() if k != "output"}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        deck_path = args.deck
+        t = time.perf_counter()
+        if deck_path is None:
+            deck_path = generate_deck(
+                os.path.join(work_dir, "synthetic.pptx"), slides=args.slides,
+                text_frames=args.text_frames, paragraphs=args.paragraphs, runs=args.runs,
+                tables=args.tables, table_rows=args.table_rows, table_cols=args.table_cols,
+                group_depth=args.group_depth, duplicate_ratio=args.duplicate_ratio, seed=args.seed,
+            )
+        generate_time = time.perf_counter() - t
+
+        cache = TranslationCache(":memory:") if args.cache else None
+        for repeat in range(args.repeat):
+            backend = FakeBackend(latency=args.latency, latency_per_char=args.latency_per_char,
+                                  failure_rate=args.failure_rate, seed=args.seed,
+                                  joined=args.joined, line_break_loss=args.line_break_loss)
+            result = run_benchmark(deck_path, languages, backend, cache=cache,
+                                   max_workers=args.workers, engine=args.engine,
+                                   segmentation=args.segmentation,
+                                   pipelined=not args.staged)
+            result.update({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "repeat": repeat,
+                "config": config,
+                "deck_bytes": os.path.getsize(deck_path),
+                "generate_time": generate_time,
+                "python": platform.python_version(),
+            })
+            line = json.dumps(result, sort_keys=True)
+            print(line)
+            if args.output:
+                with open(args.output, "a", encoding="utf-8") as fh:
+                    fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
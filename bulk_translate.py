@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk Translate Module
+
+Command-line tool that translates every deck in a set of directories or
+glob patterns. Parsing, applying translations and saving run in a pool of
+worker processes; all translation requests are forwarded to a single
+PPTTranslator in the main process, so every deck shares one backend,
+rate limiter, glossary and translation cache.
+
+Example:
+    python bulk_translate.py decks/ "archive/**/*.pptx" --languages fr,de,ja --output-dir out
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import argparse
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from checkpoint import file_hash
+from glossary import Glossary
+from ppt_translator import PPTTranslator
+from retry_policy import CircuitOpenError, RetryPolicy
+from scheduler import FairScheduler
+from translation_backends import BackendLimits, FakeBackend, GoogleTransBackend, TranslationBackend
+from translation_manifest import write_json_atomic
+
+
+RESULTS_NAME = "bulk_results.json"
+
+
+class RemoteBackend(TranslationBackend):
+    """
+    Backend used inside worker processes: forwards every request to the
+    TranslationService of the main process and waits for its reply.
+
+    Requests are large because the main process re-batches them to the
+    real backend's limits.
+    """
+
+    limits = BackendLimits(max_chars=200000, max_batch_size=2000, requests_per_second=None)
+
+    def __init__(self, name, requests, replies, slot):
+        """
+        Initialize the backend.
+
+        Args:
+            name (str): Name of the real backend, so checkpoints and
+                manifests match those written by a direct run
+            requests: Queue shared by all workers for outgoing requests
+            replies: This worker's reply queue
+            slot (int): Index of ``replies`` in the service
+        """
+        self.name = name
+        self._requests = requests
+        self._replies = replies
+        self._slot = slot
+        self._ids = itertools.count()
+        self._waiting = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._receive, daemon=True).start()
+
+    def _receive(self):
+        while True:
+            request_id, translations, error = self._replies.get()
+            with self._lock:
+                waiter = self._waiting.pop(request_id)
+            waiter[1:] = [translations, error]
+            waiter[0].set()
+
+    def translate_batch(self, texts, dest: str, src: str = "auto"):
+        waiter = [threading.Event(), None, None]
+        with self._lock:
+            request_id = next(self._ids)
+            self._waiting[request_id] = waiter
+        self._requests.put((self._slot, request_id, list(texts), dest, src))
+        waiter[0].wait()
+        error = waiter[2]
+        if isinstance(error, CircuitOpenError):
+            raise error
+        if error is not None:
+            raise Exception(error)
+        return waiter[1]
+
+    def translate(self, text: str, dest: str, src: str = "auto"):
+        return self.translate_batch([text], dest, src)[0]
+
+
+class TranslationService:
+    """
+    Serves translation requests from worker processes with one translator.
+    """
+
+    def __init__(self, translator, processes, concurrency):
+        """
+        Initialize the service.
+
+        Args:
+            translator (PPTTranslator): Translator that handles every request
+            processes (int): Number of worker processes
+            concurrency (int): Requests handled at the same time
+        """
+        self.translator = translator
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Queue()
+        self.replies = [context.Queue() for _ in range(processes)]
+        self.slots = context.Queue()
+        for slot in range(processes):
+            self.slots.put(slot)
+        # One scheduler job per worker process, so decks progress evenly
+        self._jobs = [
+            translator.scheduler.job(f"worker-{slot}") if translator.scheduler else None
+            for slot in range(processes)
+        ]
+        self._handlers = ThreadPoolExecutor(max_workers=concurrency)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            self._handlers.submit(self._handle, *item)
+
+    def _handle(self, slot, request_id, texts, dest, src):
+        try:
+            pending = self.translator.submit_batch(texts, dest, sources=[src] * len(texts),
+                                                   job=self._jobs[slot])
+            translations = pending.result()
+            # Failed segments come back empty so the worker does not
+            # checkpoint them as translated
+            reply = [None if i in pending.failed else t for i, t in enumerate(translations)]
+            self.replies[slot].put((request_id, reply, None))
+        except CircuitOpenError as e:
+            # Sent as is, so the worker fails the deck instead of saving
+            # its source text
+            self.replies[slot].put((request_id, None, CircuitOpenError(str(e))))
+        except Exception as e:
+            self.replies[slot].put((request_id, None, str(e)))
+
+    def close(self):
+        """Stop serving requests."""
+        self.requests.put(None)
+        self._thread.join()
+        self._handlers.shutdown()
+
+
+_worker_translator = None
+
+
+def _init_worker(options, backend_name, requests, replies, slots):
+    global _worker_translator
+    slot = slots.get()
+    backend = RemoteBackend(backend_name, requests, replies[slot], slot)
+    _worker_translator = PPTTranslator(
+        cache=False,
+        max_workers=options["threads"],
+        rate_limiter=False,
+        retry_policy=RetryPolicy(max_attempts=1),
+        backend=backend,
+        engine=options["engine"],
+        segmentation=options["segmentation"],
+        use_manifests=options["use_manifests"],
+        history=False,
+    )
+
+
+def _translate_deck(input_path, output_dir, languages):
+    """
+    Translate one deck in a worker process.
+
+    Returns:
+        dict: Saved output per language, errors per language, segments
+            saved with their source text per language and timing
+    """
+    outputs = {}
+    errors = {}
+    failed = {}
+
+    def on_progress(event):
+        if event.kind == "saved":
+            outputs[event.lang] = event.path
+            if event.failed_segments:
+                failed[event.lang] = event.failed_segments
+        elif event.kind == "failed":
+            errors[event.lang] = event.error
+
+    started = time.perf_counter()
+    try:
+        _worker_translator.translate_multiple_languages(
+            input_path, output_dir, languages, on_progress=on_progress
+        )
+        error = None if outputs or errors else "Could not read presentation"
+    except Exception as e:
+        error = str(e)
+    return {
+        "outputs": outputs,
+        "errors": errors,
+        "failed": failed,
+        "error": error,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def find_decks(patterns, recursive=False):
+    """
+    Expand directories and glob patterns into .pptx paths.
+
+    Args:
+        patterns (list): Directories, files or glob patterns
+        recursive (bool): Also search sub-directories of directories
+
+    Returns:
+        list: Sorted, de-duplicated deck paths
+    """
+    decks = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub = os.path.join("**", "*.pptx") if recursive else "*.pptx"
+            matches = glob.glob(os.path.join(pattern, sub), recursive=recursive)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in matches:
+            name = os.path.basename(path)
+            # Skip PowerPoint lock files
+            if name.lower().endswith(".pptx") and not name.startswith("~$") and os.path.isfile(path):
+                decks.add(os.path.abspath(path))
+    return sorted(decks)
+
+
+def _up_to_date(entry, digest, languages):
+    """
+    Check whether a previous run already produced every output of a deck,
+    with no segment left in its source language.
+    """
+    if not entry or entry.get("hash") != digest:
+        return False
+    outputs = entry.get("outputs", {})
+    # Entries without failure counts predate them and cannot be trusted
+    failed = entry.get("failed")
+    if failed is None or any(failed.get(lang) for lang in languages):
+        return False
+    return all(lang in outputs and os.path.exists(outputs[lang]) for lang in languages)
+
+
+def bulk_translate(decks, languages, output_dir, translator, processes=None, threads=4,
+                   engine="xml", segmentation="run", use_manifests=True, force=False,
+                   results_path=None):
+    """
+    Translate many decks into several languages.
+
+    Decks whose content and outputs are unchanged since the last run, as
+    recorded in the results manifest, are skipped; interrupted decks
+    resume from their checkpoints.
+
+    Args:
+        decks (list): Deck paths
+        languages (list): Target language codes
+        output_dir (str): Output root; each deck's outputs go to the same
+            relative directory as the deck has below the decks' common root
+        translator (PPTTranslator): Translator whose backend, cache and
+            glossary serve every deck
+        processes (int): Worker processes, defaults to the CPU count
+        threads (int): Requests each worker keeps in flight
+        engine (str): "pptx" or "xml", see PPTTranslator
+        segmentation (str): "run" or "paragraph", see PPTTranslator
+        use_manifests (bool): Write and reuse per-output manifests
+        force (bool): Translate every deck even if it is up to date
+        results_path (str): Results manifest path, defaults to
+            ``bulk_results.json`` in ``output_dir``
+
+    Returns:
+        dict: The results manifest
+    """
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = results_path or os.path.join(output_dir, RESULTS_NAME)
+    languages = [translator.normalize_lang(lang).replace("/", "-") for lang in languages]
+    previous = {}
+    try:
+        with open(results_path, "r", encoding="utf-8") as fh:
+            previous = json.load(fh).get("decks", {})
+    except (OSError, ValueError):
+        pass
+
+    root = os.path.commonpath([os.path.dirname(d) for d in decks]) if decks else output_dir
+    results = {
+        "languages": languages,
+        "backend": translator.backend.name,
+        "started": time.time(),
+        "finished": None,
+        "decks": {},
+    }
+    todo = []
+    for deck in decks:
+        key = os.path.relpath(deck, root)
+        digest = file_hash(deck)
+        entry = previous.get(key)
+        if not force and _up_to_date(entry, digest, languages):
+            results["decks"][key] = dict(entry, state="skipped")
+            print(f"✔ Up to date: {key}")
+            continue
+        deck_out = os.path.join(output_dir, os.path.dirname(key))
+        results["decks"][key] = {"input": deck, "hash": digest, "state": "pending"}
+        todo.append((key, deck, deck_out))
+    write_json_atomic(results_path, results)
+
+    processes = max(1, min(processes or os.cpu_count() or 1, len(todo) or 1))
+    service = TranslationService(translator, processes, processes * threads)
+    options = {
+        "threads": threads,
+        "engine": engine,
+        "segmentation": segmentation,
+        "use_manifests": use_manifests,
+    }
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(options, translator.backend.name, service.requests, service.replies,
+                      service.slots),
+        ) as pool:
+            futures = {
+                pool.submit(_translate_deck, deck, deck_out, languages): key
+                for key, deck, deck_out in todo
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                entry = results["decks"][key]
+                try:
+                    entry.update(future.result())
+                except Exception as e:
+                    entry.update(outputs={}, errors={}, failed={}, error=str(e))
+                if entry["error"] or not entry["outputs"]:
+                    entry["state"] = "failed"
+                    print(f"❌ {key}: {entry['error'] or 'no language could be translated'}")
+                elif entry["errors"] or entry["failed"]:
+                    entry["state"] = "partial"
+                    complete = len(set(entry["outputs"]) - set(entry["failed"]))
+                    print(f"⚠ {key}: {complete}/{len(languages)} languages complete "
+                          f"({entry['seconds']:.1f}s), rerun to resume")
+                else:
+                    entry["state"] = "done"
+                    print(f"✔ {key}: {len(entry['outputs'])}/{len(languages)} languages "
+                          f"({entry['seconds']:.1f}s)")
+                write_json_atomic(results_path, results)
+    finally:
+        service.close()
+
+    results["finished"] = time.time()
+    write_json_atomic(results_path, results)
+    return results
+
+
+def main():
+    """Run a bulk translation from the command line."""
+    parser = argparse.ArgumentParser(description="Translate a directory or glob of .pptx decks")
+    parser.add_argument("inputs", nargs="+", help="Directories, .pptx files or glob patterns")
+    parser.add_argument("--languages", required=True, help="Comma-separated target languages")
+    parser.add_argument("--output-dir", required=True, help="Directory for the translated decks")
+    parser.add_argument("--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=4,
+                        help="Requests each worker process keeps in flight")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Requests in flight to the translation backend")
+    parser.add_argument("--engine", choices=["pptx", "xml"], default="xml")
+    parser.add_argument("--segmentation", choices=["run", "paragraph"], default="run")
+    parser.add_argument("--glossary", help="Glossary file (.json or .csv)")
+    parser.add_argument("--backend", choices=["google", "fake"], default="google",
+                        help="Translation backend; 'fake' translates offline for dry runs")
+    parser.add_argument("--no-manifests", action="store_true",
+                        help="Do not write or reuse per-output translation manifests")
+    parser.add_argument("--force", action="store_true",
+                        help="Translate decks even if the last run left them up to date")
+    parser.add_argument("--results", help=f"Results manifest path (default: OUTPUT_DIR/{RESULTS_NAME})")
+    args = parser.parse_args()
+
+    decks = find_decks(args.inputs, args.recursive)
+    if not decks:
+        print("❌ No .pptx files found")
+        return 1
+
+    backend = FakeBackend() if args.backend == "fake" else GoogleTransBackend()
+    scheduler = FairScheduler(max_workers=args.workers,
+                              requests_per_second=backend.limits.requests_per_second)
+    translator = PPTTranslator(
+        backend=backend,
+        scheduler=scheduler,
+        glossary=Glossary.load(args.glossary) if args.glossary else None,
+        use_manifests=False,
+        checkpoints=False,
+    )
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    print(f"Translating {len(decks)} deck(s) into {', '.join(languages)}")
+    results = bulk_translate(
+        decks, languages, args.output_dir, translator,
+        processes=args.processes,
+        threads=args.threads,
+        engine=args.engine,
+        segmentation=args.segmentation,
+        use_manifests=not args.no_manifests,
+        force=args.force,
+        results_path=args.results,
+    )
+    scheduler.shutdown()
+    translator.close()
+
+    states = [entry["state"] for entry in results["decks"].values()]
+    print(f"Done: {states.count('done')} translated, {states.count('skipped')} up to date, "
+          f"{states.count('partial')} partial, {states.count('failed')} failed")
+    print(f"Results: {args.results or os.path.join(args.output_dir, RESULTS_NAME)}")
+    return 1 if "failed" in states or "partial" in states else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint Module
+
+Periodic on-disk checkpoints of completed segment translations per
+(deck, language), so an interrupted job resumes where it stopped instead
+of paying for the same translations again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from translation_manifest import segment_hash
+
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "ppt_translator", "checkpoints"
+)
+
+
+def file_hash(path: str) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: Hex digest identifying the content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+class Checkpoint:
+    """
+    Completed translations of one deck into one language.
+
+    The file is append-only JSON lines, so a crash mid-write loses at most
+    the last unflushed entries.
+    """
+
+    def __init__(self, path: str, flush_every=100, flush_interval=2.0):
+        """
+        Open a checkpoint, loading any entries already on disk.
+
+        Args:
+            path (str): Checkpoint file path
+            flush_every (int): Buffered entries that trigger a write
+            flush_interval (float): Seconds after which buffered entries
+                are written on the next record
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.entries = {}
+        self.completed = False
+        self.output = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "h" in item:
+                        self.entries[item["h"]] = item["t"]
+                    elif item.get("complete"):
+                        self.completed = True
+                        self.output = item.get("output")
+        except OSError:
+            pass
+
+    def lookup(self, texts):
+        """
+        Find checkpointed translations.
+
+        Args:
+            texts (list): Source segments
+
+        Returns:
+            dict: Mapping of source text to translation
+        """
+        known = {}
+        for text in texts:
+            translation = self.entries.get(segment_hash(text))
+            if translation is not None:
+                known[text] = translation
+        return known
+
+    def record(self, texts, translations):
+        """
+        Add completed translations. Safe to call from worker threads.
+
+        Translations equal to their source are skipped, so failed segments
+        are retried on resume.
+
+        Args:
+            texts (list): Source segments
+            translations (list): Translations, parallel to ``texts``
+        """
+        with self._lock:
+            for text, translation in zip(texts, translations):
+                if translation == text:
+                    continue
+                key = segment_hash(text)
+                if self.entries.get(key) != translation:
+                    self.entries[key] = translation
+                    self._buffer.append({"h": key, "t": translation})
+            if (len(self._buffer) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+    def _flush(self, extra=None):
+        lines = self._buffer + ([extra] if extra else [])
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        if not lines:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            for item in lines:
+                fh.write(json.dumps(item, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def flush(self):
+        """Write buffered entries to disk."""
+        with self._lock:
+            self._flush()
+
+    def complete(self, output_path: str):
+        """
+        Mark the language as finished.
+
+        Args:
+            output_path (str): Path the translated deck was saved to
+        """
+        with self._lock:
+            self.completed = True
+            self.output = output_path
+            self._flush({"complete": True, "output": output_path})
+
+
+class CheckpointStore:
+    """
+    A directory of checkpoints, one per (deck hash, language, backend,
+    settings).
+
+    Checkpoints stay in memory only while they are in use; they are
+    dropped once released or flushed and reloaded from disk when opened
+    again.
+    """
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR, max_age=7 * 24 * 3600, **options):
+        """
+        Initialize the store and drop checkpoints older than ``max_age``.
+
+        Args:
+            directory (str): Checkpoint directory
+            max_age (float): Seconds after which unused checkpoints are
+                deleted, or None to keep them
+            **options: Passed to each Checkpoint
+        """
+        self.directory = directory
+        self.options = options
+        self._open = {}
+        self._lock = threading.Lock()
+        if max_age is not None and os.path.isdir(directory):
+            cutoff = time.time() - max_age
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    def open(self, deck_hash: str, lang: str, backend: str, settings: str = None) -> Checkpoint:
+        """
+        Get the checkpoint of a deck and language, loading it once.
+
+        Args:
+            deck_hash (str): Content hash of the source deck
+            lang (str): Target language code
+            backend (str): Name of the translation backend
+            settings (str): Fingerprint of the translator settings that
+                change the output, such as segmentation or glossary
+
+        Returns:
+            Checkpoint: Open checkpoint
+        """
+        key = (deck_hash, lang, backend, settings)
+        with self._lock:
+            checkpoint = self._open.get(key)
+            if checkpoint is None:
+                name = f"{deck_hash}_{lang}_{backend}"
+                if settings:
+                    name += f"_{settings}"
+                name = f"{name}.jsonl".replace("/", "-")
+                checkpoint = Checkpoint(os.path.join(self.directory, name), **self.options)
+                self._open[key] = checkpoint
+            return checkpoint
+
+    def release(self, checkpoint: Checkpoint):
+        """
+        Write a checkpoint's buffered entries and drop it from memory.
+
+        Args:
+            checkpoint (Checkpoint): Checkpoint returned by open()
+        """
+        with self._lock:
+            self._open = {k: v for k, v in self._open.items() if v is not checkpoint}
+        checkpoint.flush()
+
+    def flush(self):
+        """Write buffered entries of every open checkpoint and drop them from memory."""
+        with self._lock:
+            checkpoints = list(self._open.values())
+            self._open = {}
+        for checkpoint in checkpoints:
+            checkpoint.flush()
+
+    def clear(self, deck_hash: str = None):
+        """
+        Delete checkpoints.
+
+        Args:
+            deck_hash (str): Only delete the checkpoints of this deck
+        """
+        with self._lock:
+            self._open = {k: v for k, v in self._open.items()
+                          if deck_hash is not None and k[0] != deck_hash}
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if deck_hash is None or name.startswith(deck_hash + "_"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
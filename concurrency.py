@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrency Module
+
+A token-bucket rate limiter and a handle for translations that are still
+in flight on a worker pool.
+"""
+
+from concurrent.futures import wait as futures_wait
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token-bucket rate limiter.
+
+    One bucket can be shared by several translators to keep all of them
+    under a single provider quota.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum burst size, defaults to one second's
+                worth of tokens
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens if they are available right now.
+
+        Args:
+            tokens (float): Number of tokens to take
+
+        Returns:
+            bool: True if the tokens were taken
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Get how long it would take until tokens are available.
+
+        Args:
+            tokens (float): Number of tokens wanted
+
+        Returns:
+            float: Seconds to wait, 0 if the tokens are available now
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Block until tokens are available, then take them.
+
+        Args:
+            tokens (float): Number of tokens to take
+        """
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationCancelled(Exception):
+    """Raised when a translation is stopped before it finished."""
+
+
+class PendingTranslation:
+    """
+    Translations of a list of texts that are being produced by a worker pool.
+    """
+
+    def __init__(self, results, futures, failed=None):
+        """
+        Initialize the handle.
+
+        Args:
+            results (list): Output list the workers write into
+            futures (list): Futures of the submitted work units
+            failed (set): Indices the workers could not translate; those
+                keep their source text in the results
+        """
+        self._results = results
+        self._futures = futures
+        self.failed = failed if failed is not None else set()
+
+    def done(self) -> bool:
+        """
+        Check whether every work unit has finished.
+
+        Returns:
+            bool: True if the translations are complete
+        """
+        return all(f.done() for f in self._futures)
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for every work unit, up to a timeout.
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            bool: True if the translations are complete
+        """
+        _, not_done = futures_wait(self._futures, timeout=timeout)
+        return not not_done
+
+    def cancel(self):
+        """
+        Cancel the work units that have not started yet.
+
+        Units already running still finish and write their results.
+        """
+        for f in self._futures:
+            f.cancel()
+
+    def result(self):
+        """
+        Wait for every work unit and return the translations.
+
+        Returns:
+            list: Translated texts, parallel to the submitted texts
+
+        Raises:
+            Exception: The first error raised by a work unit
+        """
+        for f in self._futures:
+            f.result()
+        return self._results
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Estimator Module
+
+Dry-run estimates of what a translation job will cost: characters and
+backend requests still to send after the cache, and wall time predicted
+from the throughput recorded on previous jobs.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+import threading
+
+from translation_manifest import write_json_atomic
+
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ppt_translator", "throughput.json"
+)
+
+
+class ThroughputHistory:
+    """
+    Observed throughput per backend, as exponentially weighted averages
+    over recent jobs, persisted to a small JSON file.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, smoothing=0.3):
+        """
+        Initialize the history.
+
+        Args:
+            path (str): JSON file path, or None to keep history in memory
+            smoothing (float): Weight of the newest job in the averages
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self.backends = {}
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    self.backends = json.load(fh)
+            except (OSError, ValueError):
+                self.backends = {}
+
+    def _average(self, entry, key, value):
+        if value is None:
+            return
+        old = entry.get(key)
+        entry[key] = value if old is None else old + self.smoothing * (value - old)
+
+    def record(self, backend: str, requests: int, chars: int, translate_seconds: float,
+               processing_seconds: float = None, megabytes: float = None):
+        """
+        Record the throughput of a finished job.
+
+        Args:
+            backend (str): Name of the translation backend
+            requests (int): Backend requests made
+            chars (int): Characters sent
+            translate_seconds (float): Wall time spent waiting for translations
+            processing_seconds (float): Time spent loading, applying and
+                saving, summed over languages
+            megabytes (float): Deck size times the number of languages
+        """
+        with self._lock:
+            entry = self.backends.setdefault(backend, {"jobs": 0})
+            if requests and translate_seconds > 0:
+                self._average(entry, "requests_per_second", requests / translate_seconds)
+                self._average(entry, "chars_per_second", chars / translate_seconds)
+            if processing_seconds is not None and megabytes:
+                self._average(entry, "seconds_per_megabyte", processing_seconds / megabytes)
+            entry["jobs"] += 1
+            if self.path:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    write_json_atomic(self.path, self.backends)
+                except OSError:
+                    pass
+
+    def get(self, backend: str):
+        """
+        Get the recorded averages of a backend.
+
+        Args:
+            backend (str): Name of the translation backend
+
+        Returns:
+            dict: Averages, empty if no job has been recorded
+        """
+        with self._lock:
+            return dict(self.backends.get(backend, {}))
+
+
+@dataclass
+class LanguageEstimate:
+    """
+    Expected work for one target language.
+
+    Attributes:
+        segments (int): Unique segments in the deck
+        reused (int): Segments kept as-is or reused without a lookup
+        cached (int): Segments found in the translation cache
+        to_send (int): Segments that will be sent to the backend
+        chars (int): Characters that will be sent
+        requests (int): Backend requests, after batching
+    """
+
+    segments: int = 0
+    reused: int = 0
+    cached: int = 0
+    to_send: int = 0
+    chars: int = 0
+    requests: int = 0
+
+
+@dataclass
+class JobEstimate:
+    """
+    Dry-run estimate for translating a deck into several languages.
+
+    Attributes:
+        unique_segments (int): Unique segments in the deck
+        unique_chars (int): Characters across unique segments
+        languages (dict): LanguageEstimate per target language code
+        requests (int): Backend requests across languages
+        chars (int): Characters sent across languages
+        seconds (float): Estimated wall time, or None without history or
+            a declared rate limit
+        basis (str): "history" if the time comes from recorded jobs,
+            "limits" if only the backend's declared rate limit was known,
+            or None
+        cost (float): Estimated price, or None if the backend declares none
+    """
+
+    unique_segments: int = 0
+    unique_chars: int = 0
+    languages: dict = field(default_factory=dict)
+    requests: int = 0
+    chars: int = 0
+    seconds: float = None
+    basis: str = None
+    cost: float = None
+
+    def predict(self, history: dict, limits, megabytes: float):
+        """
+        Fill in the wall time and cost estimate.
+
+        Args:
+            history (dict): Averages from ThroughputHistory.get
+            limits (BackendLimits): Declared limits of the backend
+            megabytes (float): Deck size in megabytes
+        """
+        if limits.cost_per_million_chars is not None:
+            self.cost = self.chars / 1e6 * limits.cost_per_million_chars
+
+        rps = history.get("requests_per_second")
+        cps = history.get("chars_per_second")
+        if rps:
+            self.basis = "history"
+            seconds = self.requests / rps
+            if cps:
+                seconds = max(seconds, self.chars / cps)
+        elif limits.requests_per_second:
+            self.basis = "limits"
+            seconds = self.requests / limits.requests_per_second
+        elif not self.requests:
+            seconds = 0.0
+        else:
+            return
+        per_mb = history.get("seconds_per_megabyte")
+        if per_mb:
+            seconds += per_mb * megabytes * len(self.languages)
+        self.seconds = seconds
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Glossary Module
+
+Do-not-translate terms and fixed term translations. Every segment is
+scanned for all glossary terms in one pass with an Aho–Corasick automaton,
+and matched spans are replaced by placeholders before the segment is sent
+to the backend, then restored in the translation.
+"""
+
+from collections import deque
+import csv
+import hashlib
+import json
+import re
+
+from segmentation import TAG_RE
+
+
+PLACEHOLDER_RE = re.compile(r"<\s*g\s*(\d+)\s*/?\s*>")
+
+
+def _fold(text):
+    """Lower-case text without changing its length, so offsets stay valid."""
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class AhoCorasick:
+    """
+    A multi-pattern string matcher that runs in time linear in the text
+    length plus the number of matches, regardless of how many patterns
+    it holds.
+    """
+
+    def __init__(self, patterns):
+        """
+        Build the automaton.
+
+        Args:
+            patterns (list): Non-empty pattern strings
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [-1]
+        self.dict_link = [0]
+        self.lengths = []
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(-1)
+                    self.dict_link.append(0)
+                node = nxt
+            if self.output[node] == -1:
+                self.output[node] = index
+            self.lengths.append(len(pattern))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = link = self.goto[state].get(ch, 0)
+                self.dict_link[child] = link if self.output[link] != -1 else self.dict_link[link]
+
+    def iter_matches(self, text):
+        """
+        Find every occurrence of every pattern.
+
+        Args:
+            text (str): Text to scan
+
+        Yields:
+            tuple: (start, end, pattern index)
+        """
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            match = node if self.output[node] != -1 else self.dict_link[node]
+            while match:
+                index = self.output[match]
+                yield pos + 1 - self.lengths[index], pos + 1, index
+                match = self.dict_link[match]
+
+
+class ProtectedText:
+    """
+    A segment with glossary terms replaced by placeholders.
+
+    Attributes:
+        text (str): Segment with ``<gN/>`` placeholders
+        replacements (list): Text restored for each placeholder
+        covered (bool): True if nothing translatable is left outside the
+            placeholders
+    """
+
+    def __init__(self, text, replacements, covered):
+        self.text = text
+        self.replacements = replacements
+        self.covered = covered
+
+    def restore(self, translated: str):
+        """
+        Put the glossary terms back into a translation.
+
+        Args:
+            translated (str): Translation of ``text``
+
+        Returns:
+            str: Translation with terms restored, or None if the backend
+                dropped or invented placeholders
+        """
+        ids = [int(m.group(1)) for m in PLACEHOLDER_RE.finditer(translated)]
+        if sorted(set(ids)) != list(range(len(self.replacements))):
+            return None
+        return PLACEHOLDER_RE.sub(lambda m: self.replacements[int(m.group(1))], translated)
+
+
+class Glossary:
+    """
+    A set of protected terms, each kept as-is or mapped to fixed
+    translations per target language.
+    """
+
+    def __init__(self, entries, case_sensitive=False, whole_words=True):
+        """
+        Initialize the glossary.
+
+        Args:
+            entries (dict): Mapping of term to None (do not translate), a
+                string (same translation for every language) or a dict of
+                language code to translation
+            case_sensitive (bool): Match terms with exact case only
+            whole_words (bool): Only match terms that are not part of a
+                longer word
+        """
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        self.terms = [term for term in entries if term and term.strip()]
+        self.translations = [entries[term] for term in self.terms]
+        patterns = self.terms if case_sensitive else [_fold(t) for t in self.terms]
+        self.automaton = AhoCorasick(patterns)
+
+    def __len__(self):
+        return len(self.terms)
+
+    @property
+    def fingerprint(self) -> str:
+        """str: Hash of the terms, translations and matching options."""
+        data = json.dumps([self.terms, self.translations, self.case_sensitive, self.whole_words],
+                          sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        """
+        Load a glossary from a JSON or CSV file.
+
+        JSON files map each term to null, a string or an object of
+        language code to translation. CSV files have a ``term`` column and
+        one column per language code; empty cells keep the term as-is.
+
+        Args:
+            path (str): Glossary file path
+            **kwargs: Passed to the constructor
+
+        Returns:
+            Glossary: Loaded glossary
+        """
+        if path.lower().endswith(".csv"):
+            entries = {}
+            with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+                for row in csv.DictReader(fh):
+                    term = (row.pop("term", "") or "").strip()
+                    translations = {lang: value for lang, value in row.items() if value}
+                    entries[term] = translations or None
+        else:
+            with open(path, "r", encoding="utf-8") as fh:
+                entries = json.load(fh)
+        return cls(entries, **kwargs)
+
+    def _translation(self, index, term_text, dest):
+        value = self.translations[index]
+        if isinstance(value, dict):
+            if dest in value:
+                return value[dest]
+            primary = dest.split("-")[0]
+            for lang, translated in value.items():
+                if lang.split("-")[0] == primary:
+                    return translated
+            return term_text
+        return term_text if value is None else value
+
+    def _is_word_edge(self, text, start, end):
+        return ((start == 0 or not text[start - 1].isalnum() or not text[start].isalnum())
+                and (end == len(text) or not text[end].isalnum() or not text[end - 1].isalnum()))
+
+    def find(self, text: str):
+        """
+        Find non-overlapping term occurrences, preferring the leftmost and
+        then the longest match.
+
+        Args:
+            text (str): Segment text
+
+        Returns:
+            list: (start, end, term index) tuples in text order
+        """
+        haystack = text if self.case_sensitive else _fold(text)
+        matches = [
+            m for m in self.automaton.iter_matches(haystack)
+            if not self.whole_words or self._is_word_edge(text, m[0], m[1])
+        ]
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        chosen = []
+        end = 0
+        for m in matches:
+            if m[0] >= end:
+                chosen.append(m)
+                end = m[1]
+        return chosen
+
+    def protect(self, text: str, dest: str):
+        """
+        Replace glossary terms in a segment with placeholders.
+
+        Args:
+            text (str): Segment text
+            dest (str): Target language code
+
+        Returns:
+            ProtectedText: Protected segment, or None if no term occurs
+        """
+        matches = self.find(text)
+        if not matches:
+            return None
+        parts = []
+        replacements = []
+        pos = 0
+        for start, end, index in matches:
+            parts.append(text[pos:start])
+            parts.append(f"<g{len(replacements)}/>")
+            replacements.append(self._translation(index, text[start:end], dest))
+            pos = end
+        parts.append(text[pos:])
+        protected = "".join(parts)
+        rest = PLACEHOLDER_RE.sub("", protected)
+        covered = not any(c.isalpha() for c in TAG_RE.sub("", rest))
+        return ProtectedText(protected, replacements, covered)
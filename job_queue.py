@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Job Queue Module
+
+Background translation jobs: a worker pool runs each job through
+PPTTranslator.translate_multiple_languages while callers submit, poll,
+cancel and collect results. Job state is kept in a small SQLite store, so
+a job's status outlives the page that started it and jobs interrupted by
+a restart are resumed from their checkpoints.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+
+from scheduler import BATCH
+
+
+DEFAULT_JOBS_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "ppt_translator", "jobs"
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+@dataclass
+class JobStatus:
+    """
+    The state of a translation job.
+
+    Attributes:
+        id (str): Job identifier
+        state (str): "queued", "running", "done", "failed" or "cancelled"
+        input_path (str): The job's copy of the source deck
+        output_dir (str): Directory the translated decks are saved to
+        languages (list): Target language codes
+        created (float): Submission time, as a Unix timestamp
+        started (float): Start time, or None while queued
+        finished (float): End time, or None while active
+        done (int): Segments finished across all languages
+        total (int): Segments to finish across all languages
+        eta (float): Estimated seconds left, or None while unknown
+        outputs (dict): Saved output path per language code
+        errors (dict): Error message per language code that failed
+        partial (dict): Segments saved with their source text, per
+            language code whose output is not completely translated
+        error (str): Error that stopped the whole job, if any
+        priority (str): Scheduler priority, "interactive" or "batch"
+        weight (float): Scheduler weight relative to jobs of the same
+            priority
+    """
+
+    id: str
+    state: str
+    input_path: str
+    output_dir: str
+    languages: list
+    created: float
+    started: float = None
+    finished: float = None
+    done: int = 0
+    total: int = 0
+    eta: float = None
+    outputs: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+    partial: dict = field(default_factory=dict)
+    error: str = None
+    priority: str = BATCH
+    weight: float = 1.0
+
+    @property
+    def active(self) -> bool:
+        """bool: True while the job is queued or running."""
+        return self.state in ACTIVE_STATES
+
+    @property
+    def fraction(self) -> float:
+        """float: Share of segments finished, between 0 and 1."""
+        if not self.active:
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+
+class JobStore:
+    """
+    Persistent job records in an SQLite table.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the store, creating the table if needed.
+
+        Args:
+            path (str): SQLite database path, or ":memory:"
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " created REAL NOT NULL,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def save(self, status: JobStatus):
+        """
+        Insert or update a job record.
+
+        Args:
+            status (JobStatus): Job state
+        """
+        data = json.dumps(status.__dict__, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, created, data) VALUES (?, ?, ?)",
+                (status.id, status.created, data),
+            )
+            self._conn.commit()
+
+    def load(self, job_id: str):
+        """
+        Read a job record.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            JobStatus: Job state, or None if the job is unknown
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return JobStatus(**json.loads(row[0])) if row else None
+
+    def all(self):
+        """
+        Read every job record.
+
+        Returns:
+            list: JobStatus objects, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM jobs ORDER BY created").fetchall()
+        return [JobStatus(**json.loads(row[0])) for row in rows]
+
+    def delete(self, job_id: str):
+        """
+        Remove a job record.
+
+        Args:
+            job_id (str): Job identifier
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """
+    Runs translation jobs on a worker pool, off the caller's thread.
+
+    All jobs share one PPTTranslator, so they share its backend, cache,
+    rate limiter and request pool. If the translator has a FairScheduler,
+    each job gets its own scheduler job, so several jobs can run side by
+    side without a large one holding up the others.
+    """
+
+    def __init__(self, translator, directory=DEFAULT_JOBS_DIR, max_jobs=2,
+                 max_age=7 * 24 * 3600, resume=True, save_interval=1.0):
+        """
+        Initialize the manager.
+
+        Args:
+            translator (PPTTranslator): Translator used by every job
+            directory (str): Directory holding the job store and one
+                sub-directory of files per job
+            max_jobs (int): Jobs running at the same time
+            max_age (float): Seconds after which finished jobs and their
+                files are deleted, or None to keep them
+            resume (bool): Re-queue jobs left queued or running by a
+                previous process
+            save_interval (float): Minimum seconds between progress writes
+                to the store
+        """
+        self.translator = translator
+        self.directory = directory
+        self.save_interval = save_interval
+        self.store = JobStore(os.path.join(directory, "jobs.sqlite3"))
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._live = {}
+        self._cancel = {}
+
+        if max_age is not None:
+            self.prune(max_age)
+        if resume:
+            for status in self.store.all():
+                if status.active:
+                    status.state = QUEUED
+                    self._enqueue(status)
+
+    def submit(self, input_path: str, languages: list, priority=BATCH, weight=1.0) -> str:
+        """
+        Queue a deck for translation.
+
+        The deck is copied into the job's directory, so the caller may
+        delete its file as soon as this returns.
+
+        Args:
+            input_path (str): Path to input PowerPoint file
+            languages (list): Target language codes
+            priority (str): "interactive" for a user waiting on the result,
+                "batch" for background work
+            weight (float): Share of the translation budget relative to
+                other jobs of the same priority
+
+        Returns:
+            str: Job identifier
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.directory, job_id)
+        os.makedirs(os.path.join(job_dir, "input"))
+        job_input = os.path.join(job_dir, "input", os.path.basename(input_path))
+        shutil.copyfile(input_path, job_input)
+        status = JobStatus(
+            id=job_id,
+            state=QUEUED,
+            input_path=job_input,
+            output_dir=job_dir,
+            languages=list(languages),
+            created=time.time(),
+            priority=priority,
+            weight=weight,
+        )
+        self._enqueue(status)
+        return job_id
+
+    def _enqueue(self, status):
+        with self._lock:
+            self._live[status.id] = status
+            self._cancel[status.id] = threading.Event()
+        self.store.save(status)
+        self._executor.submit(self._run, status.id)
+
+    def status(self, job_id: str):
+        """
+        Get the current state of a job.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            JobStatus: Job state, or None if the job is unknown
+        """
+        with self._lock:
+            status = self._live.get(job_id)
+            if status is not None:
+                return self._copy(status)
+        return self.store.load(job_id)
+
+    def jobs(self):
+        """
+        List every known job.
+
+        Returns:
+            list: JobStatus objects, oldest first
+        """
+        return [self.status(status.id) for status in self.store.all()]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Ask a queued or running job to stop.
+
+        Languages already saved are kept; segments translated so far stay
+        checkpointed.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was still active
+        """
+        with self._lock:
+            event = self._cancel.get(job_id)
+            if event is None:
+                return False
+            event.set()
+            return True
+
+    def results(self, job_id: str):
+        """
+        Get the translated decks of a job.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            dict: Output path per language code, for files that exist
+        """
+        status = self.status(job_id)
+        if status is None:
+            return {}
+        return {lang: path for lang, path in status.outputs.items() if os.path.exists(path)}
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Remove a finished job and its files.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was deleted, False if it is unknown or
+                still active
+        """
+        status = self.status(job_id)
+        if status is None or status.active:
+            return False
+        self.store.delete(job_id)
+        shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+        return True
+
+    def prune(self, max_age: float):
+        """
+        Delete finished jobs older than ``max_age``.
+
+        Args:
+            max_age (float): Age in seconds, counted from the job's end
+        """
+        cutoff = time.time() - max_age
+        for status in self.store.all():
+            if not status.active and (status.finished or status.created) < cutoff:
+                self.delete(status.id)
+
+    def shutdown(self, wait=True):
+        """
+        Cancel every active job and stop the worker pool.
+
+        Args:
+            wait (bool): Wait for running jobs to stop
+        """
+        with self._lock:
+            events = list(self._cancel.values())
+        for event in events:
+            event.set()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id):
+        with self._lock:
+            status = self._live[job_id]
+            cancel = self._cancel[job_id]
+        last_save = [0.0]
+
+        def on_progress(event):
+            with self._lock:
+                status.done = event.done
+                status.total = event.total
+                status.eta = event.eta
+                if event.kind == "saved":
+                    status.outputs[event.lang] = event.path
+                    if event.failed_segments:
+                        status.partial[event.lang] = event.failed_segments
+                elif event.kind == "failed":
+                    status.errors[event.lang] = event.error
+            now = time.monotonic()
+            if event.kind not in ("segments", "heartbeat") or now - last_save[0] >= self.save_interval:
+                last_save[0] = now
+                self._save(status)
+
+        if not cancel.is_set():
+            with self._lock:
+                status.state = RUNNING
+                status.started = time.time()
+            self._save(status)
+            scheduled = None
+            if self.translator.scheduler:
+                scheduled = self.translator.scheduler.job(job_id, status.priority, status.weight)
+            try:
+                self.translator.translate_multiple_languages(
+                    status.input_path, status.output_dir, status.languages,
+                    on_progress=on_progress, cancel=cancel, job=scheduled,
+                )
+            except Exception as e:
+                status.error = str(e)
+
+        with self._lock:
+            if cancel.is_set():
+                status.state = CANCELLED
+            elif status.error is None and not status.outputs:
+                status.state = FAILED
+                status.error = "No language could be translated"
+            else:
+                status.state = FAILED if status.error else DONE
+            status.finished = time.time()
+            status.eta = None
+        self._save(status)
+        with self._lock:
+            del self._live[job_id]
+            del self._cancel[job_id]
+
+    def _copy(self, status):
+        return replace(status, languages=list(status.languages),
+                       outputs=dict(status.outputs), errors=dict(status.errors),
+                       partial=dict(status.partial))
+
+    def _save(self, status):
+        with self._lock:
+            snapshot = self._copy(status)
+        self.store.save(snapshot)
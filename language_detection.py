@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Language Detection Module
+
+A fast offline language detector for whole segment inventories, based on
+Unicode scripts and stop-word profiles. It runs once per deck without any
+network calls, so segments already in the target language can be skipped
+and the backend can be given an explicit source language.
+"""
+
+from collections import Counter, OrderedDict
+import re
+
+from segmentation import TAG_RE
+
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+_SCRIPTS = [
+    ("hangul", [(0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F)]),
+    ("kana", [(0x3040, 0x30FF), (0x31F0, 0x31FF)]),
+    ("han", [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)]),
+    ("arabic", [(0x0600, 0x06FF), (0x0750, 0x077F)]),
+    ("hebrew", [(0x0590, 0x05FF)]),
+    ("greek", [(0x0370, 0x03FF)]),
+    ("cyrillic", [(0x0400, 0x04FF)]),
+    ("devanagari", [(0x0900, 0x097F)]),
+    ("thai", [(0x0E00, 0x0E7F)]),
+]
+
+# Scripts used by a single supported language
+_SCRIPT_LANGS = {
+    "hangul": "ko",
+    "kana": "ja",
+    "hebrew": "he",
+    "greek": "el",
+    "thai": "th",
+}
+
+# Letters that tell apart the languages sharing a script. A script whose
+# text has none of them, or markers of several languages, is left to the
+# backend; Devanagari is shared by Hindi, Marathi and Nepali alike.
+_SCRIPT_MARKERS = {
+    "cyrillic": {"ru": "ыэё", "uk": "іїєґ"},
+    "arabic": {"ur": "ٹڈڑںےھ", "fa": "پچژگی", "ar": "ةيى"},
+    "han": {
+        "zh-cn": "这们说国时会对发经过来没还为与进车东门开关长问见书",
+        "zh-tw": "這們說國時會對發經過來沒還為與進車東門開關長問見書",
+    },
+}
+
+STOPWORDS = {
+    "en": "the and of to in is for on that with are this be as by from at or it we our you your will an have not has new",
+    "fr": "le la les des et est un une du en que pour dans sur avec au aux pas nous vous ce qui sont par plus ses leur",
+    "de": "der die das und ist nicht ein eine zu den mit von auf für im dem des sich auch wir sie es werden wird oder",
+    "es": "el la los las de y que en un una es por con para del al se lo como más pero sus nuestro nuestra están son",
+    "pt": "o a os as de e que em um uma é do da dos das para com não por se mais nosso nossa são está também",
+    "it": "il la le gli di e che un una è per con non del della dei delle sono nel alla anche come più nostro",
+    "nl": "de het een en van is dat in op te niet met voor zijn er aan ook als door maar we wij onze deze",
+    "sv": "och att det som en är av för på med den till inte har de ett om vi var vår kan från",
+    "no": "og i det som en er av for på med den til ikke har de et om vi var vår kan fra jeg",
+    "da": "og i det som en er af for på med den til ikke har de et om vi var vores kan fra jeg",
+    "fi": "ja on ei se että oli ovat kun mutta myös tai kanssa ole tämä sekä joka mitä meidän",
+    "pl": "i w na z że nie się do jest to jak od po co dla są oraz przez nasz nasze",
+    "tr": "ve bir bu da de için ile olarak daha çok gibi en ama var mı değil olan her",
+}
+
+# Each stop word counts 1/n towards the n languages that share it
+_WORD_WEIGHTS = {}
+for _lang, _words in STOPWORDS.items():
+    for _word in set(_words.split()):
+        _WORD_WEIGHTS.setdefault(_word, []).append(_lang)
+_WORD_WEIGHTS = {
+    word: [(lang, 1.0 / len(langs)) for lang in langs]
+    for word, langs in _WORD_WEIGHTS.items()
+}
+
+# Letters that only occur in a few Latin-script languages
+_MARKERS = {
+    "de": "äöüß",
+    "fr": "çœàèùâêîôû",
+    "es": "ñ¿¡",
+    "pt": "ãõ",
+    "pl": "ąćęłńśźż",
+    "tr": "ğışİ",
+    "sv": "å",
+    "da": "æø",
+    "no": "æøå",
+    "fi": "äö",
+}
+
+
+def _script_counts(text):
+    counts = Counter()
+    for ch in text:
+        code = ord(ch)
+        if code < 0x0370:
+            continue
+        for script, ranges in _SCRIPTS:
+            if any(lo <= code <= hi for lo, hi in ranges):
+                counts[script] += 1
+                break
+    return counts
+
+
+def _script_language(script, text):
+    """Pick the language of a script, or None if it stays ambiguous."""
+    if script in _SCRIPT_LANGS:
+        return _SCRIPT_LANGS[script]
+    found = [
+        lang for lang, markers in _SCRIPT_MARKERS.get(script, {}).items()
+        if any(ch in markers for ch in text)
+    ]
+    if script == "arabic" and "ur" in found:
+        # Urdu also uses the Persian letters
+        return "ur"
+    return found[0] if len(found) == 1 else None
+
+
+class LanguageDetector:
+    """
+    Offline language detector for batches of segments.
+
+    Results are memoized in-process, so segments shared between decks or
+    re-rendered templates are only classified once.
+    """
+
+    name = "local"
+
+    def __init__(self, min_words=3, min_stopwords=2, min_stopword_ratio=0.2,
+                 memory_size=65536):
+        """
+        Initialize the detector.
+
+        Args:
+            min_words (int): Latin-script segments with fewer words are
+                reported with low confidence
+            min_stopwords (int): Stop words of the detected language a
+                Latin-script segment needs for full confidence
+            min_stopword_ratio (float): Share of a Latin-script segment's
+                words that must be stop words for full confidence
+            memory_size (int): Number of detection results kept in memory
+        """
+        self.min_words = min_words
+        self.min_stopwords = min_stopwords
+        self.min_stopword_ratio = min_stopword_ratio
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+
+    def detect(self, text: str):
+        """
+        Detect the language of one segment.
+
+        Args:
+            text (str): Segment text
+
+        Returns:
+            tuple: (language code or None, confidence between 0 and 1)
+        """
+        text = TAG_RE.sub(" ", text)
+        letters = [ch for ch in text if ch.isalpha()]
+        if not letters:
+            return None, 0.0
+
+        scripts = _script_counts(text)
+        if scripts:
+            # Kana decides between Japanese and Chinese for Han characters
+            if scripts["kana"] and scripts["han"]:
+                scripts["kana"] += scripts.pop("han")
+            script, count = scripts.most_common(1)[0]
+            lang = _script_language(script, text)
+            if lang is None:
+                return None, 0.0
+            return lang, min(1.0, count / len(letters))
+
+        words = [w.lower() for w in _WORD_RE.findall(text)]
+        if not words:
+            return None, 0.0
+
+        scores = Counter()
+        for word in words:
+            for lang, weight in _WORD_WEIGHTS.get(word, ()):
+                scores[lang] += weight
+        lowered = text.lower()
+        for lang, markers in _MARKERS.items():
+            scores[lang] += 0.5 * sum(1 for ch in lowered if ch in markers)
+
+        ranked = scores.most_common(2)
+        best, best_score = ranked[0]
+        if best_score == 0:
+            return None, 0.0
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        confidence = (best_score - runner_up) / best_score
+        if len(words) < self.min_words:
+            confidence *= len(words) / self.min_words
+        # A single shared-looking word such as "Die" in "Die cast parts"
+        # is not evidence enough
+        hits = sum(1 for word in words
+                   if any(lang == best for lang, _ in _WORD_WEIGHTS.get(word, ())))
+        confidence *= min(1.0, hits / self.min_stopwords)
+        confidence *= min(1.0, hits / len(words) / self.min_stopword_ratio)
+        return best, round(confidence, 3)
+
+    def detect_batch(self, texts):
+        """
+        Detect the language of many segments.
+
+        Args:
+            texts (list): Segment texts
+
+        Returns:
+            list: (language code or None, confidence) per segment
+        """
+        results = []
+        for text in texts:
+            result = self._memory.get(text)
+            if result is None:
+                result = self.detect(text)
+                self._memory[text] = result
+                if len(self._memory) > self.memory_size:
+                    self._memory.popitem(last=False)
+            results.append(result)
+        return results
+
+
+_CHINESE_SCRIPTS = {
+    "zh-cn": "hans", "zh-sg": "hans", "zh-hans": "hans",
+    "zh-tw": "hant", "zh-hk": "hant", "zh-mo": "hant", "zh-hant": "hant",
+}
+
+
+def same_language(a: str, b: str) -> bool:
+    """
+    Compare two language codes by their primary subtag.
+
+    Chinese codes are compared by script, so Traditional Chinese text does
+    not count as already translated for a Simplified Chinese target.
+
+    Args:
+        a (str): Language code
+        b (str): Language code
+
+    Returns:
+        bool: True if both codes name the same language
+    """
+    if not a or not b:
+        return False
+    a, b = a.lower(), b.lower()
+    primary_a, primary_b = a.split("-")[0], b.split("-")[0]
+    if primary_a == "zh" and primary_b == "zh":
+        script = _CHINESE_SCRIPTS.get(a)
+        return a == b or (script is not None and script == _CHINESE_SCRIPTS.get(b))
+    nordic = {"no", "nb", "nn"}
+    return primary_a == primary_b or (primary_a in nordic and primary_b in nordic)
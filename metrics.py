@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics Module
+
+Counters, timers and latency histograms for the translation hot path,
+queryable from Python and exportable as JSON or Prometheus text, plus an
+optional cProfile hook for profiling a single job.
+"""
+
+from contextlib import contextmanager
+import cProfile
+import json
+import pstats
+import threading
+import time
+
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ("load", "traverse", "translate", "apply", "save")
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed upper bounds, as used by Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets (tuple): Sorted upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value
+        """
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        """
+        Get cumulative bucket counts.
+
+        Returns:
+            list: (upper bound, count of observations <= bound) pairs,
+                ending with ("+Inf", total count)
+        """
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            pairs.append((bound, running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def to_dict(self):
+        """
+        Get the histogram as plain data.
+
+        Returns:
+            dict: Observation count, sum and cumulative bucket counts
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+def _language_totals():
+    return {
+        "segments": 0,
+        "reused": 0,
+        "cache_hits": 0,
+        "sent": 0,
+        "requests": 0,
+        "chars_sent": 0,
+        "seconds": 0.0,
+    }
+
+
+class TranslationMetrics:
+    """
+    Thread-safe metrics for one or more PPTTranslator instances.
+    """
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize the metrics.
+
+        Args:
+            latency_buckets (tuple): Upper bounds of the backend latency
+                histogram in seconds
+        """
+        self.latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero every counter."""
+        with self._lock:
+            self.phase_seconds = {name: 0.0 for name in PHASES}
+            self.phase_counts = {name: 0 for name in PHASES}
+            self.requests = {}
+            self.latency = Histogram(self.latency_buckets)
+            self.retries = 0
+            self.chars_sent = 0
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.languages = {}
+
+    @contextmanager
+    def phase(self, name: str, lang: str = None):
+        """
+        Time a block of work as one phase.
+
+        Args:
+            name (str): Phase name, e.g. "load" or "save"
+            lang (str): Target language the work is for, if any
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - started, lang)
+
+    def record_phase(self, name: str, seconds: float, lang: str = None):
+        """
+        Record a phase timed by the caller, such as a pipeline stage's busy
+        time.
+
+        Args:
+            name (str): Phase name
+            seconds (float): Time spent in the phase
+            lang (str): Target language the work is for, if any
+        """
+        with self._lock:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+            self.phase_counts[name] = self.phase_counts.get(name, 0) + 1
+            if lang is not None:
+                self._language(lang)["seconds"] += seconds
+
+    def _language(self, lang):
+        totals = self.languages.get(lang)
+        if totals is None:
+            totals = self.languages[lang] = _language_totals()
+        return totals
+
+    def record_request(self, kind: str, outcome: str, seconds: float, chars: int,
+                       lang: str = None):
+        """
+        Record one backend request attempt.
+
+        Args:
+            kind (str): "single" or "batch"
+            outcome (str): "ok", "retry" or "error"
+            seconds (float): Request latency
+            chars (int): Characters sent
+            lang (str): Target language
+        """
+        with self._lock:
+            key = (kind, outcome)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe(seconds)
+            self.chars_sent += chars
+            if outcome == "retry":
+                self.retries += 1
+            if lang is not None:
+                totals = self._language(lang)
+                totals["requests"] += 1
+                totals["chars_sent"] += chars
+
+    def record_segments(self, lang: str, segments=0, reused=0, cache_hits=0,
+                        cache_misses=0, sent=0):
+        """
+        Record how the segments of one batch were resolved.
+
+        Args:
+            lang (str): Target language
+            segments (int): Segments in the batch
+            reused (int): Segments resolved without a lookup, e.g. pass-through
+                or manifest entries
+            cache_hits (int): Segments found in the translation cache
+            cache_misses (int): Segments missing from the translation cache
+            sent (int): Segments sent to the backend
+        """
+        with self._lock:
+            self.cache_hits += cache_hits
+            self.cache_misses += cache_misses
+            totals = self._language(lang)
+            totals["segments"] += segments
+            totals["reused"] += reused
+            totals["cache_hits"] += cache_hits
+            totals["sent"] += sent
+
+    def snapshot(self):
+        """
+        Get a consistent copy of every metric.
+
+        Returns:
+            dict: Phases, backend requests, latency histogram, retries,
+                characters sent, cache hit rate and per-language totals
+        """
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "phases": {
+                    name: {"seconds": seconds, "count": self.phase_counts[name]}
+                    for name, seconds in self.phase_seconds.items()
+                },
+                "backend": {
+                    "requests": [
+                        {"kind": kind, "outcome": outcome, "count": count}
+                        for (kind, outcome), count in sorted(self.requests.items())
+                    ],
+                    "latency_seconds": self.latency.to_dict(),
+                    "retries": self.retries,
+                    "chars_sent": self.chars_sent,
+                },
+                "cache": {
+                    "hits": self.cache_hits,
+                    "misses": self.cache_misses,
+                    "hit_rate": (self.cache_hits / lookups) if lookups else 0.0,
+                },
+                "languages": {lang: dict(totals) for lang, totals in self.languages.items()},
+            }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Export the metrics as JSON.
+
+        Args:
+            **kwargs: Passed to ``json.dumps``
+
+        Returns:
+            str: JSON document of ``snapshot()``
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "ppt_translator") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text
+        """
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                label_text = "{" + label_text + "}" if label_text else ""
+                lines.append(f"{prefix}_{name}{suffix}{label_text} {value!r}")
+
+        metric("phase_seconds_total", "counter", "Time spent per phase.",
+               [("", {"phase": p}, v["seconds"]) for p, v in snap["phases"].items()])
+        metric("backend_requests_total", "counter", "Backend request attempts.",
+               [("", {"kind": r["kind"], "outcome": r["outcome"]}, r["count"])
+                for r in snap["backend"]["requests"]])
+        latency = snap["backend"]["latency_seconds"]
+        metric("backend_request_duration_seconds", "histogram", "Backend request latency.",
+               [("_bucket", {"le": le}, count) for le, count in latency["buckets"].items()]
+               + [("_sum", {}, latency["sum"]), ("_count", {}, latency["count"])])
+        metric("backend_retries_total", "counter", "Backend requests retried.",
+               [("", {}, snap["backend"]["retries"])])
+        metric("backend_chars_total", "counter", "Characters sent to the backend.",
+               [("", {}, snap["backend"]["chars_sent"])])
+        metric("cache_lookups_total", "counter", "Translation cache lookups.",
+               [("", {"result": "hit"}, snap["cache"]["hits"]),
+                ("", {"result": "miss"}, snap["cache"]["misses"])])
+        metric("language_segments_total", "counter", "Segments per language by resolution.",
+               [("", {"lang": lang, "source": source}, totals[source])
+                for lang, totals in snap["languages"].items()
+                for source in ("reused", "cache_hits", "sent")])
+        metric("language_chars_total", "counter", "Characters sent per language.",
+               [("", {"lang": lang}, totals["chars_sent"])
+                for lang, totals in snap["languages"].items()])
+        metric("language_seconds_total", "counter", "Time spent per language.",
+               [("", {"lang": lang}, totals["seconds"])
+                for lang, totals in snap["languages"].items()])
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(output_path: str = None, sort: str = "cumulative", limit: int = 30):
+    """
+    Run a block of work under cProfile.
+
+    Args:
+        output_path (str): Where to dump the raw profile for later analysis
+            with pstats or snakeviz; if None, a summary is printed instead
+        sort (str): pstats sort key for the printed summary
+        limit (int): Number of functions in the printed summary
+
+    Yields:
+        cProfile.Profile: The active profiler
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output_path:
+            profiler.dump_stats(output_path)
+        else:
+            pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Package Writer Module
+
+Writes a new .pptx package from an existing one, copying every untouched
+zip member byte-for-byte and re-encoding only the parts that changed.
+"""
+
+import copy
+import struct
+import zipfile
+
+
+_MASK_USE_DATA_DESCRIPTOR = 0x08
+_ZIP64_EXTRA_ID = 0x0001
+_COPY_CHUNK = 1 << 20
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Remove zip64 extra fields; FileHeader writes fresh ones if needed."""
+    out = b""
+    i = 0
+    while i + 4 <= len(extra):
+        field_id, size = struct.unpack("<HH", extra[i:i + 4])
+        if field_id != _ZIP64_EXTRA_ID:
+            out += extra[i:i + 4 + size]
+        i += 4 + size
+    return out
+
+
+class PackageWriter:
+    """
+    Copies a zip package member by member into a new file.
+
+    Unchanged members are copied in their compressed form, so media and
+    other large parts are never decompressed or recompressed.
+    """
+
+    def __init__(self, src_path: str, dst_path: str):
+        """
+        Open the source and destination packages.
+
+        Args:
+            src_path (str): Existing .pptx file
+            dst_path (str): New .pptx file to write
+        """
+        self.src = zipfile.ZipFile(src_path)
+        self.dst = zipfile.ZipFile(dst_path, "w", zipfile.ZIP_DEFLATED)
+        self._raw = open(src_path, "rb")
+        self.bytes_copied = 0
+        self.bytes_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def infolist(self):
+        """
+        Get the members of the source package in stored order.
+
+        Returns:
+            list: zipfile.ZipInfo objects
+        """
+        return self.src.infolist()
+
+    def copy_raw(self, info):
+        """
+        Copy a member without decompressing it.
+
+        Args:
+            info (zipfile.ZipInfo): Member of the source package
+        """
+        self._raw.seek(info.header_offset)
+        header = struct.unpack(zipfile.structFileHeader, self._raw.read(zipfile.sizeFileHeader))
+        self._raw.seek(header[zipfile._FH_FILENAME_LENGTH]
+                       + header[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+
+        zinfo = copy.copy(info)
+        zinfo.flag_bits &= ~_MASK_USE_DATA_DESCRIPTOR
+        zinfo.extra = _strip_zip64_extra(info.extra)
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+
+        dst = self.dst
+        dst.fp.seek(dst.start_dir)
+        zinfo.header_offset = dst.fp.tell()
+        dst._writecheck(zinfo)
+        dst._didModify = True
+        dst.fp.write(zinfo.FileHeader(zip64))
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = self._raw.read(min(_COPY_CHUNK, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+            dst.fp.write(chunk)
+            remaining -= len(chunk)
+
+        dst.filelist.append(zinfo)
+        dst.NameToInfo[zinfo.filename] = zinfo
+        dst.start_dir = dst.fp.tell()
+        self.bytes_copied += info.compress_size
+
+    def write(self, info, data: bytes):
+        """
+        Write new content for a member, keeping its name and metadata.
+
+        Args:
+            info (zipfile.ZipInfo): Member of the source package
+            data (bytes): New uncompressed content
+        """
+        zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        self.dst.writestr(zinfo, data)
+        self.bytes_written += len(data)
+
+    def close(self):
+        """Finish the destination package and release both files."""
+        try:
+            self.dst.close()
+        finally:
+            self.src.close()
+            self._raw.close()
+
+
+def rewrite_package(src_path: str, dst_path: str, render):
+    """
+    Copy a package, re-encoding only the members ``render`` changes.
+
+    Args:
+        src_path (str): Existing .pptx file
+        dst_path (str): New .pptx file to write
+        render: Either a dict mapping member names to new content, or a
+            callable ``render(info, src_zip)`` returning new bytes for a
+            member or None to copy it unchanged
+    """
+    if isinstance(render, dict):
+        replacements = render
+
+        def render(info, src):
+            return replacements.get(info.filename)
+
+    with PackageWriter(src_path, dst_path) as writer:
+        for info in writer.infolist():
+            data = render(info, writer.src)
+            if data is None:
+                writer.copy_raw(info)
+            else:
+                writer.write(info, data)
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline Module
+
+Translates a deck with the XML engine as overlapping stages: parts are
+extracted, sent to the backend, applied and written out while later parts
+are still being read or translated. Stages are connected by bounded
+queues, so a slow stage holds back the ones before it instead of letting
+work pile up in memory.
+"""
+
+import os
+import queue
+import threading
+import time
+import zipfile
+
+from batching import SEGMENT_SEPARATOR, can_batch
+from checkpoint import file_hash
+from language_detection import same_language
+from package_writer import PackageWriter
+from segment_inventory import SegmentInventory
+from translation_manifest import TranslationManifest
+from xml_engine import XmlPresentation
+
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Aborted(Exception):
+    """Raised inside a stage once another stage has failed."""
+
+
+class TranslationPipeline:
+    """
+    A streaming translation of one deck into one language.
+
+    Stages:
+        extract: the calling thread walks the text parts in order and
+            buffers segments it has not seen before. A buffer is sent to
+            the translator only once it fills one request, and the rest
+            when extraction ends, so the backend gets as many requests as
+            in the staged path. The one exception is a full parts queue
+            while the apply stage waits for a buffered segment: neither
+            stage could move, so the buffers are sent early.
+        translate: the translator's worker pool or scheduler, as for
+            submit_batch.
+        apply: takes parts in order, waits for their segments and renders
+            the part XML.
+        save: copies every member without text into the output as soon
+            as the run starts, then writes rendered parts as they arrive.
+
+    Attributes:
+        inventory (SegmentInventory): Segments extracted so far
+        translations (list): Translations parallel to ``inventory.segments``,
+            available after run()
+        failed (int): Segments that kept their source text because the
+            backend could not translate them
+    """
+
+    def __init__(self, translator, input_path: str, output_path: str, target_lang_code: str,
+                 job=None, queue_size=32):
+        """
+        Initialize the pipeline.
+
+        Args:
+            translator (PPTTranslator): Translator whose backend, cache,
+                manifests and checkpoints are used
+            input_path (str): Path to input PowerPoint file
+            output_path (str): Path to save translated PowerPoint file
+            target_lang_code (str): Target language code
+            job (ScheduledJob): Scheduler job the requests are charged to
+            queue_size (int): Parts each queue holds before its producer
+                waits
+        """
+        self.translator = translator
+        self.input_path = input_path
+        self.output_path = output_path
+        self.target_lang_code = target_lang_code
+        self.job = job
+        self.inventory = SegmentInventory()
+        self.translations = None
+        self.failed = 0
+        self.translate_seconds = 0.0
+        self.prs = None
+        self.manifest = None
+        self.checkpoint = None
+        self._parts = queue.Queue(queue_size)
+        self._rendered = queue.Queue(queue_size)
+        self._abort = threading.Event()
+        self._starving = threading.Event()
+        self._cond = threading.Condition()
+        self._chunks = {}
+        self._finished = {}
+        self._submitted = []
+        self._buffers = {}
+        self._buffer_chars = {}
+        self._applied = {}
+        self._busy = {"traverse": 0.0, "apply": 0.0, "save": 0.0}
+        self._errors = []
+        self._first_submit = None
+        self._last_done = None
+
+    def run(self):
+        """
+        Run every stage and wait until the output is saved.
+
+        The output is written to a temporary file next to ``output_path``
+        and moved into place only if every stage succeeded.
+
+        Returns:
+            list: Translations parallel to ``inventory.segments``
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        translator = self.translator
+        lang = self.target_lang_code
+        with translator.metrics.phase("load"):
+            self.prs = XmlPresentation(self.input_path)
+        if translator.use_manifests:
+            self.manifest = TranslationManifest.load(self.output_path, lang,
+                                                     translator.backend.name,
+                                                     translator._settings_fingerprint())
+        if translator.checkpoints:
+            self.checkpoint = translator._open_checkpoint(file_hash(self.input_path), lang)
+
+        partial_path = self.output_path + ".part"
+        workers = [
+            threading.Thread(target=self._stage, args=(self._apply_stage,), daemon=True,
+                             name="pipeline-apply"),
+            threading.Thread(target=self._stage, args=(self._save_stage, partial_path),
+                             daemon=True, name="pipeline-save"),
+        ]
+        for worker in workers:
+            worker.start()
+        self._stage(self._extract_stage)
+        for worker in workers:
+            worker.join()
+
+        if self._errors:
+            for _, pending in self._submitted:
+                pending.cancel()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise self._errors[0]
+        os.replace(partial_path, self.output_path)
+
+        segments = self.inventory.segments
+        self.translations = list(segments)
+        for positions, pending in self._submitted:
+            for pos, text in zip(positions, pending.result()):
+                self.translations[pos] = text
+            self.failed += len(pending.failed)
+        if self._first_submit is not None:
+            self.translate_seconds = self._last_done - self._first_submit
+
+        metrics = translator.metrics
+        metrics.record_phase("traverse", self._busy["traverse"])
+        metrics.record_phase("translate", self.translate_seconds, lang)
+        metrics.record_phase("apply", self._busy["apply"], lang)
+        metrics.record_phase("save", self._busy["save"], lang)
+
+        if self.manifest:
+            self.manifest.update(segments, self.translations)
+            self.manifest.save()
+        if self.checkpoint:
+            self.checkpoint.record(segments, self.translations)
+            if not self.failed:
+                self.checkpoint.complete(self.output_path)
+            translator.checkpoints.release(self.checkpoint)
+        return self.translations
+
+    def _stage(self, fn, *args):
+        try:
+            fn(*args)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            self._errors.append(e)
+            self._abort.set()
+            with self._cond:
+                self._cond.notify_all()
+
+    def _put(self, q, item, on_full=None):
+        """Put an item on a queue, returning the seconds spent waiting."""
+        started = time.perf_counter()
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return time.perf_counter() - started
+            except queue.Full:
+                if on_full:
+                    on_full()
+
+    def _get(self, q):
+        """Take an item from a queue, returning it and the seconds spent waiting."""
+        started = time.perf_counter()
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                return q.get(timeout=_POLL_SECONDS), time.perf_counter() - started
+            except queue.Empty:
+                pass
+
+    def _extract_stage(self):
+        inventory = self.inventory
+        started = time.perf_counter()
+        waited = 0.0
+        for part, paragraphs in self.prs.iter_parts():
+            inventory.begin_part(part)
+            first_new = len(inventory)
+            for runs in paragraphs:
+                self.translator._add_paragraph(inventory, runs)
+            if len(inventory) > first_new:
+                self._buffer_segments(range(first_new, len(inventory)))
+
+            item = (part, sorted(inventory.part_segments.get(part, ())))
+            waited += self._put(self._parts, item, self._flush_if_stalled)
+        self._flush()
+        self._busy["traverse"] = time.perf_counter() - started - waited
+        self._put(self._parts, _DONE)
+
+    def _flush_if_stalled(self):
+        """
+        Send the partial buffers if the parts queue is full and the apply
+        stage waits for a buffered segment, which would otherwise never be
+        sent.
+        """
+        if self._starving.is_set():
+            self._flush()
+
+    def _buffer_segments(self, positions):
+        """
+        Resolve new segments that need no request and buffer the rest by
+        source language, sending each buffer once it fills a request.
+        """
+        translator = self.translator
+        lang = self.target_lang_code
+        limits = translator.backend.limits
+        segments = self.inventory.segments
+        passthrough = self.inventory.passthrough
+        texts = [segments[pos] for pos in positions]
+        sources = translator.detect_sources(texts) or ["auto"] * len(texts)
+        known = {text: text for pos, text in zip(positions, texts) if pos in passthrough}
+        if translator.segment_filter and known:
+            translator.segment_filter.record(known)
+        known.update((text, text) for text, src in zip(texts, sources)
+                     if same_language(src, lang))
+        if self.manifest:
+            known.update(self.manifest.lookup(texts))
+        if self.checkpoint:
+            known.update(self.checkpoint.lookup(texts))
+
+        resolved = []
+        for pos, text, src in zip(positions, texts, sources):
+            if text in known:
+                resolved.append(pos)
+                continue
+            buffer = self._buffers.setdefault(src, [])
+            core = text.strip()
+            if not can_batch(core) or len(core) >= limits.max_chars:
+                # Sent on its own whatever the buffer holds, as in pack_batches
+                buffer.append(pos)
+                continue
+            # Count separators like pack_batches, so a full buffer is
+            # exactly one request
+            chars = len(core) + (len(SEGMENT_SEPARATOR) if self._buffer_chars.get(src) else 0)
+            if buffer and (len(buffer) >= limits.max_batch_size
+                           or self._buffer_chars.get(src, 0) + chars > limits.max_chars):
+                self._flush(src)
+                buffer = self._buffers[src]
+                chars = len(core)
+            buffer.append(pos)
+            self._buffer_chars[src] = self._buffer_chars.get(src, 0) + chars
+        if resolved:
+            self._submit(resolved, [segments[pos] for pos in resolved], known)
+
+    def _flush(self, src=None):
+        """
+        Send buffered segments to the translator.
+
+        Args:
+            src (str): Source language whose buffer to send, or None for all
+        """
+        for buffer_src in ([src] if src else list(self._buffers)):
+            positions = self._buffers[buffer_src]
+            if positions:
+                self._buffers[buffer_src] = []
+                self._buffer_chars[buffer_src] = 0
+                texts = [self.inventory.segments[pos] for pos in positions]
+                self._submit(positions, texts, sources=[buffer_src] * len(texts))
+
+    def _submit(self, positions, texts, known=None, sources=None):
+        if self._first_submit is None:
+            self._first_submit = time.perf_counter()
+        pending = self.translator.submit_batch(texts, self.target_lang_code, known, sources,
+                                               checkpoint=self.checkpoint, job=self.job)
+        with self._cond:
+            for index, pos in enumerate(positions):
+                self._chunks[pos] = (pending, index)
+            self._submitted.append((positions, pending))
+            self._cond.notify_all()
+
+    def _wait_for_segment(self, pos):
+        """Wait until a segment is translated, returning its translation."""
+        with self._cond:
+            while pos not in self._chunks:
+                if self._abort.is_set():
+                    raise _Aborted()
+                self._starving.set()
+                self._cond.wait(_POLL_SECONDS)
+            self._starving.clear()
+            pending, index = self._chunks[pos]
+        results = self._finished.get(pending)
+        if results is None:
+            while not pending.wait(_POLL_SECONDS):
+                if self._abort.is_set():
+                    raise _Aborted()
+            results = self._finished[pending] = pending.result()
+        return results[index]
+
+    def _apply_stage(self):
+        started = time.perf_counter()
+        waited = 0.0
+        refs = self.inventory.refs
+        with zipfile.ZipFile(self.input_path) as zf:
+            while True:
+                item, seconds = self._get(self._parts)
+                waited += seconds
+                if item is _DONE:
+                    break
+                part, positions = item
+                for pos in positions:
+                    before = time.perf_counter()
+                    text = self._wait_for_segment(pos)
+                    self._last_done = time.perf_counter()
+                    waited += self._last_done - before
+                    # Parts are applied in extraction order, so only the
+                    # references added since the last time are new
+                    applied = self._applied.get(pos, 0)
+                    pos_refs = refs[pos][applied:]
+                    for ref in pos_refs:
+                        ref.text = text
+                    self._applied[pos] = applied + len(pos_refs)
+                with zf.open(part) as fh:
+                    data = self.prs.render_part(part, fh)
+                waited += self._put(self._rendered, (part, data))
+        self._busy["apply"] = time.perf_counter() - started - waited
+        self._put(self._rendered, _DONE)
+
+    def _save_stage(self, partial_path):
+        started = time.perf_counter()
+        waited = 0.0
+        text_parts = set(self.prs.text_parts)
+        with PackageWriter(self.input_path, partial_path) as writer:
+            infos = {}
+            for info in writer.infolist():
+                if info.filename in text_parts:
+                    infos[info.filename] = info
+                else:
+                    writer.copy_raw(info)
+            while True:
+                item, seconds = self._get(self._rendered)
+                waited += seconds
+                if item is _DONE:
+                    break
+                part, data = item
+                if data is None:
+                    writer.copy_raw(infos[part])
+                else:
+                    writer.write(infos[part], data)
+        self._busy["save"] = time.perf_counter() - started - waited
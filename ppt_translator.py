@@ -2,27 +2,231 @@
 """
 PPT Translator Module
 
-A module for translating PowerPoint presentations using Google Translate.
+A module for translating PowerPoint presentations using Google Translate
+or any other TranslationBackend.
 """
 
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.text import MSO_AUTO_SIZE
 from langcodes import Language
-from googletrans import Translator
+from translation_cache import TranslationCache
+from batching import pack_batches
+from segment_inventory import SegmentInventory
+from concurrency import TokenBucket, PendingTranslation, TranslationCancelled
+from retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError, classify_error
+from translation_backends import GoogleTransBackend
+from xml_engine import XmlPresentation
+from package_writer import rewrite_package
+from segmentation import ParagraphRef, can_encode
+from translation_manifest import TranslationManifest
+from segment_filter import SegmentFilter
+from language_detection import LanguageDetector, same_language
+from metrics import TranslationMetrics, profiled
+from progress import ProgressTracker
+from estimator import ThroughputHistory, JobEstimate, LanguageEstimate
+from checkpoint import CheckpointStore, file_hash
+from pipeline import TranslationPipeline
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import sqlite3
 import time
 import os
 
 
+def _split_whitespace(text):
+    """
+    Split text into leading whitespace, content and trailing whitespace.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        tuple: (lead, core, trail)
+    """
+    core = text.strip()
+    if not core:
+        return text, "", ""
+    lead = text[:len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()):]
+    return lead, core, trail
+
+
+def source_member_names(prs):
+    """
+    Map each part of a freshly opened presentation to its zip member name.
+
+    python-pptx renumbers slide parts in presentation order the first time
+    ``prs.slides`` is accessed, so the names must be read before that to
+    match the members of the source file.
+
+    Args:
+        prs: Presentation object whose slides have not been accessed yet
+
+    Returns:
+        dict: Zip member name keyed by part
+    """
+    return {part: part.partname.lstrip("/") for part in prs.part.package.iter_parts()}
+
+
+class PresentationTemplate:
+    """
+    A parsed presentation together with its segment inventory.
+    """
+
+    def __init__(self, prs, inventory, source_path=None, member_names=None):
+        """
+        Initialize the template.
+
+        Args:
+            prs: Presentation or XmlPresentation object
+            inventory (SegmentInventory): Inventory extracted from ``prs``
+            source_path (str): File ``prs`` was loaded from; lets unchanged
+                package members be copied as-is on save
+            member_names (dict): Zip member name of each python-pptx part
+                in the source file, see source_member_names
+        """
+        self.prs = prs
+        self.inventory = inventory
+        self.source_path = source_path
+        self.member_names = member_names or {}
+        self.source_langs = None
+        self._deck_hash = None
+
+    @property
+    def deck_hash(self):
+        """str: Content hash of the source file, or None if it is unknown."""
+        if self._deck_hash is None and self.source_path:
+            self._deck_hash = file_hash(self.source_path)
+        return self._deck_hash
+
+    def save(self, output_path: str):
+        """
+        Save the presentation in its current state.
+
+        Only parts holding translated text are re-encoded when the source
+        file is known; everything else is copied byte-for-byte.
+
+        Args:
+            output_path (str): Path to save the PowerPoint file
+        """
+        if isinstance(self.prs, XmlPresentation) or self.source_path is None:
+            self.prs.save(output_path)
+            return
+
+        replacements = {
+            self.member_names.get(part, part.partname.lstrip("/")): part.blob
+            for part in self.inventory.parts
+        }
+        rewrite_package(self.source_path, output_path, replacements)
+
+    def restore(self):
+        """Write the source text back to every translated run."""
+        self.inventory.apply(self.inventory.segments)
+
+
 class PPTTranslator:
     """
     A class for translating PowerPoint presentations to multiple languages.
     """
     
-    def __init__(self):
-        """Initialize the translator with Google Translate service."""
-        self.translator = Translator()
+    def __init__(self, cache=None, max_workers=4, rate_limiter=None,
+                 retry_policy=None, circuit_breaker=None, backend=None, engine="pptx",
+                 segmentation="run", use_manifests=True, segment_filter=None,
+                 language_detector=None, detection_threshold=0.8, metrics=None,
+                 history=None, glossary=None, checkpoints=None, scheduler=None,
+                 pipelined=True):
+        """
+        Initialize the translator with Google Translate service.
+
+        Args:
+            cache (TranslationCache): Translation memory to use. Defaults to
+                the shared on-disk cache; pass False to disable caching.
+            max_workers (int): Maximum number of requests in flight at once
+            rate_limiter (TokenBucket): Limiter every request must pass.
+                Share one bucket between translators to enforce a global
+                quota; pass False to disable rate limiting.
+            retry_policy (RetryPolicy): Backoff used for transient errors
+            circuit_breaker (CircuitBreaker): Breaker that pauses all
+                requests while the backend is failing
+            backend (TranslationBackend): Translation provider, defaults to
+                Google Translate. Its declared limits size the batches and
+                the default rate limiter.
+            engine (str): "pptx" to walk decks through python-pptx, or
+                "xml" to stream slide XML straight from the zip package,
+                which is faster and lighter on very large decks
+            segmentation (str): "run" to translate each run on its own, or
+                "paragraph" to translate whole paragraphs with run
+                boundaries marked inline and formatting kept per run
+            use_manifests (bool): Write a manifest of segment hashes and
+                translations next to each output and reuse it on the next
+                run, so only new or changed segments reach the backend
+            segment_filter (SegmentFilter): Classifier for segments that are
+                kept untranslated, such as numbers and URLs; pass False to
+                send every segment to the backend
+            language_detector (LanguageDetector): Detector run once per deck
+                to find each segment's source language; pass False to let
+                the backend auto-detect every request
+            detection_threshold (float): Minimum detection confidence for a
+                segment to be skipped as already in the target language or
+                sent with an explicit source language
+            metrics (TranslationMetrics): Metrics to record into; share one
+                between translators to aggregate them
+            history (ThroughputHistory): Throughput of past jobs, updated
+                after every job and used by estimate(); pass False to
+                neither record nor use history
+            glossary (Glossary): Terms that must not be translated or must
+                map to fixed translations; protected with placeholders in
+                every batch, see Glossary.load
+            checkpoints (CheckpointStore): Where completed translations are
+                checkpointed per deck and language, so an interrupted job
+                resumes without re-translating; pass False to disable
+            scheduler (FairScheduler): Shared scheduler that runs the work
+                units of every caller in fair order under one request and
+                character budget. Replaces the translator's own pool and,
+                unless one is given, its rate limiter.
+            pipelined (bool): With the "xml" engine, let
+                translate_presentation extract, translate, apply and save
+                parts as overlapping stages, see TranslationPipeline.
+                Progress reporting and profiling use the staged path.
+        """
+        if engine not in ("pptx", "xml"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if segmentation not in ("run", "paragraph"):
+            raise ValueError(f"Unknown segmentation: {segmentation}")
+        self.engine = engine
+        self.segmentation = segmentation
+        self.use_manifests = use_manifests
+        self.pipelined = pipelined
+        self.segment_filter = SegmentFilter() if segment_filter is None else (segment_filter or None)
+        self.language_detector = LanguageDetector() if language_detector is None else (language_detector or None)
+        self.detection_threshold = detection_threshold
+        self.metrics = metrics or TranslationMetrics()
+        self.history = ThroughputHistory() if history is None else (history or None)
+        self.glossary = glossary or None
+        if checkpoints is None:
+            checkpoints = CheckpointStore()
+        self.checkpoints = checkpoints or None
+        self.backend = backend or GoogleTransBackend()
         self.rtl_langs = {"ar", "fa", "ur", "he"}
+        self.max_workers = max_workers
+        self._executor = None
+        self.scheduler = scheduler or None
+        self._scheduled_job = None
+
+        if rate_limiter is None and self.backend.limits.requests_per_second and not self.scheduler:
+            rate_limiter = TokenBucket(self.backend.limits.requests_per_second)
+        self.rate_limiter = rate_limiter or None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        if cache is None:
+            try:
+                cache = TranslationCache()
+            except (OSError, sqlite3.Error):
+                cache = TranslationCache(":memory:")
+        self.cache = cache or None
     
     def normalize_lang(self, lang: str) -> str:
         """
@@ -93,36 +297,145 @@ class PPTTranslator:
                 pairs.append((p, r))
         return pairs
     
-    def safe_translate(self, text, dest="fr", retries=3, delay=2):
+    def _call_backend(self, func, retry_policy=None, kind="single", chars=0, lang=None):
+        """
+        Call the backend with retry mechanism.
+
+        Transient errors are retried with exponential backoff; fatal errors
+        are not retried.
+
+        Args:
+            func (callable): Zero-argument function making one backend request
+            retry_policy (RetryPolicy): Policy overriding self.retry_policy
+            kind (str): "single" or "batch", for metrics
+            chars (int): Characters sent per attempt, for metrics
+            lang (str): Target language, for metrics
+
+        Returns:
+            tuple: (succeeded, value) where value is what ``func`` returned
+
+        Raises:
+            CircuitOpenError: If the backend has been down for too long
+        """
+        policy = retry_policy or self.retry_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            self.circuit_breaker.before_call()
+            if self.scheduler:
+                self.scheduler.acquire(chars)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                value = func()
+            except CircuitOpenError:
+                # Raised by a backend that forwards to another translator
+                raise
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                retryable, retry_after = classify_error(e)
+                if not retryable:
+                    self.circuit_breaker.record_success()
+                    self.metrics.record_request(kind, "error", elapsed, chars, lang)
+                    print(f"Translation error: {e} (not retrying)")
+                    return False, None
+                self.circuit_breaker.record_failure()
+                if attempt >= policy.max_attempts:
+                    self.metrics.record_request(kind, "error", elapsed, chars, lang)
+                    print(f"Translation error: {e} (giving up after {attempt} attempts)")
+                    return False, None
+                self.metrics.record_request(kind, "retry", elapsed, chars, lang)
+                wait = policy.backoff(attempt, retry_after)
+                print(f"Translation error: {e} (retry {attempt}/{policy.max_attempts - 1} in {wait:.1f}s)")
+                time.sleep(wait)
+                continue
+
+            self.circuit_breaker.record_success()
+            self.metrics.record_request(kind, "ok", time.perf_counter() - started, chars, lang)
+            return True, value
+
+    def _cache_get(self, core, dest, src):
+        """
+        Look up a translation, falling back to entries stored without a
+        known source language.
+
+        Args:
+            core (str): Source text without surrounding whitespace
+            dest (str): Destination language code
+            src (str): Source language code or "auto"
+
+        Returns:
+            str: Cached translation, or None on a miss
+        """
+        cached = self.cache.get(core, dest, src, backend=self.backend.name)
+        if cached is None and src != "auto":
+            cached = self.cache.get(core, dest, backend=self.backend.name)
+        return cached
+
+    def safe_translate(self, text, dest="fr", retries=None, delay=None, src="auto"):
         """
         Safely translate text with retry mechanism.
+
+        Translations are looked up in and stored to the translation memory;
+        leading and trailing whitespace of the source is preserved.
         
         Args:
             text (str): Text to translate
             dest (str): Destination language code
-            retries (int): Number of retry attempts
-            delay (int): Delay between retries in seconds
+            retries (int): Number of attempts, overriding the retry policy
+            delay (float): Base backoff in seconds, overriding the retry policy
+            src (str): Source language code or "auto"
             
         Returns:
             str: Translated text or original text if translation fails
         """
-        if not text.strip():
-            return text
-        
-        for i in range(retries):
-            try:
-                result = self.translator.translate(text, dest=dest)
-                if result and result.text:
-                    return result.text
-            except Exception as e:
-                print(f"Translation error: {e} (retry {i+1}/{retries})")
-                time.sleep(delay)
-        
-        return text
+        policy = None
+        if retries is not None or delay is not None:
+            policy = RetryPolicy(
+                max_attempts=retries if retries is not None else self.retry_policy.max_attempts,
+                base_delay=delay if delay is not None else self.retry_policy.base_delay,
+            )
+        return self._translate_single(text, dest, src, policy)[1]
+
+    def _translate_single(self, text, dest, src="auto", policy=None):
+        """
+        Translate one text on its own, through the cache.
+
+        Args:
+            text (str): Text to translate
+            dest (str): Destination language code
+            src (str): Source language code or "auto"
+            policy (RetryPolicy): Policy overriding self.retry_policy
+
+        Returns:
+            tuple: (succeeded, translated text or the original text)
+        """
+        lead, core, trail = _split_whitespace(text)
+        if not core:
+            return True, text
+
+        if self.cache:
+            cached = self._cache_get(core, dest, src)
+            if cached is not None:
+                return True, lead + cached + trail
+
+        _, translated = self._call_backend(lambda: self.backend.translate(core, dest, src), policy,
+                                           chars=len(core), lang=dest)
+        if not translated:
+            return False, text
+
+        if self.cache:
+            self.cache.put(core, translated, dest, src, backend=self.backend.name)
+        return True, lead + translated + trail
     
     def translate_batch(self, texts, target_lang):
         """
         Translate a batch of texts.
+
+        Cache misses are packed into as few requests as the per-request
+        limits allow; only segments whose batch cannot be split back apart
+        reliably are retried on their own.
         
         Args:
             texts (list): List of texts to translate
@@ -131,7 +444,201 @@ class PPTTranslator:
         Returns:
             list: List of translated texts
         """
-        return [self.safe_translate(t, dest=target_lang) for t in texts]
+        return self.submit_batch(texts, target_lang).result()
+
+    def submit_batch(self, texts, target_lang, known=None, sources=None, progress=None,
+                     checkpoint=None, job=None):
+        """
+        Start translating a batch of texts on the worker pool.
+
+        Requests from every submitted batch share the same pool and rate
+        limiter, so several languages can be in flight at once. Glossary
+        terms are replaced by placeholders before texts are cached or sent,
+        and texts made up only of glossary terms are resolved locally.
+        
+        Args:
+            texts (list): List of texts to translate
+            target_lang (str): Target language code
+            known (dict): Translations already available, keyed by source
+                text; these texts are not sent to the backend
+            sources (list): Source language code of each text, or "auto";
+                texts are only batched with texts of the same source
+            progress (callable): Called with ``(indices, instant)`` as texts
+                finish; ``instant`` is True for texts resolved without a
+                backend request. May be called from worker threads.
+            checkpoint (Checkpoint): Receives every batch of texts translated
+                by the backend as soon as it completes
+            job (ScheduledJob): Scheduler job the requests are charged to,
+                defaults to one batch job per translator; ignored without a
+                scheduler
+            
+        Returns:
+            PendingTranslation: Handle whose result() is the translated list
+        """
+        results = list(texts)
+        work = texts
+        protected = {}
+        pending = {}
+        resolved = []
+        reused = cache_hits = cache_misses = 0
+
+        for i, text in enumerate(texts):
+            if known and text in known:
+                results[i] = known[text]
+                resolved.append(i)
+                reused += 1
+                continue
+            lead, core, trail = _split_whitespace(text)
+            if not core:
+                resolved.append(i)
+                continue
+            if self.glossary:
+                prot = self.glossary.protect(core, target_lang)
+                if prot is not None:
+                    if prot.covered:
+                        results[i] = lead + prot.restore(prot.text) + trail
+                        resolved.append(i)
+                        reused += 1
+                        continue
+                    protected[i] = prot
+                    core = prot.text
+                    if work is texts:
+                        work = list(texts)
+                    work[i] = lead + core + trail
+            src = sources[i] if sources else "auto"
+            if self.cache:
+                cached = self._cache_get(core, target_lang, src)
+                if cached is not None and i in protected:
+                    cached = protected[i].restore(cached)
+                if cached is not None:
+                    results[i] = lead + cached + trail
+                    resolved.append(i)
+                    cache_hits += 1
+                    continue
+                cache_misses += 1
+            pending.setdefault(src, []).append(i)
+
+        self.metrics.record_segments(
+            target_lang, segments=len(texts), reused=reused, cache_hits=cache_hits,
+            cache_misses=cache_misses, sent=sum(len(indices) for indices in pending.values()),
+        )
+
+        if progress and resolved:
+            progress(resolved, True)
+
+        failed = set()
+
+        def run(indices, src):
+            self._translate_packed(indices, work, results, target_lang, src, failed)
+            for i in indices:
+                if i in protected:
+                    restored = protected[i].restore(results[i])
+                    if restored is None:
+                        # Placeholders were lost; translate without protection
+                        ok, restored = self._translate_single(texts[i], target_lang, src)
+                        if not ok:
+                            failed.add(i)
+                    results[i] = restored
+            if checkpoint:
+                checkpoint.record([texts[i] for i in indices if i not in failed],
+                                  [results[i] for i in indices if i not in failed])
+            if progress:
+                progress(indices, False)
+
+        limits = self.backend.limits
+        futures = []
+        for src, indices in pending.items():
+            cores = [work[i].strip() for i in indices]
+            for batch in pack_batches(cores, limits.max_chars, limits.max_batch_size):
+                unit = [indices[j] for j in batch]
+                if self.scheduler:
+                    chars = sum(len(cores[j]) for j in batch)
+                    futures.append(self.scheduler.submit(job or self._default_job(), run, unit, src,
+                                                         chars=chars))
+                else:
+                    futures.append(self._get_executor().submit(run, unit, src))
+        return PendingTranslation(results, futures, failed)
+
+    def _default_job(self):
+        """
+        Get the scheduler job used when callers do not pass their own.
+        
+        Returns:
+            ScheduledJob: Batch job shared by this translator's callers
+        """
+        if self._scheduled_job is None:
+            self._scheduled_job = self.scheduler.job(f"translator-{id(self):x}")
+        return self._scheduled_job
+
+    def _get_executor(self):
+        """
+        Get the worker pool, creating it on first use.
+        
+        Returns:
+            ThreadPoolExecutor: Pool capped at ``max_workers`` threads
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self):
+        """Shut down the worker pool and write buffered cache entries."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.cache:
+            self.cache.flush()
+
+    def _translate_packed(self, indices, texts, results, dest, src="auto", failed=None):
+        """
+        Translate several segments in one request, writing into ``results``.
+
+        If the translated payload no longer splits into the expected number
+        of segments, the batch is halved and each half is retried.
+
+        Args:
+            indices (list): Indices into ``texts`` to translate together
+            texts (list): All source texts of the batch
+            results (list): Output list, updated in place
+            dest (str): Destination language code
+            src (str): Source language code or "auto"
+            failed (set): Receives the indices that could not be translated
+        """
+        def single(i):
+            ok, results[i] = self._translate_single(texts[i], dest, src)
+            if not ok and failed is not None:
+                failed.add(i)
+
+        if len(indices) == 1:
+            single(indices[0])
+            return
+
+        parts = [_split_whitespace(texts[i]) for i in indices]
+        cores = [core for _, core, _ in parts]
+        succeeded, segments = self._call_backend(lambda: self.backend.translate_batch(cores, dest, src),
+                                                 kind="batch", chars=sum(len(c) for c in cores),
+                                                 lang=dest)
+        if not succeeded:
+            for i in indices:
+                single(i)
+            return
+
+        if segments is None or len(segments) != len(indices):
+            mid = len(indices) // 2
+            self._translate_packed(indices[:mid], texts, results, dest, src, failed)
+            self._translate_packed(indices[mid:], texts, results, dest, src, failed)
+            return
+
+        translated = []
+        for i, (lead, core, trail), segment in zip(indices, parts, segments):
+            segment = (segment or "").strip()
+            if not segment:
+                single(i)
+                continue
+            translated.append((core, segment))
+            results[i] = lead + segment + trail
+        if self.cache and translated:
+            self.cache.put_many(translated, dest, src, backend=self.backend.name)
     
     def translate_textframe(self, tf, target_lang_code: str):
         """
@@ -150,7 +657,108 @@ class PPTTranslator:
         for (p, r), new_text in zip(pairs, translated):
             r.text = new_text
     
-    def translate_presentation(self, input_path: str, output_path: str, target_lang_code: str):
+    def extract_segments(self, prs):
+        """
+        Build a deduplicated inventory of all text segments in a presentation,
+        including notes, layouts and masters.
+        
+        Args:
+            prs: Presentation or XmlPresentation object
+            
+        Returns:
+            SegmentInventory: Unique segments with references to their runs
+        """
+        inventory = SegmentInventory()
+        if isinstance(prs, XmlPresentation):
+            for runs in prs.iter_paragraph_refs():
+                inventory.begin_part(runs[0].part)
+                self._add_paragraph(inventory, runs)
+            return inventory
+
+        for container in self.iter_text_parts(prs):
+            inventory.add_part(container.part)
+            inventory.begin_part(container.part.partname.lstrip("/"))
+            for kind, obj in self.iter_all_text_objects(container.shapes):
+                tf = obj.text_frame if kind == "table_cell" else obj
+                inventory.add_text_frame(tf)
+                for p in tf.paragraphs:
+                    self._add_paragraph(inventory, list(p.runs))
+        return inventory
+    
+    def iter_text_parts(self, prs):
+        """
+        Iterate over every slide-like object that can hold text.
+        
+        Slides come first, then their notes slides, then each slide master
+        followed by its layouts. Masters and layouts are visited once,
+        however many slides inherit from them, so their text is translated
+        once per language.
+        
+        Args:
+            prs: Presentation object
+            
+        Yields:
+            Slide, NotesSlide, SlideMaster or SlideLayout objects
+        """
+        slides = list(prs.slides)
+        yield from slides
+        for slide in slides:
+            if slide.has_notes_slide:
+                yield slide.notes_slide
+        for master in prs.slide_masters:
+            yield master
+            yield from master.slide_layouts
+    
+    def _add_paragraph(self, inventory, runs):
+        """
+        Add the runs of one paragraph to an inventory.
+        
+        In paragraph segmentation mode a paragraph with several non-empty
+        runs becomes a single marked-up segment; otherwise each non-empty
+        run is its own segment.
+        
+        Args:
+            inventory (SegmentInventory): Inventory to add to
+            runs (list): Run objects of the paragraph
+        """
+        texts = [r.text or "" for r in runs]
+        if (self.segmentation == "paragraph" and can_encode(texts)
+                and sum(1 for t in texts if t.strip()) > 1):
+            ref = ParagraphRef(runs)
+            self._add_segment(inventory, ref.text, ref)
+            return
+        for r, text in zip(runs, texts):
+            if text.strip():
+                self._add_segment(inventory, text, r)
+    
+    def _add_segment(self, inventory, text, ref):
+        """
+        Add one segment to an inventory, classifying it on first sight.
+        
+        Args:
+            inventory (SegmentInventory): Inventory to add to
+            text (str): Segment text
+            ref: Object whose ``text`` receives the translation
+        """
+        known = len(inventory)
+        pos = inventory.add(text, ref)
+        if pos == known and self.segment_filter and self.segment_filter.check(text):
+            inventory.mark_passthrough(pos)
+    
+    def apply_translations(self, inventory, translations):
+        """
+        Apply translated segments to the runs recorded in an inventory.
+        
+        Args:
+            inventory (SegmentInventory): Inventory built by extract_segments
+            translations (list): Translated texts, parallel to inventory.segments
+        """
+        for tf in inventory.text_frames:
+            self.set_textframe_autofit(tf)
+        inventory.apply(translations)
+    
+    def translate_presentation(self, input_path: str, output_path: str, target_lang_code: str,
+                               profile_path=None, on_progress=None, job=None, pipelined=None):
         """
         Translate an entire PowerPoint presentation.
         
@@ -158,56 +766,538 @@ class PPTTranslator:
             input_path (str): Path to input PowerPoint file
             output_path (str): Path to save translated PowerPoint file
             target_lang_code (str): Target language code
+            profile_path (str): If given, run the job under cProfile and
+                write the profile to this path. cProfile only sees the
+                calling thread, so profiled jobs always take the staged path
+            on_progress (callable): Called with a ProgressEvent as the job
+                advances, always from the calling thread
+            job (ScheduledJob): Scheduler job the requests are charged to
+            pipelined (bool): Overrides the translator's ``pipelined``
+                setting for this job
+            
+        Returns:
+            int: Segments saved with their source text because the backend
+                could not translate them; 0 if the output is complete
             
         Raises:
             Exception: If translation fails
         """
+        if profile_path:
+            with profiled(profile_path):
+                return self.translate_presentation(input_path, output_path, target_lang_code,
+                                                   on_progress=on_progress, job=job,
+                                                   pipelined=False)
+        if pipelined is None:
+            pipelined = self.pipelined
+        if pipelined and self.engine == "xml" and on_progress is None:
+            return self._translate_pipelined(input_path, output_path, target_lang_code, job)
         try:
-            # Load presentation
-            prs = Presentation(input_path)
-            
-            # Process each slide
-            for slide in prs.slides:
-                for kind, obj in self.iter_all_text_objects(slide.shapes):
-                    if kind == "text_frame":
-                        self.translate_textframe(obj, target_lang_code)
-                    elif kind == "table_cell":
-                        self.translate_textframe(obj.text_frame, target_lang_code)
+            before = self.metrics.snapshot()
+            template = self.load_template(input_path)
+            tracker = None
+            if on_progress is not None:
+                tracker = ProgressTracker(on_progress, template.inventory, [target_lang_code])
+                tracker.start()
+            started = time.perf_counter()
+            pending = self.submit_template(template, output_path, target_lang_code,
+                                           tracker.advancer(target_lang_code) if tracker else None,
+                                           job)
+            with self.metrics.phase("translate", target_lang_code):
+                translations = self.wait_for(pending, tracker)
+            translate_seconds = time.perf_counter() - started
+            self.render_template(template, output_path, target_lang_code, translations)
+            self._complete_checkpoint(template, target_lang_code, output_path, pending)
+            failed = len(pending.failed)
+            if tracker:
+                tracker.saved(target_lang_code, output_path, failed)
+                tracker.finish()
+            self._record_job(before, translate_seconds, input_path, 1)
+            if self.cache:
+                self.cache.flush()
+        except Exception as e:
+            if self.checkpoints:
+                self.checkpoints.flush()
+            raise Exception(f"Failed to translate presentation: {str(e)}")
+        self._warn_failed(output_path, failed)
+        return failed
+
+    def _warn_failed(self, output_path, failed):
+        """
+        Warn that an output was saved with untranslated segments.
+        
+        Args:
+            output_path (str): Output path
+            failed (int): Segments that kept their source text
+        """
+        if failed:
+            print(f"⚠ {failed} segment(s) could not be translated and kept their source text: "
+                  f"{output_path}")
+
+    def _translate_pipelined(self, input_path, output_path, target_lang_code, job=None):
+        """
+        Translate a presentation with extraction, translation, apply and
+        save running as overlapping stages.
+        
+        Args:
+            input_path (str): Path to input PowerPoint file
+            output_path (str): Path to save translated PowerPoint file
+            target_lang_code (str): Target language code
+            job (ScheduledJob): Scheduler job the requests are charged to
             
-            # Save translated presentation
-            prs.save(output_path)
+        Returns:
+            int: Segments saved with their source text
             
+        Raises:
+            Exception: If translation fails
+        """
+        try:
+            before = self.metrics.snapshot()
+            pipeline = TranslationPipeline(self, input_path, output_path, target_lang_code, job)
+            pipeline.run()
+            self._record_job(before, pipeline.translate_seconds, input_path, 1)
+            if self.cache:
+                self.cache.flush()
         except Exception as e:
+            if self.checkpoints:
+                self.checkpoints.flush()
             raise Exception(f"Failed to translate presentation: {str(e)}")
+        self._warn_failed(output_path, pipeline.failed)
+        return pipeline.failed
+
+    def _record_job(self, before, translate_seconds, input_path, languages):
+        """
+        Add a finished job's throughput to the history.
+        
+        Args:
+            before (dict): Metrics snapshot taken when the job started
+            translate_seconds (float): Wall time spent waiting for translations
+            input_path (str): Path of the translated deck
+            languages (int): Number of languages rendered
+        """
+        if not self.history:
+            return
+        after = self.metrics.snapshot()
+        requests = (sum(r["count"] for r in after["backend"]["requests"])
+                    - sum(r["count"] for r in before["backend"]["requests"]))
+        chars = after["backend"]["chars_sent"] - before["backend"]["chars_sent"]
+        processing = sum(
+            after["phases"][name]["seconds"] - before["phases"][name]["seconds"]
+            for name in ("load", "traverse", "apply", "save")
+        )
+        megabytes = os.path.getsize(input_path) / 1e6 * languages
+        self.history.record(self.backend.name, requests, chars, translate_seconds,
+                            processing, megabytes)
     
-    def translate_multiple_languages(self, input_path: str, output_dir: str, languages: list):
+    def wait_for(self, pending, tracker=None, interval=0.25, cancel=None):
+        """
+        Wait for pending translations, reporting progress while waiting.
+        
+        Args:
+            pending (PendingTranslation): Handle from submit_batch
+            tracker (ProgressTracker): Tracker polled every ``interval`` seconds
+            interval (float): Seconds between polls
+            cancel (threading.Event): Stops waiting and cancels the pending
+                work when set
+            
+        Returns:
+            list: Translated texts
+            
+        Raises:
+            TranslationCancelled: If ``cancel`` was set
+        """
+        if tracker is not None or cancel is not None:
+            while not pending.wait(interval):
+                if tracker is not None:
+                    tracker.poll()
+                if cancel is not None and cancel.is_set():
+                    pending.cancel()
+                    raise TranslationCancelled("Translation was cancelled")
+            if tracker is not None:
+                tracker.poll()
+        return pending.result()
+    
+    def load_template(self, input_path: str):
+        """
+        Parse a presentation once and extract its segment inventory.
+        
+        Args:
+            input_path (str): Path to input PowerPoint file
+            
+        Returns:
+            PresentationTemplate: Template reusable for any number of languages
+        """
+        with self.metrics.phase("load"):
+            member_names = None
+            if self.engine == "xml":
+                prs = XmlPresentation(input_path)
+            else:
+                prs = Presentation(input_path)
+                member_names = source_member_names(prs)
+        with self.metrics.phase("traverse"):
+            inventory = self.extract_segments(prs)
+        return PresentationTemplate(prs, inventory, input_path, member_names)
+    
+    def render_template(self, template, output_path: str, target_lang_code: str,
+                        translations=None):
+        """
+        Translate a parsed template into one language and save it.
+        
+        The template is restored to its source text afterwards, so the
+        next language starts from a clean copy without re-parsing.
+        
+        Args:
+            template (PresentationTemplate): Template from load_template
+            output_path (str): Path to save translated PowerPoint file
+            target_lang_code (str): Target language code
+            translations (list): Precomputed translations of
+                template.inventory.segments, e.g. from submit_batch
+        """
+        try:
+            if translations is None:
+                pending = self.submit_template(template, output_path, target_lang_code)
+                with self.metrics.phase("translate", target_lang_code):
+                    translations = pending.result()
+            with self.metrics.phase("apply", target_lang_code):
+                self.apply_translations(template.inventory, translations)
+            with self.metrics.phase("save", target_lang_code):
+                template.save(output_path)
+        finally:
+            template.restore()
+
+        if self.use_manifests:
+            manifest = TranslationManifest(TranslationManifest.path_for(output_path),
+                                           target_lang_code, self.backend.name,
+                                           settings=self._settings_fingerprint())
+            manifest.update(template.inventory.segments, translations)
+            manifest.save()
+        
+        checkpoint = self._checkpoint(template, target_lang_code)
+        if checkpoint:
+            checkpoint.record(template.inventory.segments, translations)
+    
+    def submit_template(self, template, output_path: str, target_lang_code: str, progress=None,
+                        job=None):
+        """
+        Start translating a template for one output file.
+        
+        Pass-through segments and segments already in the target language
+        are kept as they are, and segments recorded unchanged in the
+        output's manifest are reused; none of these are sent to the
+        backend. The rest are sent with their detected source language.
+        
+        Args:
+            template (PresentationTemplate): Template from load_template
+            output_path (str): Path the translated PowerPoint file will be saved to
+            target_lang_code (str): Target language code
+            progress (callable): Completion callback, see submit_batch
+            job (ScheduledJob): Scheduler job, see submit_batch
+            
+        Returns:
+            PendingTranslation: Handle whose result() is the translated list
+        """
+        known, sources = self._resolve_known(template, output_path, target_lang_code)
+        if self.segment_filter:
+            self.segment_filter.record(template.inventory.passthrough_texts())
+        checkpoint = self._checkpoint(template, target_lang_code)
+        if checkpoint:
+            known.update(checkpoint.lookup(template.inventory.segments))
+        return self.submit_batch(template.inventory.segments, target_lang_code, known,
+                                 sources, progress, checkpoint, job)
+
+    def _complete_checkpoint(self, template, target_lang_code, output_path, pending):
+        """
+        Mark a language finished if none of its segments failed, and
+        release its checkpoint.
+        
+        Args:
+            template (PresentationTemplate): Template from load_template
+            target_lang_code (str): Target language code
+            output_path (str): Path the translated deck was saved to
+            pending (PendingTranslation): Handle the translations came from
+        """
+        checkpoint = self._checkpoint(template, target_lang_code)
+        if checkpoint:
+            if not pending.failed:
+                checkpoint.complete(output_path)
+            self.checkpoints.release(checkpoint)
+
+    def _checkpoint(self, template, target_lang_code):
+        """
+        Get the checkpoint of a template and language.
+        
+        Args:
+            template (PresentationTemplate): Template from load_template
+            target_lang_code (str): Target language code
+            
+        Returns:
+            Checkpoint: Open checkpoint, or None if checkpointing is off or
+                the template has no source file
+        """
+        if not self.checkpoints or not template.source_path:
+            return None
+        return self._open_checkpoint(template.deck_hash, target_lang_code)
+
+    def _open_checkpoint(self, deck_hash, target_lang_code):
+        """
+        Open the checkpoint of a deck and language under the current settings.
+
+        Args:
+            deck_hash (str): Content hash of the source deck
+            target_lang_code (str): Target language code
+
+        Returns:
+            Checkpoint: Open checkpoint
+        """
+        return self.checkpoints.open(deck_hash, target_lang_code, self.backend.name,
+                                     self._settings_fingerprint())
+
+    def _settings_fingerprint(self):
+        """
+        Hash the settings that change a translated deck, so checkpoints
+        and manifests made under other settings are neither reused nor
+        skipped.
+
+        Returns:
+            str: Short hex digest
+        """
+        settings = [self.engine, self.segmentation, bool(self.segment_filter),
+                    self.glossary.fingerprint if self.glossary else None]
+        return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()[:12]
+
+    def _resolve_known(self, template, output_path, target_lang_code):
+        """
+        Find the segments of a template that need no backend request.
+        
+        Args:
+            template (PresentationTemplate): Template from load_template
+            output_path (str): Output path whose manifest is consulted, or
+                None to skip manifests
+            target_lang_code (str): Target language code
+            
+        Returns:
+            tuple: (known translations keyed by source text, source language
+                per segment or None)
+        """
+        segments = template.inventory.segments
+        known = template.inventory.passthrough_texts()
+        sources = self.detect_languages(template)
+        if sources:
+            known.update(
+                (text, text) for text, src in zip(segments, sources)
+                if same_language(src, target_lang_code)
+            )
+        if self.use_manifests and output_path:
+            manifest = TranslationManifest.load(output_path, target_lang_code, self.backend.name,
+                                                self._settings_fingerprint())
+            known.update(manifest.lookup(segments))
+        return known, sources
+
+    def estimate(self, input_path: str, languages: list, output_dir: str = None):
+        """
+        Estimate a job without translating anything (dry run).
+        
+        The deck is parsed and deduplicated, every segment is checked
+        against pass-through rules, detected languages, manifests and the
+        cache, and the rest is packed into requests exactly as a real run
+        would. Wall time comes from the throughput recorded on previous jobs.
+        
+        Args:
+            input_path (str): Path to input PowerPoint file
+            languages (list): List of language codes to translate to
+            output_dir (str): Directory the outputs would be saved to, so
+                their manifests are taken into account
+            
+        Returns:
+            JobEstimate: Characters, requests, time and cost to expect
+        """
+        template = self.load_template(input_path)
+        segments = template.inventory.segments
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        limits = self.backend.limits
+        job = JobEstimate(unique_segments=len(segments),
+                          unique_chars=sum(len(t) for t in segments))
+
+        for lang in languages:
+            safe_lang = self.normalize_lang(lang).replace("/", "-")
+            out_path = None
+            if output_dir:
+                out_path = os.path.join(output_dir, f"{base_name}_{safe_lang}.pptx")
+            known, sources = self._resolve_known(template, out_path, safe_lang)
+            est = LanguageEstimate(segments=len(segments))
+            pending = {}
+            for i, text in enumerate(segments):
+                core = text.strip()
+                src = sources[i] if sources else "auto"
+                prot = self.glossary.protect(core, safe_lang) if self.glossary and core else None
+                if prot is not None:
+                    core = None if prot.covered else prot.text
+                if text in known or not core:
+                    est.reused += 1
+                elif self.cache and (self.cache.contains(core, safe_lang, src, self.backend.name)
+                                     or self.cache.contains(core, safe_lang, "auto", self.backend.name)):
+                    est.cached += 1
+                else:
+                    pending.setdefault(src, []).append(core)
+            for cores in pending.values():
+                est.to_send += len(cores)
+                est.chars += sum(len(c) for c in cores)
+                est.requests += len(pack_batches(cores, limits.max_chars, limits.max_batch_size))
+            job.languages[safe_lang] = est
+            job.requests += est.requests
+            job.chars += est.chars
+
+        history = self.history.get(self.backend.name) if self.history else {}
+        job.predict(history, limits, os.path.getsize(input_path) / 1e6)
+        return job
+
+    def detect_languages(self, template):
+        """
+        Detect the source language of every segment of a template.
+
+        Detection runs once per template and is shared by all target
+        languages. Segments detected with low confidence get "auto".
+
+        Args:
+            template (PresentationTemplate): Template from load_template
+
+        Returns:
+            list: Source language codes parallel to template.inventory.segments,
+                or None if language detection is disabled
+        """
+        if not self.language_detector:
+            return None
+        if template.source_langs is None:
+            template.source_langs = self.detect_sources(template.inventory.segments)
+        return template.source_langs
+
+    def detect_sources(self, texts):
+        """
+        Detect the source language of each text.
+
+        Args:
+            texts (list): Segment texts
+
+        Returns:
+            list: Source language code per text, "auto" where confidence is
+                low, or None if language detection is disabled
+        """
+        if not self.language_detector:
+            return None
+        detected = self.language_detector.detect_batch(texts)
+        return [
+            lang if lang and confidence >= self.detection_threshold else "auto"
+            for lang, confidence in detected
+        ]
+    
+    def translate_multiple_languages(self, input_path: str, output_dir: str, languages: list,
+                                     on_progress=None, cancel=None, job=None):
         """
         Translate a presentation to multiple languages.
         
+        The source is parsed and walked once, and requests for all
+        languages are in flight together; every language is rendered from
+        the same template as soon as its translations are complete.
+        
+        Completed translations are checkpointed, so rerunning an
+        interrupted job skips languages whose output was already saved and
+        resumes the others without re-translating finished segments.
+        
         Args:
             input_path (str): Path to input PowerPoint file
             output_dir (str): Directory to save translated files
             languages (list): List of language codes to translate to
+            on_progress (callable): Called with a ProgressEvent as the job
+                advances, always from the calling thread
+            cancel (threading.Event): Stops the job when set; languages not
+                saved yet are abandoned, their finished segments stay
+                checkpointed
+            job (ScheduledJob): Scheduler job the requests are charged to
             
         Returns:
-            list: List of successfully translated file paths
+            list: List of saved file paths, including outputs with
+                untranslated segments; ``on_progress`` reports their count
+                as ``failed_segments`` on "saved" events
         """
         os.makedirs(output_dir, exist_ok=True)
         translated_files = []
         
+        before = self.metrics.snapshot()
+        try:
+            template = self.load_template(input_path)
+        except Exception as e:
+            print(f"❌ Failed to load {input_path}: {str(e)}")
+            return translated_files
+        
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        safe_langs = {lang: self.normalize_lang(lang).replace("/", "-") for lang in languages}
+        tracker = None
+        if on_progress is not None:
+            tracker = ProgressTracker(on_progress, template.inventory, list(safe_langs.values()))
+            tracker.start()
+        
+        started = last_done = time.perf_counter()
+        pending = {}
         for lang in languages:
+            safe_lang = safe_langs[lang]
+            out_path = os.path.join(output_dir, f"{base_name}_{safe_lang}.pptx")
+            checkpoint = self._checkpoint(template, safe_lang)
+            if (checkpoint and checkpoint.completed and checkpoint.output == out_path
+                    and os.path.exists(out_path)):
+                self.checkpoints.release(checkpoint)
+                continue
+            progress = tracker.advancer(safe_lang) if tracker else None
+            pending[lang] = self.submit_template(template, out_path, safe_lang, progress, job)
+        
+        rendered = 0
+        for lang in languages:
+            if cancel is not None and cancel.is_set():
+                break
             try:
-                safe_lang = self.normalize_lang(lang).replace("/", "-")
-                base_name = os.path.splitext(os.path.basename(input_path))[0]
+                safe_lang = safe_langs[lang]
                 out_path = os.path.join(output_dir, f"{base_name}_{safe_lang}.pptx")
                 
-                self.translate_presentation(input_path, out_path, safe_lang)
+                if lang not in pending:
+                    translated_files.append(out_path)
+                    print(f"✔ Already translated: {out_path}")
+                    if tracker:
+                        tracker.advance(safe_lang, range(len(template.inventory)), instant=True)
+                        tracker.saved(safe_lang, out_path)
+                    continue
+                
+                with self.metrics.phase("translate", safe_lang):
+                    translations = self.wait_for(pending[lang], tracker, cancel=cancel)
+                last_done = time.perf_counter()
+                self.render_template(template, out_path, safe_lang, translations)
+                self._complete_checkpoint(template, safe_lang, out_path, pending[lang])
+                rendered += 1
                 translated_files.append(out_path)
-                print(f"✔ Saved: {out_path}")
+                failed = len(pending[lang].failed)
+                if failed:
+                    self._warn_failed(out_path, failed)
+                else:
+                    print(f"✔ Saved: {out_path}")
+                if tracker:
+                    tracker.saved(safe_lang, out_path, failed)
                 
+            except TranslationCancelled:
+                print(f"✖ Cancelled: {input_path}")
+                break
             except Exception as e:
                 print(f"❌ Failed to translate to {lang}: {str(e)}")
+                if tracker:
+                    tracker.failed(safe_lang, e)
         
+        if cancel is not None and cancel.is_set():
+            for handle in pending.values():
+                handle.cancel()
+        if tracker:
+            tracker.finish()
+        if self.checkpoints:
+            self.checkpoints.flush()
+        if self.cache:
+            self.cache.flush()
+        if rendered:
+            self._record_job(before, last_done - started, input_path, rendered)
         return translated_files
     
     def get_supported_languages(self):
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Progress Module
+
+Structured progress events for translation jobs, with per-language and
+per-part segment counts and a rolling throughput-based ETA.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+import os
+import threading
+import time
+
+
+@dataclass
+class ProgressEvent:
+    """
+    A snapshot of a translation job's progress.
+
+    Attributes:
+        kind (str): "start", "segments", "heartbeat", "saved", "failed"
+            or "done"
+        lang (str): Language the event is about, if any
+        done (int): Segments finished across all languages
+        total (int): Segments to finish across all languages
+        lang_done (int): Segments finished for ``lang``
+        lang_total (int): Segments to finish for ``lang``
+        parts_done (int): Parts (slides, notes, layouts, masters) whose
+            segments are all finished for ``lang``
+        parts_total (int): Parts holding text
+        languages_done (int): Languages saved or failed
+        languages_total (int): Languages in the job
+        bytes_written (int): Bytes of output saved so far
+        path (str): Output path, for "saved" events
+        failed_segments (int): Segments of ``lang`` that kept their source
+            text because the backend could not translate them, for "saved"
+            events; 0 if the output is completely translated
+        error (str): Error message, for "failed" events
+        elapsed (float): Seconds since the job started
+        rate (float): Recent throughput in segments per second, or None
+            before enough segments were translated
+        eta (float): Estimated seconds until every segment is finished,
+            or None while the rate is unknown
+        idle (float): Seconds since the last segment finished
+    """
+
+    kind: str
+    lang: str = None
+    done: int = 0
+    total: int = 0
+    lang_done: int = 0
+    lang_total: int = 0
+    parts_done: int = 0
+    parts_total: int = 0
+    languages_done: int = 0
+    languages_total: int = 0
+    bytes_written: int = 0
+    path: str = None
+    failed_segments: int = 0
+    error: str = None
+    elapsed: float = 0.0
+    rate: float = None
+    eta: float = None
+    idle: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        """float: Share of segments finished, between 0 and 1."""
+        return self.done / self.total if self.total else 1.0
+
+
+class ProgressTracker:
+    """
+    Collects segment completions from worker threads and reports them as
+    ProgressEvent objects.
+
+    Worker threads only update counters through ``advance``; the callback
+    is invoked by ``start``, ``poll``, ``saved``, ``failed`` and ``finish``,
+    which the job calls from its own thread, so the callback may safely
+    touch UI state.
+    """
+
+    def __init__(self, callback, inventory, languages, window=30.0, heartbeat=5.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            callback (callable): Called with each ProgressEvent
+            inventory (SegmentInventory): Inventory being translated
+            languages (list): Target language codes of the job
+            window (float): Seconds of history used for the rolling rate
+            heartbeat (float): Seconds without progress after which ``poll``
+                emits a "heartbeat" event so callers can spot stalls
+        """
+        self.callback = callback
+        self.languages = list(languages)
+        self.window = window
+        self.heartbeat = heartbeat
+        self.segments = len(inventory)
+        parts = [positions for positions in inventory.part_segments.values() if positions]
+        self.parts_total = len(parts)
+        self._parts_of = [[] for _ in range(self.segments)]
+        for part, positions in enumerate(parts):
+            for pos in positions:
+                self._parts_of[pos].append(part)
+        part_sizes = [len(positions) for positions in parts]
+        self._remaining = {lang: list(part_sizes) for lang in self.languages}
+        self._lang_done = {lang: 0 for lang in self.languages}
+        self._parts_done = {lang: 0 for lang in self.languages}
+        self._samples = deque()
+        self._translated = 0
+        self._languages_done = 0
+        self._bytes_written = 0
+        self._lock = threading.Lock()
+        self._started = None
+        self._last_progress = None
+        self._last_emit = None
+        self._changed = set()
+
+    def _now(self):
+        return time.monotonic()
+
+    def start(self):
+        """Start the clock and emit a "start" event."""
+        self._started = self._last_progress = self._last_emit = self._now()
+        self._emit("start")
+
+    def advancer(self, lang: str):
+        """
+        Get a completion callback for one language.
+
+        Args:
+            lang (str): Target language code
+
+        Returns:
+            callable: ``(indices, instant)`` callback for submit_batch
+        """
+        return lambda indices, instant=False: self.advance(lang, indices, instant)
+
+    def advance(self, lang: str, indices, instant=False):
+        """
+        Record finished segments. Safe to call from worker threads.
+
+        Args:
+            lang (str): Target language code
+            indices (list): Positions of the finished segments in the inventory
+            instant (bool): True for segments resolved without a backend
+                request; they count as done but not towards the rate
+        """
+        with self._lock:
+            remaining = self._remaining[lang]
+            for pos in indices:
+                for part in self._parts_of[pos]:
+                    remaining[part] -= 1
+                    if remaining[part] == 0:
+                        self._parts_done[lang] += 1
+            self._lang_done[lang] += len(indices)
+            now = self._now()
+            if not instant:
+                self._translated += len(indices)
+                self._samples.append((now, self._translated))
+                while self._samples and now - self._samples[0][0] > self.window:
+                    self._samples.popleft()
+            self._last_progress = now
+            self._changed.add(lang)
+
+    def _rate(self, now):
+        if not self._samples:
+            return None
+        first_time, first_count = self._samples[0]
+        if len(self._samples) == 1:
+            first_time, first_count = self._started, 0
+        elapsed = now - first_time
+        if elapsed <= 0:
+            return None
+        return (self._translated - first_count) / elapsed
+
+    def _event(self, kind, lang=None, **kwargs):
+        now = self._now()
+        done = sum(self._lang_done.values())
+        total = self.segments * len(self.languages)
+        rate = self._rate(now)
+        eta = None
+        if rate:
+            eta = (total - done) / rate
+        elif done >= total:
+            eta = 0.0
+        return ProgressEvent(
+            kind=kind,
+            lang=lang,
+            done=done,
+            total=total,
+            lang_done=self._lang_done.get(lang, 0),
+            lang_total=self.segments if lang is not None else 0,
+            parts_done=self._parts_done.get(lang, 0),
+            parts_total=self.parts_total,
+            languages_done=self._languages_done,
+            languages_total=len(self.languages),
+            bytes_written=self._bytes_written,
+            elapsed=now - (self._started or now),
+            rate=rate,
+            eta=eta,
+            idle=now - (self._last_progress or now),
+            **kwargs,
+        )
+
+    def _emit(self, kind, lang=None, **kwargs):
+        with self._lock:
+            event = self._event(kind, lang, **kwargs)
+            self._last_emit = self._now()
+        self.callback(event)
+
+    def poll(self):
+        """
+        Emit "segments" events for languages that progressed since the last
+        poll, or a "heartbeat" event if nothing has happened for a while.
+        """
+        with self._lock:
+            changed = [lang for lang in self.languages if lang in self._changed]
+            self._changed.clear()
+            quiet = self._now() - self._last_emit >= self.heartbeat
+        for lang in changed:
+            self._emit("segments", lang)
+        if not changed and quiet:
+            self._emit("heartbeat")
+
+    def saved(self, lang: str, path: str, failed_segments: int = 0):
+        """
+        Report that a language's output was written.
+
+        Args:
+            lang (str): Target language code
+            path (str): Output path
+            failed_segments (int): Segments saved with their source text
+        """
+        self.poll()
+        with self._lock:
+            self._languages_done += 1
+            try:
+                self._bytes_written += os.path.getsize(path)
+            except OSError:
+                pass
+        self._emit("saved", lang, path=path, failed_segments=failed_segments)
+
+    def failed(self, lang: str, error):
+        """
+        Report that a language could not be translated.
+
+        Args:
+            lang (str): Target language code
+            error: Exception or message
+        """
+        with self._lock:
+            self._languages_done += 1
+        self._emit("failed", lang, error=str(error))
+
+    def finish(self):
+        """Emit the final "done" event."""
+        self._emit("done")
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Retry Policy Module
+
+Exponential backoff with jitter, error classification and a circuit
+breaker for calls to a translation backend.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+
+
+_STATUS_RE = re.compile(r'status code "?(\d{3})')
+
+
+class TransientError(Exception):
+    """
+    A backend error that is worth retrying.
+    """
+
+    def __init__(self, message="", retry_after=None):
+        """
+        Initialize the error.
+
+        Args:
+            message (str): Error message
+            retry_after (float): Seconds the backend asked us to wait
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FatalTranslationError(Exception):
+    """
+    A backend error that will not go away by retrying.
+    """
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when the backend has been unavailable for too long to continue.
+    """
+
+
+def _parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc):
+    """
+    Decide whether a backend error should be retried.
+
+    Args:
+        exc (Exception): Error raised by the backend
+
+    Returns:
+        tuple: (retryable, retry_after) where retry_after is the delay in
+            seconds requested by the backend, or None
+    """
+    if isinstance(exc, FatalTranslationError):
+        return False, None
+    if isinstance(exc, TransientError):
+        return True, exc.retry_after
+
+    retry_after = _parse_retry_after(getattr(exc, "retry_after", None))
+    status = getattr(exc, "status_code", None)
+
+    response = getattr(exc, "response", None)
+    if response is not None:
+        status = status or getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None) or {}
+        if retry_after is None:
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+
+    if status is None:
+        match = _STATUS_RE.search(str(exc))
+        if match:
+            status = int(match.group(1))
+
+    if status is not None:
+        status = int(status)
+        if status == 429 or status == 408 or status >= 500:
+            return True, retry_after
+        if 400 <= status < 500:
+            return False, None
+
+    if isinstance(exc, (json.JSONDecodeError, UnicodeDecodeError)):
+        # Truncated or garbled response bodies
+        return True, retry_after
+
+    if isinstance(exc, (ValueError, TypeError, KeyError)):
+        # Invalid language codes and malformed arguments
+        return False, None
+
+    # Connection resets, timeouts and garbled responses are transient
+    return True, retry_after
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, honouring Retry-After.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0,
+                 multiplier=2.0, jitter=True):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Total attempts per request, first one included
+            base_delay (float): Backoff before the first retry in seconds
+            max_delay (float): Upper bound for a single backoff
+            multiplier (float): Growth factor between retries
+            jitter (bool): Randomize each backoff between zero and its bound
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Compute the wait before the next attempt.
+
+        Args:
+            attempt (int): Number of attempts made so far, starting at 1
+            retry_after (float): Delay requested by the backend, if any
+
+        Returns:
+            float: Seconds to wait
+        """
+        bound = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        delay = random.uniform(0, bound) if self.jitter else bound
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a backend that keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and every caller waits. Once ``reset_timeout`` has passed a single
+    probe call is let through; success closes the circuit, failure reopens
+    it. If the circuit stays open for longer than ``max_open_time`` callers
+    get a CircuitOpenError instead of waiting further, but a probe is still
+    let through every ``reset_timeout``, so the circuit closes again once
+    the backend recovers.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0, max_open_time=300.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to wait before probing the backend
+            max_open_time (float): Seconds the circuit may stay open before
+                callers give up, or None to wait indefinitely
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_open_time = max_open_time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = None
+        self._first_opened_at = None
+        self._cond = threading.Condition()
+
+    def before_call(self):
+        """
+        Wait until a call may be made.
+
+        Raises:
+            CircuitOpenError: If the circuit has been open for too long
+        """
+        with self._cond:
+            while True:
+                if self.state == self.CLOSED:
+                    return
+
+                now = time.monotonic()
+                if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                    self.state = self.HALF_OPEN
+                    return
+
+                if (self.max_open_time is not None
+                        and now - self._first_opened_at >= self.max_open_time):
+                    raise CircuitOpenError(
+                        f"Translation backend unavailable for {self.max_open_time:g}s"
+                    )
+
+                if self.state == self.HALF_OPEN:
+                    # Another caller is probing; wait for its outcome
+                    wait = self.reset_timeout
+                else:
+                    wait = self.reset_timeout - (now - self._opened_at)
+                if self.max_open_time is not None:
+                    wait = min(wait, self.max_open_time - (now - self._first_opened_at))
+                self._cond.wait(timeout=max(0.01, wait))
+
+    def record_success(self):
+        """Record a call that reached the backend."""
+        with self._cond:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._opened_at = None
+            self._first_opened_at = None
+            self._cond.notify_all()
+
+    def record_failure(self):
+        """Record a call that failed with a transient error."""
+        with self._cond:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    print(f"Translation backend failing, pausing for {self.reset_timeout:g}s")
+                now = time.monotonic()
+                self.state = self.OPEN
+                self._opened_at = now
+                if self._first_opened_at is None:
+                    self._first_opened_at = now
+            self._cond.notify_all()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduler Module
+
+A fair-share executor for translation work units. Every caller gets its
+own queue; interactive callers go first, and callers of the same class
+share the provider's request and character budget in proportion to their
+weights, so a small job is not stuck behind a large one that started
+earlier.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import itertools
+import threading
+
+from concurrency import TokenBucket
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class ScheduledJob:
+    """
+    One caller's share of a FairScheduler.
+
+    Attributes:
+        name (str): Name used in logs and stats
+        priority (str): "interactive" or "batch"
+        weight (float): Share relative to other jobs of the same priority
+        submitted (int): Work units submitted
+        completed (int): Work units finished
+    """
+
+    def __init__(self, name, priority, weight):
+        self.name = name
+        self.priority = priority
+        self.weight = weight
+        self.submitted = 0
+        self.completed = 0
+        self._queue = deque()
+        self._finish = 0.0
+
+
+class FairScheduler:
+    """
+    Runs work units from many jobs on one worker pool in fair order.
+
+    Interactive jobs have strict priority over batch jobs and some worker
+    slots are kept free for them, so their units start without waiting
+    for batch units to finish. Within a priority class, jobs are served by
+    start-time fair queuing: each job advances a virtual clock by the cost
+    of its dispatched units divided by its weight, and the job that is
+    furthest behind goes next.
+
+    Each unit is dispatched only once the global budget can pay for its
+    first request, so jobs share the budget in fair order while batch jobs
+    still use all of it when nothing else is waiting. Further requests a
+    unit makes, such as retries, are charged through ``acquire``.
+    """
+
+    def __init__(self, max_workers=4, requests_per_second=None, chars_per_second=None,
+                 interactive_slots=1):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers (int): Work units running at the same time
+            requests_per_second (float): Global request budget, or None
+            chars_per_second (float): Global character budget, or None
+            interactive_slots (int): Worker slots batch units may not use
+        """
+        self.max_workers = max_workers
+        self.batch_slots = max(1, max_workers - interactive_slots)
+        self.requests = TokenBucket(requests_per_second) if requests_per_second else None
+        self.chars = TokenBucket(chars_per_second) if chars_per_second else None
+        self._cond = threading.Condition()
+        self._backlogged = {priority: [] for priority in PRIORITIES}
+        self._clock = {priority: 0.0 for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._queued = 0
+        self._closed = False
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduled")
+        self._dispatcher = None
+
+    def job(self, name=None, priority=BATCH, weight=1.0) -> ScheduledJob:
+        """
+        Create a job to submit work units under.
+
+        Args:
+            name (str): Name used in logs and stats
+            priority (str): "interactive" for work a user is waiting on,
+                "batch" for background work
+            weight (float): Share relative to other jobs of the same priority
+
+        Returns:
+            ScheduledJob: Job handle
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        return ScheduledJob(name or f"job-{next(self._ids)}", priority, weight)
+
+    def submit(self, job: ScheduledJob, fn, *args, chars=0) -> Future:
+        """
+        Queue a work unit.
+
+        Args:
+            job (ScheduledJob): Job the unit belongs to
+            fn (callable): Function to run
+            *args: Arguments for ``fn``
+            chars (int): Characters the unit's first request sends
+
+        Returns:
+            Future: Result of ``fn``
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot schedule new work after shutdown")
+            if not job._queue:
+                # A job that was idle starts at the current virtual time
+                # instead of cashing in the time it was away
+                job._finish = max(job._finish, self._clock[job.priority])
+                self._backlogged[job.priority].append(job)
+            job._queue.append((future, fn, args, chars))
+            job.submitted += 1
+            self._queued += 1
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, daemon=True,
+                                                    name="scheduler")
+                self._dispatcher.start()
+            self._cond.notify_all()
+        return future
+
+    def acquire(self, chars=0):
+        """
+        Wait for the budget of one request. The first request of each
+        dispatched unit was paid for at dispatch and returns at once.
+
+        Args:
+            chars (int): Characters the request sends
+        """
+        if getattr(self._local, "prepaid", False):
+            self._local.prepaid = False
+            return
+        self._charge(chars)
+
+    def _charge(self, chars):
+        if self.requests:
+            self.requests.acquire()
+        if self.chars and chars:
+            self.chars.acquire(chars)
+
+    def _budget_wait(self, chars):
+        wait = 0.0
+        if self.requests:
+            wait = self.requests.wait_time()
+        if self.chars and chars:
+            wait = max(wait, self.chars.wait_time(chars))
+        return wait
+
+    def _cost(self, chars):
+        cost = 0.0
+        if self.requests:
+            cost = 1.0 / self.requests.rate
+        if self.chars:
+            cost = max(cost, chars / self.chars.rate)
+        return cost or 1.0
+
+    def _pick(self):
+        if sum(self._running.values()) >= self.max_workers:
+            return None
+        for priority in PRIORITIES:
+            if priority == BATCH and self._running[BATCH] >= self.batch_slots:
+                continue
+            jobs = self._backlogged[priority]
+            if jobs:
+                return min(jobs, key=lambda job: job._finish)
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                job = unit = None
+                while unit is None:
+                    if self._closed and not self._queued:
+                        return
+                    job = self._pick()
+                    if job is None:
+                        self._cond.wait()
+                        continue
+                    wait = self._budget_wait(job._queue[0][3])
+                    if wait > 0:
+                        # Re-pick afterwards: an interactive unit may arrive meanwhile
+                        self._cond.wait(wait)
+                        continue
+                    unit = job._queue.popleft()
+                    self._queued -= 1
+                    if not job._queue:
+                        self._backlogged[job.priority].remove(job)
+                    if not unit[0].set_running_or_notify_cancel():
+                        job.completed += 1
+                        unit = None
+                        continue
+                    self._clock[job.priority] = job._finish
+                    job._finish += self._cost(unit[3]) / job.weight
+                    self._running[job.priority] += 1
+            self._charge(unit[3])
+            self._pool.submit(self._execute, job, unit)
+
+    def _execute(self, job, unit):
+        future, fn, args, _ = unit
+        self._local.prepaid = True
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            self._local.prepaid = False
+            with self._cond:
+                self._running[job.priority] -= 1
+                job.completed += 1
+                self._cond.notify_all()
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting work; queued units still run.
+
+        Args:
+            wait (bool): Wait for every queued unit to finish
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            dispatcher = self._dispatcher
+        if wait and dispatcher is not None:
+            dispatcher.join()
+        self._pool.shutdown(wait=wait)
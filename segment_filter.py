@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Segment Filter Module
+
+Classifies segments that never need translation (numbers, dates, prices,
+URLs, e-mail addresses, code, product SKUs, bare punctuation) so they can
+pass through without a backend call.
+"""
+
+from collections import OrderedDict
+import re
+import threading
+
+from segmentation import TAG_RE
+
+
+_NUM = r"\d[\d\s.,'’]*"
+_CURRENCY = r"(?:[$€£¥₹₩₽¢]|USD|EUR|GBP|JPY|CNY|CHF|INR|AUD|CAD)"
+
+DEFAULT_RULES = OrderedDict([
+    ("number", rf"[-+−±~≈(]?{_NUM}(?:\s*[%‰x×)])?|\d+\s*/\s*\d+"),
+    ("price", rf"[-+−]?{_CURRENCY}\s?{_NUM}(?:[kKmMbB]n?)?|[-+−]?{_NUM}\s?{_CURRENCY}"),
+    ("date", r"\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+             r"|\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp]\.?[Mm]\.?)?"
+             r"|(?:Q[1-4]|H[12])\s?(?:FY)?\s?'?\d{2,4}|FY\s?'?\d{2,4}"),
+    ("url", r"(?:https?://|ftp://|www\.)\S+|[\w-]+(?:\.[\w-]+)+/\S*"),
+    ("email", r"(?:mailto:)?[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    ("code", r"`[^`]+`"
+             r"|[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*\([^()]*\);?"
+             r"|[a-z][a-z0-9]*(?:_[a-z0-9]+)+"
+             r"|[\w.-]*/[\w./-]+\.\w+"),
+    ("sku", r"(?=[\w./-]*\d)[A-Z0-9]+(?:[-_/.][A-Z0-9]+)+|(?=[A-Z]*\d)(?=\d*[A-Z])[A-Z0-9]{4,}"),
+    ("symbols", r"[\W_]+"),
+])
+
+
+class SegmentFilter:
+    """
+    A configurable classifier for segments that pass through untranslated.
+    """
+
+    def __init__(self, rules=None, disabled=(), extra_rules=None):
+        """
+        Initialize the filter.
+
+        Args:
+            rules (dict): Mapping of category name to regular expression that
+                must match the whole stripped segment; defaults to DEFAULT_RULES
+            disabled (iterable): Category names to leave out
+            extra_rules (dict): Additional categories, checked after ``rules``
+        """
+        rules = OrderedDict(DEFAULT_RULES if rules is None else rules)
+        rules.update(extra_rules or {})
+        self.rules = [
+            (name, re.compile(pattern))
+            for name, pattern in rules.items()
+            if name not in set(disabled)
+        ]
+        self.counts = {name: 0 for name, _ in self.rules}
+        self.skipped_segments = 0
+        self.skipped_chars = 0
+        self._lock = threading.Lock()
+
+    def classify(self, text: str):
+        """
+        Find the pass-through category of a segment.
+
+        Run placeholders of paragraph segments are ignored.
+
+        Args:
+            text (str): Segment text
+
+        Returns:
+            str: Category name, or None if the segment needs translation
+        """
+        core = TAG_RE.sub("", text).strip()
+        if not core:
+            return None
+        for name, pattern in self.rules:
+            if pattern.fullmatch(core):
+                return name
+        return None
+
+    def check(self, text: str) -> bool:
+        """
+        Check whether a segment passes through, without counting it.
+
+        Args:
+            text (str): Segment text
+
+        Returns:
+            bool: True if the segment should not be translated
+        """
+        return self.classify(text) is not None
+
+    def record(self, texts):
+        """
+        Count pass-through segments kept for one target language.
+
+        Called once per language actually translated, not for dry runs,
+        so the counters add up to the backend segments the filter saved.
+
+        Args:
+            texts (iterable): Pass-through segment texts
+        """
+        for text in texts:
+            category = self.classify(text)
+            if category is None:
+                continue
+            with self._lock:
+                self.counts[category] += 1
+                self.skipped_segments += 1
+                self.skipped_chars += len(text)
+
+    def stats(self):
+        """
+        Get filter counters.
+
+        Returns:
+            dict: Segments and characters not sent to the backend, summed
+                over target languages, with counts per category
+        """
+        with self._lock:
+            return {
+                "skipped_segments": self.skipped_segments,
+                "skipped_chars": self.skipped_chars,
+                "by_category": dict(self.counts),
+            }
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Segment Inventory Module
+
+A deduplicated inventory of the text segments in a presentation, with
+back-references to every place each segment occurs.
+"""
+
+
+class SegmentInventory:
+    """
+    Unique source segments of a presentation and the runs that hold them.
+
+    Each reference is an object with a writable ``text`` attribute, such
+    as a python-pptx run.
+    """
+
+    def __init__(self):
+        """Initialize an empty inventory."""
+        self.segments = []
+        self.refs = []
+        self.text_frames = []
+        self.parts = []
+        self.passthrough = set()
+        self.part_segments = {}
+        self._positions = {}
+        self._current_part = None
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def total_refs(self) -> int:
+        """int: Number of references across all unique segments."""
+        return sum(len(refs) for refs in self.refs)
+
+    def add(self, text: str, ref):
+        """
+        Record an occurrence of a segment.
+
+        Args:
+            text (str): Segment text
+            ref: Object whose ``text`` receives the translation
+
+        Returns:
+            int: Position of the segment in ``segments``
+        """
+        pos = self._positions.get(text)
+        if pos is None:
+            pos = len(self.segments)
+            self._positions[text] = pos
+            self.segments.append(text)
+            self.refs.append([])
+        self.refs[pos].append(ref)
+        if self._current_part is not None:
+            self._current_part.add(pos)
+        return pos
+
+    def begin_part(self, name: str):
+        """
+        Attribute the segments added from now on to a part.
+
+        Args:
+            name (str): Part name, such as a slide's zip member name
+        """
+        self._current_part = self.part_segments.setdefault(name, set())
+
+    def mark_passthrough(self, pos: int):
+        """
+        Mark a segment as not needing translation.
+
+        Args:
+            pos (int): Position of the segment in ``segments``
+        """
+        self.passthrough.add(pos)
+
+    def passthrough_texts(self):
+        """
+        Get the segments that are kept as they are.
+
+        Returns:
+            dict: Mapping of each pass-through segment to itself
+        """
+        return {self.segments[pos]: self.segments[pos] for pos in self.passthrough}
+
+    def add_text_frame(self, tf):
+        """
+        Record a text frame that is touched by the translation.
+
+        Args:
+            tf: Text frame object
+        """
+        self.text_frames.append(tf)
+
+    def add_part(self, part):
+        """
+        Record a package part whose content the translation changes.
+        
+        Args:
+            part: python-pptx part object
+        """
+        if all(p is not part for p in self.parts):
+            self.parts.append(part)
+
+    def apply(self, translations):
+        """
+        Write translations back to every reference.
+
+        Args:
+            translations (list): Translated texts, parallel to ``segments``
+        """
+        for refs, new_text in zip(self.refs, translations):
+            for ref in refs:
+                ref.text = new_text
+
+    def stats(self):
+        """
+        Get inventory counters.
+
+        Returns:
+            dict: Unique and total segment counts
+        """
+        return {
+            "unique_segments": len(self.segments),
+            "total_segments": self.total_refs,
+            "unique_chars": sum(len(s) for s in self.segments),
+            "passthrough_segments": len(self.passthrough),
+        }
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Segmentation Module
+
+Paragraph-level segments: the runs of a paragraph are sent to the backend
+as one piece of text with inline placeholders marking run boundaries, and
+the translation is redistributed back onto the runs afterwards.
+"""
+
+import re
+
+
+TAG_RE = re.compile(r"<\s*(/?)\s*r\s*(\d+)\s*>")
+_SPAN_RE = re.compile(r"<\s*r\s*(\d+)\s*>(.*?)<\s*/\s*r\s*\1\s*>", re.DOTALL)
+
+
+def can_encode(texts) -> bool:
+    """
+    Check whether run texts can be combined into one marked-up segment.
+
+    Args:
+        texts (list): Run texts of a paragraph
+
+    Returns:
+        bool: False if any run already contains placeholder-like markup
+    """
+    return not any(TAG_RE.search(t) for t in texts)
+
+
+def _split(text):
+    core = text.strip()
+    if not core:
+        return text, "", ""
+    return text[:len(text) - len(text.lstrip())], core, text[len(text.rstrip()):]
+
+
+def encode_runs(texts) -> str:
+    """
+    Combine run texts into one segment with run-boundary placeholders.
+
+    Whitespace around each run stays outside its placeholder so the
+    backend sees natural word spacing; whitespace-only runs are kept as
+    plain text.
+
+    Args:
+        texts (list): Run texts of a paragraph
+
+    Returns:
+        str: Segment such as ``"<r0>Hello</r0> <r1>world</r1>"``
+    """
+    parts = []
+    for i, text in enumerate(texts):
+        lead, core, trail = _split(text)
+        if core:
+            parts.append(f"{lead}<r{i}>{core}</r{i}>{trail}")
+        else:
+            parts.append(text)
+    return "".join(parts)
+
+
+def decode_runs(segment: str, texts):
+    """
+    Redistribute a translated segment onto the original runs.
+
+    Each run keeps its original surrounding whitespace. When the backend
+    reordered the placeholders, the translated pieces are assigned to runs
+    in reading order. When placeholders were lost, the whole translation
+    goes to the first run that had text and the other runs are emptied.
+
+    Args:
+        segment (str): Translated segment produced from ``encode_runs``
+        texts (list): Original run texts
+
+    Returns:
+        list: New run texts, parallel to ``texts``
+    """
+    tagged = [i for i, t in enumerate(texts) if t.strip()]
+    spans = [(int(m.group(1)), m.group(2)) for m in _SPAN_RE.finditer(segment)]
+    ids = [i for i, _ in spans]
+
+    result = list(texts)
+    if sorted(ids) == tagged:
+        if ids != tagged:
+            spans = list(zip(tagged, (content for _, content in spans)))
+        for i, content in spans:
+            lead, _, trail = _split(texts[i])
+            result[i] = lead + TAG_RE.sub("", content).strip() + trail
+        return result
+
+    if not tagged:
+        return result
+    plain = " ".join(TAG_RE.sub(" ", segment).split())
+    lead, _, trail = _split(texts[tagged[0]])
+    result[tagged[0]] = lead + plain + trail
+    for i in tagged[1:]:
+        result[i] = ""
+    return result
+
+
+class ParagraphRef:
+    """
+    The runs of one paragraph, read and written as a single marked-up text.
+
+    Assigning ``text`` distributes a translated segment over the runs, so a
+    ParagraphRef can sit in a SegmentInventory next to plain run references.
+    """
+
+    def __init__(self, runs):
+        """
+        Initialize the reference.
+
+        Args:
+            runs (list): Run objects with a writable ``text`` attribute
+        """
+        self.runs = runs
+        self.source = [r.text or "" for r in runs]
+        self._text = encode_runs(self.source)
+
+    @property
+    def text(self) -> str:
+        """str: The segment last written to the runs, initially the source."""
+        return self._text
+
+    @text.setter
+    def text(self, segment: str):
+        for run, new_text in zip(self.runs, decode_runs(segment, self.source)):
+            if run.text != new_text:
+                run.text = new_text
+        self._text = segment
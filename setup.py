@@ -53,6 +53,7 @@ setup(
     entry_points={
         "console_scripts": [
             "ppt-translator=app:main",
+            "ppt-translate-bulk=bulk_translate:main",
         ],
     },
     include_package_data=True,
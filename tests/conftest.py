@@ -0,0 +1,72 @@
+import os
+import re
+import sys
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ppt_translator import PPTTranslator  # noqa: E402
+from translation_backends import FakeBackend  # noqa: E402
+
+
+_SLIDE_NAME_RE = re.compile(r"\bslide(\d+)\.xml")
+
+
+def make_deck(path, slide_texts):
+    """Write a deck with one text box per slide."""
+    prs = Presentation()
+    for text in slide_texts:
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(1))
+        box.text_frame.text = text
+    prs.save(path)
+    return path
+
+
+def renumber_slides(src, dst, numbers):
+    """
+    Copy a deck, renaming its slide parts.
+
+    Args:
+        numbers (dict): New number of each slide part, keyed by its old number
+    """
+    def rename(match):
+        return f"slide{numbers.get(int(match.group(1)), int(match.group(1)))}.xml"
+
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info)
+            if info.filename.endswith((".xml", ".rels")):
+                data = _SLIDE_NAME_RE.sub(rename, data.decode("utf-8")).encode("utf-8")
+            zout.writestr(_SLIDE_NAME_RE.sub(rename, info.filename), data)
+    return dst
+
+
+def slide_texts(path):
+    """Text of every slide of a deck, in presentation order."""
+    return [
+        " | ".join(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+        for slide in Presentation(path).slides
+    ]
+
+
+@pytest.fixture
+def make_translator():
+    """Build offline translators that keep no state between tests."""
+    translators = []
+
+    def build(**kwargs):
+        options = dict(cache=False, backend=FakeBackend(), use_manifests=False,
+                       checkpoints=False, history=False, language_detector=False)
+        options.update(kwargs)
+        translator = PPTTranslator(**options)
+        translators.append(translator)
+        return translator
+
+    yield build
+    for translator in translators:
+        translator.close()
@@ -0,0 +1,26 @@
+from batching import join_segments, split_segments
+from translation_backends import FakeBackend
+
+
+def test_join_split_round_trip():
+    texts = ["Hello world", "Good morning", "Thank you"]
+    assert split_segments(join_segments(texts), 3) == texts
+    assert split_segments("Hello world Good morning", 2) is None
+
+
+def test_joined_batches_use_one_request(make_translator):
+    backend = FakeBackend(joined=True)
+    translator = make_translator(backend=backend)
+    texts = ["Hello world", "Good morning", "Thank you", "See you"]
+    assert translator.translate_batch(texts, "fr") == [f"[fr] {t}" for t in texts]
+    assert backend.calls == 1
+
+
+def test_lost_line_breaks_fall_back_to_smaller_batches(make_translator):
+    backend = FakeBackend(joined=True, line_break_loss=1.0)
+    translator = make_translator(backend=backend)
+    texts = ["Hello world", "Good morning", "Thank you", "See you"]
+    assert translator.translate_batch(texts, "fr") == [f"[fr] {t}" for t in texts]
+    # Every multi-segment request fails to split, so the batch is halved
+    # down to single segments: 2N-1 requests
+    assert backend.calls == 2 * len(texts) - 1
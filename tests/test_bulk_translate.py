@@ -0,0 +1,47 @@
+import pytest
+
+from bulk_translate import _up_to_date, bulk_translate
+from retry_policy import CircuitBreaker, RetryPolicy
+from translation_backends import FakeBackend
+
+from conftest import make_deck, slide_texts
+
+
+def test_entries_with_untranslated_segments_are_not_up_to_date(tmp_path):
+    out = tmp_path / "a_fr.pptx"
+    out.write_bytes(b"")
+    entry = {"hash": "h", "outputs": {"fr": str(out)}, "failed": {}}
+    assert _up_to_date(entry, "h", ["fr"])
+    assert not _up_to_date(dict(entry, failed={"fr": 3}), "h", ["fr"])
+    assert not _up_to_date({"hash": "h", "outputs": {"fr": str(out)}}, "h", ["fr"])
+    assert not _up_to_date(entry, "other", ["fr"])
+
+
+@pytest.mark.parametrize("failure", ["segments", "circuit"])
+def test_failed_decks_are_retried_on_the_next_run(make_translator, tmp_path, monkeypatch, failure):
+    # Worker processes use the default checkpoint directory
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    deck = make_deck(str(decks / "a.pptx"), ["Hello world"])
+    out_dir = str(tmp_path / "out")
+
+    backend = FakeBackend(failure_rate=1.0)
+    breaker = CircuitBreaker(failure_threshold=1 if failure == "circuit" else 100,
+                             reset_timeout=60, max_open_time=0)
+    broken = make_translator(backend=backend, retry_policy=RetryPolicy(max_attempts=1),
+                             circuit_breaker=breaker)
+    results = bulk_translate([deck], ["fr"], out_dir, broken, processes=1, threads=1)
+    entry = results["decks"]["a.pptx"]
+    if failure == "circuit":
+        assert entry["state"] == "failed"
+        assert entry["outputs"] == {} and "fr" in entry["errors"]
+    else:
+        assert entry["state"] == "partial"
+        assert entry["failed"]["fr"] > 0
+
+    working = make_translator(backend=FakeBackend())
+    results = bulk_translate([deck], ["fr"], out_dir, working, processes=1, threads=1)
+    entry = results["decks"]["a.pptx"]
+    assert entry["state"] == "done" and entry["failed"] == {}
+    assert slide_texts(entry["outputs"]["fr"]) == ["[fr] Hello world"]
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from checkpoint import CheckpointStore
+from glossary import Glossary
+
+from conftest import make_deck, slide_texts
+
+
+def test_store_releases_finished_checkpoints(tmp_path, make_translator):
+    deck = make_deck(str(tmp_path / "deck.pptx"), ["Hello world", "Good morning"])
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    translator = make_translator(checkpoints=store)
+
+    for engine in ("pptx", "xml"):
+        translator.engine = engine
+        translator.translate_presentation(deck, str(tmp_path / f"{engine}.pptx"), "fr")
+        assert store._open == {}
+    translator.translate_multiple_languages(deck, str(tmp_path / "out"), ["de", "es"])
+    assert store._open == {}
+
+    checkpoint = store.open("hash", "fr", "fake")
+    store.flush()
+    assert store._open == {}
+    assert store.open("hash", "fr", "fake") is not checkpoint
+
+
+def test_rerun_with_other_settings_is_not_skipped(tmp_path, make_translator):
+    deck = make_deck(str(tmp_path / "deck.pptx"), ["Hello world"])
+    out_dir = str(tmp_path / "out")
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+
+    first = make_translator(checkpoints=store)
+    [out_path] = first.translate_multiple_languages(deck, out_dir, ["fr"])
+    assert slide_texts(out_path) == ["[fr] Hello world"]
+    mtime = os.path.getmtime(out_path)
+
+    same = make_translator(checkpoints=store)
+    assert same.translate_multiple_languages(deck, out_dir, ["fr"]) == [out_path]
+    assert os.path.getmtime(out_path) == mtime
+
+    glossary = make_translator(checkpoints=store, glossary=Glossary({"Hello": "Salut"}))
+    glossary.translate_multiple_languages(deck, out_dir, ["fr"])
+    assert "Salut" in slide_texts(out_path)[0]
+
+    paragraph = make_translator(checkpoints=store, segmentation="paragraph")
+    assert paragraph._settings_fingerprint() != first._settings_fingerprint()
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_manifests_from_other_settings_are_ignored(tmp_path, make_translator, engine):
+    deck = make_deck(str(tmp_path / "deck.pptx"), ["Acme makes great widgets"])
+    out_path = str(tmp_path / "deck_fr.pptx")
+
+    make_translator(engine=engine, use_manifests=True).translate_presentation(deck, out_path, "fr")
+    assert slide_texts(out_path) == ["[fr] Acme makes great widgets"]
+
+    glossary = Glossary({"Acme": {"fr": "AcmeFR"}})
+    translator = make_translator(engine=engine, use_manifests=True, glossary=glossary)
+    translator.translate_presentation(deck, out_path, "fr")
+    assert "AcmeFR" in slide_texts(out_path)[0]
+
+    # The manifest written under the glossary is reused by the same settings
+    calls = translator.backend.calls
+    translator.translate_presentation(deck, out_path, "fr")
+    assert translator.backend.calls == calls
+    assert "AcmeFR" in slide_texts(out_path)[0]
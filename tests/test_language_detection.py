@@ -0,0 +1,67 @@
+import pytest
+
+from language_detection import LanguageDetector, same_language
+
+
+@pytest.fixture
+def detector():
+    return LanguageDetector()
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("The results of the quarter are in", "en"),
+    ("Der Bericht für das Quartal", "de"),
+    ("Привіт, як справи", "uk"),
+    ("Это наш новый отчёт", "ru"),
+    ("این گزارش جدید است", "fa"),
+    ("هذا تقرير جديد", "ar"),
+    ("这是我们的新报告", "zh-cn"),
+    ("這是我們的新報告", "zh-tw"),
+    ("こんにちは世界", "ja"),
+    ("안녕하세요", "ko"),
+])
+def test_detects_language(detector, text, lang):
+    detected, confidence = detector.detect(text)
+    assert detected == lang
+    assert confidence >= 0.8
+
+
+@pytest.mark.parametrize("text", ["Привет мир", "報告", "नमस्ते दुनिया"])
+def test_ambiguous_scripts_are_left_to_the_backend(detector, text):
+    assert detector.detect(text) == (None, 0.0)
+
+
+def test_single_stopword_is_not_trusted(detector):
+    lang, confidence = detector.detect("Die cast parts overview")
+    assert confidence < 0.8
+
+
+def test_detect_sources_falls_back_to_auto(make_translator):
+    translator = make_translator(language_detector=LanguageDetector())
+    assert translator.detect_sources(
+        ["Die cast parts overview", "Привет мир", "Der Bericht für das Quartal"]
+    ) == ["auto", "auto", "de"]
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("de", "de-at", True),
+    ("nb", "no", True),
+    ("zh-cn", "zh-hans", True),
+    ("zh-tw", "zh-hk", True),
+    ("zh-tw", "zh-cn", False),
+    ("zh", "zh-cn", False),
+    ("en", "fr", False),
+    ("auto", "fr", False),
+    (None, "fr", False),
+])
+def test_same_language(a, b, expected):
+    assert same_language(a, b) is expected
+
+
+def test_traditional_chinese_is_translated_for_simplified_target(make_translator, tmp_path):
+    from conftest import make_deck, slide_texts
+
+    deck = make_deck(str(tmp_path / "zh.pptx"), ["這是我們的新報告", "这是我们的新报告"])
+    out = str(tmp_path / "out.pptx")
+    make_translator(language_detector=LanguageDetector()).translate_presentation(deck, out, "zh-cn")
+    assert slide_texts(out) == ["[zh-cn] 這是我們的新報告", "这是我们的新报告"]
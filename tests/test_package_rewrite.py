@@ -0,0 +1,119 @@
+import os
+import zipfile
+
+import pytest
+
+from conftest import make_deck, renumber_slides, slide_texts
+
+
+ENGINES = ["pptx", "xml"]
+
+
+@pytest.fixture
+def reversed_deck(tmp_path):
+    deck = make_deck(str(tmp_path / "plain.pptx"), ["Alpha slide", "Beta slide", "Gamma slide"])
+    return renumber_slides(deck, str(tmp_path / "reversed.pptx"), {1: 3, 3: 1})
+
+
+@pytest.fixture
+def gapped_deck(tmp_path):
+    deck = make_deck(str(tmp_path / "plain.pptx"), ["Alpha slide", "Gamma slide"])
+    return renumber_slides(deck, str(tmp_path / "gapped.pptx"), {2: 3})
+
+
+def test_fixture_decks_are_renumbered(reversed_deck, gapped_deck):
+    with zipfile.ZipFile(gapped_deck) as zf:
+        names = zf.namelist()
+    assert "ppt/slides/slide3.xml" in names
+    assert "ppt/slides/slide2.xml" not in names
+    assert slide_texts(reversed_deck) == ["Alpha slide", "Beta slide", "Gamma slide"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_reordered_slide_parts_keep_their_text(make_translator, reversed_deck, tmp_path, engine):
+    out = str(tmp_path / f"out_{engine}.pptx")
+    make_translator(engine=engine).translate_presentation(reversed_deck, out, "fr")
+    assert slide_texts(out) == ["[fr] Alpha slide", "[fr] Beta slide", "[fr] Gamma slide"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_gapped_slide_parts_are_all_translated(make_translator, gapped_deck, tmp_path, engine):
+    out = str(tmp_path / f"out_{engine}.pptx")
+    make_translator(engine=engine).translate_presentation(gapped_deck, out, "fr")
+    assert slide_texts(out) == ["[fr] Alpha slide", "[fr] Gamma slide"]
+
+
+@pytest.mark.parametrize("deck", ["reversed_deck", "gapped_deck"])
+def test_engines_produce_the_same_package(make_translator, request, tmp_path, deck):
+    path = request.getfixturevalue(deck)
+    outputs = {}
+    for engine in ENGINES:
+        outputs[engine] = str(tmp_path / f"{engine}.pptx")
+        make_translator(engine=engine).translate_presentation(path, outputs[engine], "de")
+
+    with zipfile.ZipFile(outputs["pptx"]) as a, zipfile.ZipFile(outputs["xml"]) as b:
+        # The pipelined XML path writes text parts last
+        assert sorted(a.namelist()) == sorted(b.namelist())
+        with zipfile.ZipFile(path) as src:
+            assert a.namelist() == src.namelist()
+    assert slide_texts(outputs["pptx"]) == slide_texts(outputs["xml"])
+
+
+def test_unchanged_members_are_copied_byte_for_byte(make_translator, reversed_deck, tmp_path):
+    out = str(tmp_path / "out.pptx")
+    make_translator().translate_presentation(reversed_deck, out, "fr")
+    with zipfile.ZipFile(reversed_deck) as src, zipfile.ZipFile(out) as dst:
+        for info in src.infolist():
+            if not info.filename.startswith(("ppt/slides/slide", "ppt/slideLayouts/",
+                                             "ppt/slideMasters/", "ppt/notesSlides/")):
+                assert dst.read(info.filename) == src.read(info.filename), info.filename
+
+
+def test_pipelined_and_staged_outputs_are_identical(make_translator, reversed_deck, tmp_path):
+    outputs = []
+    for pipelined in (True, False):
+        out = str(tmp_path / f"out_{pipelined}.pptx")
+        make_translator(engine="xml", pipelined=pipelined).translate_presentation(
+            reversed_deck, out, "fr")
+        outputs.append(out)
+    with zipfile.ZipFile(outputs[0]) as a, zipfile.ZipFile(outputs[1]) as b:
+        assert sorted(a.namelist()) == sorted(b.namelist())
+        for name in a.namelist():
+            assert a.read(name) == b.read(name), name
+    assert os.path.exists(outputs[0]) and not os.path.exists(outputs[0] + ".part")
+
+
+def test_profiled_jobs_take_the_staged_path(make_translator, reversed_deck, tmp_path, monkeypatch):
+    translator = make_translator(engine="xml", pipelined=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("profiled job took the pipeline")
+
+    monkeypatch.setattr(translator, "_translate_pipelined", fail)
+    out = str(tmp_path / "out.pptx")
+    profile = str(tmp_path / "job.prof")
+    translator.translate_presentation(reversed_deck, out, "fr", profile_path=profile)
+    assert os.path.exists(out) and os.path.exists(profile)
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.01])
+def test_pipeline_sends_as_many_requests_as_the_staged_path(make_translator, tmp_path, latency):
+    from benchmark import generate_deck
+    from translation_backends import FakeBackend
+
+    deck = generate_deck(str(tmp_path / "synthetic.pptx"), slides=60)
+    calls = {}
+    for pipelined in (True, False):
+        backend = FakeBackend(latency=latency)
+        make_translator(engine="xml", backend=backend, pipelined=pipelined).translate_presentation(
+            deck, str(tmp_path / f"out_{pipelined}.pptx"), "fr")
+        calls[pipelined] = backend.calls
+    assert calls[True] == calls[False]
+
+
+def test_pipeline_does_not_stall_on_a_full_queue(make_translator, tmp_path):
+    # Many small parts fill the parts queue before one request is full
+    deck = make_deck(str(tmp_path / "deck.pptx"), [f"Slide {i}" for i in range(80)])
+    out = str(tmp_path / "out.pptx")
+    make_translator(engine="xml", pipelined=True).translate_presentation(deck, out, "fr")
+    assert slide_texts(out)[79] == "[fr] Slide 79"
@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+from retry_policy import (CircuitBreaker, CircuitOpenError, FatalTranslationError,
+                          RetryPolicy, TransientError, classify_error)
+from translation_backends import FakeBackend
+
+from conftest import make_deck
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_gives_up_after_max_open_time():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2, max_open_time=0.05)
+    trip(breaker)
+    time.sleep(0.06)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_recovers_after_giving_up():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1, max_open_time=0.05)
+    trip(breaker)
+    time.sleep(0.15)
+    # The probe is let through even though callers have given up
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_and_callers_keep_failing_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1, max_open_time=0.05)
+    trip(breaker)
+    time.sleep(0.15)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert time.monotonic() - started < 0.05
+
+
+class FlakyBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.down = True
+
+    def translate(self, text, dest, src="auto"):
+        if self.down:
+            raise TransientError("service unavailable")
+        return super().translate(text, dest, src)
+
+    def translate_batch(self, texts, dest, src="auto"):
+        if self.down:
+            raise TransientError("service unavailable")
+        return super().translate_batch(texts, dest, src)
+
+
+def test_shared_translator_recovers_after_outage(make_translator):
+    backend = FlakyBackend()
+    translator = make_translator(
+        backend=backend,
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.1, max_open_time=0.05),
+    )
+    translator.retry_policy.max_attempts = 1
+    assert translator.translate_batch(["Hello world"], "fr") == ["Hello world"]
+    time.sleep(0.06)
+    with pytest.raises(CircuitOpenError):
+        translator.translate_batch(["Good morning"], "fr")
+
+    backend.down = False
+    time.sleep(0.15)
+    assert translator.translate_batch(["Good night"], "fr") == ["[fr] Good night"]
+    assert translator.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("exc", [
+    json.JSONDecodeError("Expecting value", "", 0),
+    UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte"),
+    ConnectionResetError(),
+    TransientError("busy", retry_after=3),
+])
+def test_transient_errors_are_retryable(exc):
+    assert classify_error(exc)[0]
+
+
+@pytest.mark.parametrize("exc", [
+    ValueError("invalid destination language"),
+    FatalTranslationError("quota exceeded"),
+    Exception('Unexpected status code "403" from server'),
+])
+def test_fatal_errors_are_not_retried(exc):
+    assert classify_error(exc) == (False, None)
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_untranslated_segments_are_reported(make_translator, tmp_path, engine):
+    deck = make_deck(str(tmp_path / "deck.pptx"), ["Hello world", "Good morning"])
+    translator = make_translator(
+        backend=FakeBackend(failure_rate=1.0), engine=engine,
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker=CircuitBreaker(failure_threshold=100),
+    )
+    # Every segment fails, including the layout and master placeholders
+    failed = translator.translate_presentation(deck, str(tmp_path / "out.pptx"), "fr")
+    assert failed >= 2
+
+    events = []
+    translator.translate_multiple_languages(deck, str(tmp_path / "multi"), ["fr", "de"],
+                                            on_progress=events.append)
+    saved = [event for event in events if event.kind == "saved"]
+    assert [event.failed_segments for event in saved] == [failed, failed]
+
+    translator.backend.failure_rate = 0.0
+    assert translator.translate_presentation(deck, str(tmp_path / "out.pptx"), "fr") == 0
@@ -0,0 +1,29 @@
+import pytest
+
+from segment_filter import SegmentFilter
+
+from conftest import make_deck
+
+
+def test_check_does_not_count():
+    segment_filter = SegmentFilter()
+    assert segment_filter.check("$19.99")
+    assert not segment_filter.check("Quarterly revenue")
+    assert segment_filter.stats()["skipped_segments"] == 0
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_counts_are_per_language_and_skip_dry_runs(make_translator, tmp_path, engine):
+    deck = make_deck(str(tmp_path / "deck.pptx"), ["Quarterly revenue", "$19.99", "2024-01-31"])
+    translator = make_translator(engine=engine, segment_filter=SegmentFilter())
+    passthrough = translator.load_template(deck).inventory.passthrough_texts()
+    assert {"$19.99", "2024-01-31"} <= set(passthrough)
+
+    translator.estimate(deck, ["fr", "de"])
+    assert translator.segment_filter.stats()["skipped_segments"] == 0
+
+    translator.translate_multiple_languages(deck, str(tmp_path / "out"), ["fr", "de"])
+    translator.translate_presentation(deck, str(tmp_path / "es.pptx"), "es")
+    stats = translator.segment_filter.stats()
+    assert stats["skipped_segments"] == 3 * len(passthrough)
+    assert stats["skipped_chars"] == 3 * sum(len(text) for text in passthrough)
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from translation_cache import TranslationCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+def disk_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT source, src_lang, dest_lang, backend, translation, last_used FROM translations"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_round_trip_across_instances(cache_path):
+    cache = TranslationCache(cache_path)
+    cache.put("  Hello ", "Bonjour", "fr", "en", backend="fake")
+    cache.put_many([("Yes", "Oui"), ("No", "Non")], "fr", backend="fake")
+    cache.close()
+
+    cache = TranslationCache(cache_path)
+    assert cache.get("Hello", "fr", "en", backend="fake") == "Bonjour"
+    assert cache.get("Yes", "fr", backend="fake") == "Oui"
+    assert cache.get("No", "fr", backend="fake") == "Non"
+    assert cache.get("Hello", "de", "en", backend="fake") is None
+    assert cache.get("Hello", "fr", "en", backend="other") is None
+    cache.close()
+
+
+def test_writes_are_buffered_until_flush(cache_path):
+    cache = TranslationCache(cache_path, flush_every=100, flush_interval=60)
+    cache.put_many([(f"text {i}", f"texte {i}") for i in range(10)], "fr", backend="fake")
+    assert disk_rows(cache_path) == []
+    assert cache.get("text 3", "fr", backend="fake") == "texte 3"
+    assert cache.contains("text 4", "fr", backend="fake")
+
+    cache.flush()
+    assert len(disk_rows(cache_path)) == 10
+    cache.close()
+
+
+def test_pending_entries_survive_memory_eviction(cache_path):
+    cache = TranslationCache(cache_path, memory_size=2, flush_every=100, flush_interval=60)
+    cache.put_many([(f"text {i}", f"texte {i}") for i in range(10)], "fr", backend="fake")
+    assert cache.get("text 0", "fr", backend="fake") == "texte 0"
+    cache.close()
+
+
+def test_flushes_once_the_buffer_fills(cache_path):
+    cache = TranslationCache(cache_path, flush_every=5, flush_interval=60)
+    cache.put_many([(f"text {i}", f"texte {i}") for i in range(5)], "fr", backend="fake")
+    assert len(disk_rows(cache_path)) == 5
+    cache.close()
+
+
+def test_disk_hits_refresh_last_used_on_flush(cache_path):
+    cache = TranslationCache(cache_path)
+    cache.put("Hello", "Bonjour", "fr", backend="fake")
+    cache.close()
+    (_, _, _, _, _, stored), = disk_rows(cache_path)
+
+    cache = TranslationCache(cache_path, flush_every=100, flush_interval=60)
+    assert cache.get("Hello", "fr", backend="fake") == "Bonjour"
+    assert disk_rows(cache_path)[0][5] == stored
+    cache.flush()
+    assert disk_rows(cache_path)[0][5] > stored
+    cache.close()
+
+
+def test_size_eviction_includes_buffered_entries(cache_path):
+    cache = TranslationCache(cache_path, max_entries=3, flush_every=100, flush_interval=60)
+    cache.put_many([(f"text {i}", f"texte {i}") for i in range(6)], "fr", backend="fake")
+    cache.evict()
+    assert len(disk_rows(cache_path)) == 3
+    cache.close()
+
+
+def test_translator_fills_and_reuses_the_cache(make_translator, cache_path):
+    translator = make_translator(cache=TranslationCache(cache_path))
+    assert translator.translate_batch(["Hello", "World"], "fr") == ["[fr] Hello", "[fr] World"]
+    translator.close()
+    translator.cache.close()
+
+    translator = make_translator(cache=TranslationCache(cache_path))
+    assert translator.translate_batch(["Hello", "World"], "fr") == ["[fr] Hello", "[fr] World"]
+    assert translator.backend.calls == 0
+    translator.cache.close()
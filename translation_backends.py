@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Translation Backends Module
+
+The interface PPTTranslator uses to talk to a translation provider, the
+Google Translate implementation, and a deterministic offline stand-in for
+benchmarks and load tests.
+"""
+
+from dataclasses import dataclass
+import random
+import threading
+import time
+
+from batching import join_segments, split_segments
+from retry_policy import TransientError
+from segmentation import TAG_RE
+
+
+@dataclass
+class BackendLimits:
+    """
+    Limits a backend declares for the requests sent to it.
+
+    Attributes:
+        max_chars (int): Maximum characters per request
+        max_batch_size (int): Maximum segments per batched request
+        requests_per_second (float): Sustained request rate the provider
+            tolerates, or None for no limit
+        cost_per_million_chars (float): Price of translating one million
+            characters, or None if unknown or free
+    """
+
+    max_chars: int = 4500
+    max_batch_size: int = 128
+    requests_per_second: float = 5.0
+    cost_per_million_chars: float = None
+
+
+class TranslationBackend:
+    """
+    Base class for translation providers.
+
+    Subclasses implement ``translate``; ``translate_batch`` defaults to
+    joining segments into a single ``translate`` call.
+    """
+
+    name = "base"
+    limits = BackendLimits()
+
+    def translate(self, text: str, dest: str, src: str = "auto"):
+        """
+        Translate one piece of text.
+
+        Args:
+            text (str): Text to translate
+            dest (str): Target language code
+            src (str): Source language code or "auto"
+
+        Returns:
+            str: Translated text, or None if the provider returned nothing
+
+        Raises:
+            Exception: Provider errors, classified by retry_policy
+        """
+        raise NotImplementedError
+
+    def translate_batch(self, texts, dest: str, src: str = "auto"):
+        """
+        Translate several segments in one request.
+
+        Args:
+            texts (list): Segment texts without line breaks
+            dest (str): Target language code
+            src (str): Source language code or "auto"
+
+        Returns:
+            list: Translated segments, or None if the reply could not be
+                split back into the original segments
+        """
+        translated = self.translate(join_segments(texts), dest, src)
+        if translated is None:
+            return None
+        return split_segments(translated, len(texts))
+
+
+class GoogleTransBackend(TranslationBackend):
+    """
+    Google Translate through the ``googletrans`` package.
+    """
+
+    name = "googletrans"
+    limits = BackendLimits(max_chars=4500, max_batch_size=128, requests_per_second=5.0)
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the backend.
+
+        Args:
+            **kwargs: Passed to ``googletrans.Translator``
+        """
+        from googletrans import Translator
+
+        kwargs.setdefault("raise_exception", True)
+        self.translator = Translator(**kwargs)
+
+    def translate(self, text: str, dest: str, src: str = "auto"):
+        result = self.translator.translate(text, dest=dest, src=src)
+        if result and result.text:
+            return result.text
+        return None
+
+
+class FakeBackend(TranslationBackend):
+    """
+    A deterministic offline backend with simulated latency and failures.
+
+    Translations are the source text prefixed with the target language,
+    e.g. ``"[fr] Hello"``, so output is reproducible and easy to check.
+    Run placeholders in paragraph segments are kept, with each marked run
+    prefixed instead.
+
+    With ``joined`` set, batches go through the inherited join/split path
+    as one ``translate`` call, like GoogleTransBackend, and
+    ``line_break_loss`` simulates a provider that returns the joined
+    payload with its line breaks replaced by spaces.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, latency_per_char=0.0, failure_rate=0.0,
+                 retry_after=None, seed=0, limits=None, joined=False, line_break_loss=0.0):
+        """
+        Initialize the backend.
+
+        Args:
+            latency (float): Seconds added to every request
+            latency_per_char (float): Seconds added per character sent
+            failure_rate (float): Probability in [0, 1] that a request
+                raises a TransientError
+            retry_after (float): Retry-After attached to injected failures
+            seed (int): Seed for the failure injection
+            limits (BackendLimits): Declared limits, defaults to unlimited rate
+            joined (bool): Translate batches as one joined ``translate``
+                call instead of a list
+            line_break_loss (float): Probability in [0, 1] that a
+                multi-line ``translate`` call loses its line breaks
+        """
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self.limits = limits or BackendLimits(requests_per_second=None)
+        self.joined = joined
+        self.line_break_loss = line_break_loss
+        self.calls = 0
+        self.chars = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request(self, chars):
+        with self._lock:
+            self.calls += 1
+            self.chars += chars
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        delay = self.latency + self.latency_per_char * chars
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise TransientError("Injected backend failure", retry_after=self.retry_after)
+
+    def _fake(self, text, dest):
+        if TAG_RE.search(text):
+            return TAG_RE.sub(
+                lambda m: m.group(0) if m.group(1) else f"{m.group(0)}[{dest}] ", text
+            )
+        return f"[{dest}] {text}"
+
+    def translate(self, text: str, dest: str, src: str = "auto"):
+        self._request(len(text))
+        lines = [self._fake(line, dest) for line in text.split("\n")]
+        with self._lock:
+            lose = (len(lines) > 1 and self.line_break_loss > 0
+                    and self._random.random() < self.line_break_loss)
+        return (" " if lose else "\n").join(lines)
+
+    def translate_batch(self, texts, dest: str, src: str = "auto"):
+        if self.joined:
+            return super().translate_batch(texts, dest, src)
+        self._request(sum(len(t) for t in texts))
+        return [self._fake(t, dest) for t in texts]
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Translation Cache Module
+
+A persistent translation memory backed by SQLite with an in-process LRU
+in front of it, so repeated strings never go back to the network.
+"""
+
+from collections import OrderedDict
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ppt_translator", "translations.sqlite3"
+)
+
+
+def normalize_source(text: str) -> str:
+    """
+    Normalize source text for use as a cache key.
+
+    Args:
+        text (str): Source text
+
+    Returns:
+        str: NFC-normalized text without surrounding whitespace
+    """
+    return unicodedata.normalize("NFC", text).strip()
+
+
+class TranslationCache:
+    """
+    A two-level translation memory: an in-memory LRU over an SQLite table.
+
+    Entries are keyed by (normalized source text, source language,
+    target language, backend name). New entries and ``last_used`` updates
+    are buffered and written in one transaction, so a warm cache does not
+    pay a commit per segment; call flush() or close() to write them out.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_size=4096,
+                 max_entries=500000, max_age=None, flush_every=500, flush_interval=5.0):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database path, or ":memory:" for a
+                process-local cache
+            memory_size (int): Number of entries kept in the in-memory LRU
+            max_entries (int): Maximum number of rows kept on disk
+            max_age (float): Maximum entry age in seconds, or None to keep
+                entries until they are evicted by size
+            flush_every (int): Buffered writes that trigger a flush
+            flush_interval (float): Seconds after which buffered writes are
+                flushed on the next cache operation
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._writes_since_evict = 0
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._touched = {}
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source TEXT NOT NULL,"
+            " src_lang TEXT NOT NULL,"
+            " dest_lang TEXT NOT NULL,"
+            " backend TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (source, src_lang, dest_lang, backend))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used"
+            " ON translations (last_used)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def _key(self, text, src, dest, backend):
+        return (normalize_source(text), src or "auto", dest, backend)
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, dest: str, src: str = "auto", backend: str = "googletrans"):
+        """
+        Look up a cached translation.
+
+        Args:
+            text (str): Source text
+            dest (str): Target language code
+            src (str): Source language code
+            backend (str): Name of the translation backend
+
+        Returns:
+            str: Cached translation, or None on a miss
+        """
+        key = self._key(text, src, dest, backend)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return self._memory[key]
+            if key in self._pending:
+                self._remember(key, self._pending[key])
+                self.hits += 1
+                return self._pending[key]
+
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations"
+                " WHERE source = ? AND src_lang = ? AND dest_lang = ? AND backend = ?",
+                key,
+            ).fetchone()
+            now = time.time()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            self._remember(key, row[0])
+            self.hits += 1
+            self._maybe_flush()
+            return row[0]
+
+    def contains(self, text: str, dest: str, src: str = "auto", backend: str = "googletrans") -> bool:
+        """
+        Check for a cached translation without counting a lookup or
+        refreshing the entry.
+
+        Args:
+            text (str): Source text
+            dest (str): Target language code
+            src (str): Source language code
+            backend (str): Name of the translation backend
+
+        Returns:
+            bool: True if a usable translation is cached
+        """
+        key = self._key(text, src, dest, backend)
+        with self._lock:
+            if key in self._memory or key in self._pending:
+                return True
+            row = self._conn.execute(
+                "SELECT created_at FROM translations"
+                " WHERE source = ? AND src_lang = ? AND dest_lang = ? AND backend = ?",
+                key,
+            ).fetchone()
+            return row is not None and (self.max_age is None or time.time() - row[0] <= self.max_age)
+
+    def put(self, text: str, translation: str, dest: str, src: str = "auto",
+            backend: str = "googletrans"):
+        """
+        Store a translation.
+
+        Args:
+            text (str): Source text
+            translation (str): Translated text
+            dest (str): Target language code
+            src (str): Source language code
+            backend (str): Name of the translation backend
+        """
+        self.put_many([(text, translation)], dest, src, backend)
+
+    def put_many(self, pairs, dest: str, src: str = "auto", backend: str = "googletrans"):
+        """
+        Store several translations of the same language pair.
+
+        Args:
+            pairs (list): (source text, translation) tuples
+            dest (str): Target language code
+            src (str): Source language code
+            backend (str): Name of the translation backend
+        """
+        with self._lock:
+            for text, translation in pairs:
+                key = self._key(text, src, dest, backend)
+                self._remember(key, translation)
+                self._pending[key] = translation
+                self._touched.pop(key, None)
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if (len(self._pending) + len(self._touched) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write buffered entries and ``last_used`` updates in one transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending and not self._touched:
+                return
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations"
+                " (source, src_lang, dest_lang, backend, translation, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [key + (translation, now, now) for key, translation in self._pending.items()],
+            )
+            self._conn.executemany(
+                "UPDATE translations SET last_used = ?"
+                " WHERE source = ? AND src_lang = ? AND dest_lang = ? AND backend = ?",
+                [(used,) + key for key, used in self._touched.items()],
+            )
+            self._conn.commit()
+            self._writes_since_evict += len(self._pending)
+            self._pending.clear()
+            self._touched.clear()
+            if self._writes_since_evict >= 1000:
+                self.evict()
+
+    def evict(self):
+        """Drop expired entries and trim the table to ``max_entries`` rows."""
+        with self._lock:
+            if self._pending or self._touched:
+                self.flush()
+            if self.max_age is not None:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE created_at < ?",
+                    (time.time() - self.max_age,),
+                )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE rowid IN ("
+                    " SELECT rowid FROM translations"
+                    " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+            self._writes_since_evict = 0
+
+    def clear(self):
+        """Remove every cached translation."""
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss counters, hit rate and entry counts
+        """
+        with self._lock:
+            self.flush()
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": entries,
+            }
+
+    def close(self):
+        """Write buffered entries and close the database connection."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
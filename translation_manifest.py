@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Translation Manifest Module
+
+Per-output manifests of segment content hashes and their translations,
+written next to each translated deck so a revised source only needs its
+new or changed segments translated.
+"""
+
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 1
+
+
+def segment_hash(text: str) -> str:
+    """
+    Hash a source segment.
+
+    Args:
+        text (str): Segment text
+
+    Returns:
+        str: Hex digest identifying the segment content
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def write_json_atomic(path: str, data):
+    """
+    Write JSON so readers never see a half-written file.
+
+    Args:
+        path (str): Destination path
+        data: JSON-serializable object
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False)
+    os.replace(tmp_path, tmp_path[:-4])
+
+
+class TranslationManifest:
+    """
+    Segment hashes and translations for one translated output file.
+    """
+
+    def __init__(self, path: str, target_lang: str, backend: str, entries=None, settings=None):
+        """
+        Initialize the manifest.
+
+        Args:
+            path (str): Manifest file path
+            target_lang (str): Target language code
+            backend (str): Name of the translation backend
+            entries (dict): Mapping of segment hash to translation
+            settings (str): Fingerprint of the translator settings that
+                change translations, such as the glossary
+        """
+        self.path = path
+        self.target_lang = target_lang
+        self.backend = backend
+        self.settings = settings
+        self.entries = entries or {}
+        self.reused = 0
+
+    @staticmethod
+    def path_for(output_path: str) -> str:
+        """
+        Get the manifest path for a translated output.
+
+        Args:
+            output_path (str): Path of the translated .pptx
+
+        Returns:
+            str: Manifest path next to the output
+        """
+        return f"{output_path}.manifest.json"
+
+    @classmethod
+    def load(cls, output_path: str, target_lang: str, backend: str, settings: str = None):
+        """
+        Load the manifest of an output, or start an empty one.
+
+        A manifest written for another language, backend or settings
+        fingerprint is ignored.
+
+        Args:
+            output_path (str): Path of the translated .pptx
+            target_lang (str): Target language code
+            backend (str): Name of the translation backend
+            settings (str): Fingerprint of the current translator settings
+
+        Returns:
+            TranslationManifest: Loaded or empty manifest
+        """
+        path = cls.path_for(output_path)
+        entries = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if (data.get("version") == MANIFEST_VERSION
+                    and data.get("target_lang") == target_lang
+                    and data.get("backend") == backend
+                    and data.get("settings") == settings):
+                entries = data.get("segments", {})
+        except (OSError, ValueError):
+            pass
+        return cls(path, target_lang, backend, entries, settings)
+
+    def lookup(self, texts):
+        """
+        Find translations of segments that are unchanged since the last run.
+
+        Args:
+            texts (list): Source segments
+
+        Returns:
+            dict: Mapping of source text to stored translation
+        """
+        known = {}
+        for text in texts:
+            translation = self.entries.get(segment_hash(text))
+            if translation is not None:
+                known[text] = translation
+        self.reused = len(known)
+        return known
+
+    def update(self, texts, translations):
+        """
+        Replace the manifest contents with the current segments.
+
+        Segments whose translation equals the source are left out, so a
+        failed translation is retried on the next run.
+
+        Args:
+            texts (list): Source segments
+            translations (list): Translations, parallel to ``texts``
+        """
+        self.entries = {
+            segment_hash(text): translation
+            for text, translation in zip(texts, translations)
+            if translation != text
+        }
+
+    def save(self):
+        """Write the manifest to disk."""
+        write_json_atomic(self.path, {
+            "version": MANIFEST_VERSION,
+            "target_lang": self.target_lang,
+            "backend": self.backend,
+            "settings": self.settings,
+            "segments": self.entries,
+        })
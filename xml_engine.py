@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+XML Engine Module
+
+Extracts and rewrites slide text by streaming slide, notes, layout and
+master parts straight out of the .pptx zip package, without building
+python-pptx proxy objects.
+
+The engine visits exactly the runs PPTTranslator visits through python-pptx:
+``a:r`` runs of shapes and table cells reachable from ``p:spTree`` through
+any number of group shapes.
+"""
+
+import posixpath
+import re
+import zipfile
+
+from lxml import etree
+
+from package_writer import rewrite_package
+
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+def _qn(tag):
+    prefix, local = tag.split(":")
+    return "{%s}%s" % (_NS[prefix], local)
+
+
+P_CSLD = _qn("p:cSld")
+P_SPTREE = _qn("p:spTree")
+P_GRPSP = _qn("p:grpSp")
+P_SP = _qn("p:sp")
+P_TXBODY = _qn("p:txBody")
+P_GRAPHICFRAME = _qn("p:graphicFrame")
+A_GRAPHIC = _qn("a:graphic")
+A_GRAPHICDATA = _qn("a:graphicData")
+A_TBL = _qn("a:tbl")
+A_TR = _qn("a:tr")
+A_TC = _qn("a:tc")
+A_TXBODY = _qn("a:txBody")
+A_BODYPR = _qn("a:bodyPr")
+A_P = _qn("a:p")
+A_R = _qn("a:r")
+A_T = _qn("a:t")
+
+_SHAPE_TXBODY_PATH = (P_SP, P_TXBODY)
+_TABLE_TXBODY_PATH = (P_GRAPHICFRAME, A_GRAPHIC, A_GRAPHICDATA, A_TBL, A_TR, A_TC, A_TXBODY)
+_AUTOFIT_TAGS = {_qn("a:noAutofit"), _qn("a:normAutofit"), _qn("a:spAutoFit")}
+_AUTOFIT_SUCCESSORS = {_qn("a:scene3d"), _qn("a:sp3d"), _qn("a:flatTx"), _qn("a:extLst")}
+_CTRL_CHARS_RE = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+def escape_ctrl_chars(text: str) -> str:
+    """
+    Escape control characters the way python-pptx does when setting run text.
+
+    Args:
+        text (str): Run text
+
+    Returns:
+        str: Text with control characters written as ``_xHHHH_``
+    """
+    return _CTRL_CHARS_RE.sub(lambda m: "_x%04X_" % ord(m.group(1)), text)
+
+
+def _is_text_body(stack) -> bool:
+    """Check whether a tag path ends at a text body python-pptx would visit."""
+    if len(stack) < 5 or stack[1] != P_CSLD or stack[2] != P_SPTREE:
+        return False
+    i = 3
+    while i < len(stack) and stack[i] == P_GRPSP:
+        i += 1
+    rest = tuple(stack[i:])
+    return rest == _SHAPE_TXBODY_PATH or rest == _TABLE_TXBODY_PATH
+
+
+def iter_part_items(source, release=False):
+    """
+    Stream the translatable items of a slide-like part.
+
+    Args:
+        source: File-like object or path of the part XML
+        release (bool): Free each top-level shape once it has been read,
+            keeping memory flat; the tree is unusable afterwards
+
+    Yields:
+        tuple: ("t", element) for each run text element,
+            ("p", element) after the runs of each paragraph and
+            ("bodyPr", element) for each visited text body's properties
+    """
+    stack = []
+    body_depth = None
+
+    for event, elem in etree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem.tag)
+            if body_depth is None and elem.tag in (P_TXBODY, A_TXBODY) and _is_text_body(stack):
+                body_depth = len(stack)
+            continue
+
+        depth = len(stack)
+        if body_depth is not None:
+            if (elem.tag == A_T and depth == body_depth + 3
+                    and stack[-2] == A_R and stack[-3] == A_P):
+                yield "t", elem
+            elif elem.tag == A_P and depth == body_depth + 1:
+                yield "p", elem
+            elif elem.tag == A_BODYPR and depth == body_depth + 1:
+                yield "bodyPr", elem
+            if depth == body_depth:
+                body_depth = None
+
+        stack.pop()
+
+        if release and depth == 4:
+            elem.clear()
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def set_body_autofit(body_pr):
+    """
+    Make a text body wrap and shrink text on overflow.
+
+    Mirrors ``PPTTranslator.set_textframe_autofit`` at the XML level.
+
+    Args:
+        body_pr: ``a:bodyPr`` element
+    """
+    body_pr.set("wrap", "square")
+    for child in list(body_pr):
+        if child.tag in _AUTOFIT_TAGS:
+            body_pr.remove(child)
+    autofit = etree.Element(_qn("a:normAutofit"))
+    for i, child in enumerate(body_pr):
+        if child.tag in _AUTOFIT_SUCCESSORS:
+            body_pr.insert(i, autofit)
+            return
+    body_pr.append(autofit)
+
+
+def serialize_part(root) -> bytes:
+    """
+    Serialize a part the way python-pptx does.
+
+    Args:
+        root: Root element of the part
+
+    Returns:
+        bytes: XML document
+    """
+    return etree.tostring(root, encoding="UTF-8", standalone=True)
+
+
+class XmlTextRef:
+    """
+    Stable address of one run's text: the part name and the run's ordinal.
+    """
+
+    __slots__ = ("part", "index", "text")
+
+    def __init__(self, part: str, index: int, text: str):
+        """
+        Initialize the reference.
+
+        Args:
+            part (str): Zip member name of the part
+            index (int): Ordinal of the run among visited runs in the part
+            text (str): Current run text
+        """
+        self.part = part
+        self.index = index
+        self.text = text
+
+    def __repr__(self):
+        return f"XmlTextRef({self.part!r}, {self.index})"
+
+
+class XmlPresentation:
+    """
+    A presentation read and written directly from its zip package.
+
+    Text references handed out by ``iter_text_refs`` can be updated through
+    their ``text`` attribute; ``save`` streams each text part back out with
+    the current texts.
+
+    Attributes:
+        slide_parts (list): Slide part names in presentation order
+        text_parts (list): Parts holding translatable text, each listed
+            once: slides, their notes slides, then every slide master
+            followed by its layouts
+    """
+
+    def __init__(self, path: str, autofit=True):
+        """
+        Open a presentation.
+
+        Args:
+            path (str): Path to the .pptx file
+            autofit (bool): Set every visited text body to autofit on save
+        """
+        self.path = path
+        self.autofit = autofit
+        self._refs = {}
+        with zipfile.ZipFile(path) as zf:
+            self.slide_parts, self.text_parts = self._text_part_names(zf)
+
+    @staticmethod
+    def _resolve(base_part, target):
+        if target.startswith("/"):
+            return target.lstrip("/")
+        return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+    @classmethod
+    def _rels(cls, zf, part):
+        rels_name = posixpath.join(posixpath.dirname(part), "_rels",
+                                   posixpath.basename(part) + ".rels")
+        if rels_name not in zf.namelist():
+            return {}
+        root = etree.fromstring(zf.read(rels_name))
+        return {
+            rel.get("Id"): (rel.get("Type"), cls._resolve(part, rel.get("Target")))
+            for rel in root.iter("{%s}Relationship" % _NS["rel"])
+            if rel.get("TargetMode") != "External"
+        }
+
+    @staticmethod
+    def _main_part(zf):
+        root = etree.fromstring(zf.read("_rels/.rels"))
+        for rel in root.iter("{%s}Relationship" % _NS["rel"]):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        return "ppt/presentation.xml"
+
+    @classmethod
+    def _id_list_targets(cls, zf, part, id_tag):
+        rels = cls._rels(zf, part)
+        root = etree.fromstring(zf.read(part))
+        names = []
+        for item in root.iter(_qn(id_tag)):
+            rel = rels.get(item.get(_qn("r:id")))
+            if rel is not None and rel[1] in zf.NameToInfo:
+                names.append(rel[1])
+        return names
+
+    @classmethod
+    def _text_part_names(cls, zf):
+        main = cls._main_part(zf)
+        slides = cls._id_list_targets(zf, main, "p:sldId")
+        notes = [
+            target
+            for slide in slides
+            for rel_type, target in cls._rels(zf, slide).values()
+            if rel_type.endswith("/notesSlide") and target in zf.NameToInfo
+        ]
+        shared = []
+        for master in cls._id_list_targets(zf, main, "p:sldMasterId"):
+            shared.append(master)
+            shared.extend(cls._id_list_targets(zf, master, "p:sldLayoutId"))
+        return slides, list(dict.fromkeys(slides + notes + shared))
+
+    def iter_parts(self):
+        """
+        Stream the text parts one at a time in ``text_parts`` order.
+
+        Every text part is yielded, including parts without any text.
+
+        Yields:
+            tuple: (part name, list of paragraphs), each paragraph being a
+                list of XmlTextRef objects for its runs
+        """
+        self._refs = {}
+        with zipfile.ZipFile(self.path) as zf:
+            for part in self.text_parts:
+                refs = self._refs.setdefault(part, [])
+                paragraphs = []
+                with zf.open(part) as fh:
+                    paragraph = []
+                    for kind, elem in iter_part_items(fh, release=True):
+                        if kind == "t":
+                            ref = XmlTextRef(part, len(refs), elem.text or "")
+                            refs.append(ref)
+                            paragraph.append(ref)
+                        elif kind == "p":
+                            if paragraph:
+                                paragraphs.append(paragraph)
+                            paragraph = []
+                yield part, paragraphs
+
+    def iter_paragraph_refs(self):
+        """
+        Stream every visited paragraph, part by part in ``text_parts`` order.
+
+        Yields:
+            list: XmlTextRef objects for the runs of one paragraph
+        """
+        for _, paragraphs in self.iter_parts():
+            yield from paragraphs
+
+    def iter_text_refs(self):
+        """
+        Stream every visited run in presentation order.
+
+        Yields:
+            XmlTextRef: Reference to one run's text
+        """
+        for paragraph in self.iter_paragraph_refs():
+            yield from paragraph
+
+    def render_part(self, part: str, source):
+        """
+        Rewrite one part with the current text of its references.
+
+        Args:
+            part (str): Zip member name of the part
+            source: File-like object with the original part XML
+
+        Returns:
+            bytes: Rewritten XML, or None if the part has nothing to rewrite
+        """
+        refs = self._refs.get(part, [])
+        items = list(iter_part_items(source))
+        if not items:
+            return None
+
+        index = 0
+        for kind, elem in items:
+            if kind == "t":
+                if index < len(refs):
+                    text = refs[index].text
+                    if text != (elem.text or ""):
+                        elem.text = escape_ctrl_chars(text)
+                index += 1
+            elif kind == "bodyPr" and self.autofit:
+                set_body_autofit(elem)
+
+        return serialize_part(items[0][1].getroottree().getroot())
+
+    def save(self, output_path: str):
+        """
+        Write the presentation with the current run texts.
+
+        Only text parts are re-encoded; every other member is copied
+        byte-for-byte.
+
+        Args:
+            output_path (str): Path of the new .pptx file
+        """
+        parts = set(self.text_parts)
+
+        def render(info, src):
+            if info.filename not in parts:
+                return None
+            with src.open(info) as fh:
+                return self.render_part(info.filename, fh)
+
+        rewrite_package(self.path, output_path, render)